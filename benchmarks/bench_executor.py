@@ -0,0 +1,184 @@
+"""
+Benchmark ponta a ponta do ScriptExecutor sobre um banco SQLite local.
+
+Cria (uma vez por tamanho) um banco SQLite com os dados sintéticos de
+datagen.py e executa ciclos completos do ScriptExecutor: consulta,
+leitura em lotes e gravação do arquivo. Os tempos por etapa vêm das
+métricas de cada ciclo. Cada formato roda em um subprocesso próprio
+para que o pico de RSS seja apenas o daquele caso.
+
+Uso:
+    python benchmarks/bench_executor.py --rows 100000 --cycles 3
+    python benchmarks/bench_executor.py --rows 1000000 --formats .csv .parquet
+    python benchmarks/bench_executor.py --prefetch   # LEITURA_ANTECIPADA = S
+"""
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+src_path = Path(__file__).parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from datagen import DESCRIPTION, generate_batches
+
+DEFAULT_FORMATS = ('.csv', '.xlsx', '.parquet', '.feather')
+DEFAULT_BATCH_SIZE = 5000
+RESULTS_DIR = Path(__file__).parent / "results"
+DATA_DIR = RESULTS_DIR / "data"
+
+SQLITE_TYPES = {int: "INTEGER", str: "VARCHAR", datetime.date: "DATE", datetime.datetime: "TIMESTAMP"}
+
+
+def seed_database(rows: int, batch_size: int) -> Path:
+    """
+    Cria o banco SQLite com os dados sintéticos, se ainda não existir.
+    
+    Decimais são gravados como texto e datas em ISO 8601, como o sqlite3
+    não tem tipos nativos para eles.
+    """
+    db_path = DATA_DIR / f"produtos_{rows}.db"
+    if db_path.exists():
+        return db_path
+    
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    temp_path = db_path.with_suffix(".tmp")
+    if temp_path.exists():
+        temp_path.unlink()
+    columns = ", ".join(
+        f"{name} {SQLITE_TYPES.get(type_code, 'NUMERIC')}"
+        for name, type_code, *_ in DESCRIPTION
+    )
+    placeholders = ", ".join("?" for _ in DESCRIPTION)
+    with sqlite3.connect(temp_path) as conn:
+        conn.execute(f"CREATE TABLE PRODUTO ({columns})")
+        for batch in generate_batches(rows, batch_size):
+            conn.executemany(
+                f"INSERT INTO PRODUTO VALUES ({placeholders})",
+                [tuple(_to_sqlite(value) for value in row) for row in batch]
+            )
+    conn.close()
+    os.replace(temp_path, db_path)
+    return db_path
+
+
+def run_case(db_path: str, file_format: str, cycles: int, batch_size: int, prefetch: bool = False) -> dict:
+    """Executa os ciclos do ScriptExecutor no processo atual."""
+    from core.models.database_config import DRIVER_SQLITE, DatabaseConfig
+    from core.models.script_config import ScriptAction
+    from core.services.script_executor import ScriptExecutor
+    from infrastructure.database.connection_pool import close_all_pools
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        action = ScriptAction.from_config_sections(
+            {"EXECUTAR": "SALVAR_EM_ARQUIVO"},
+            {
+                "QUERY": "SELECT * FROM PRODUTO",
+                "CAMINHO": tmp,
+                "NOME_ARQUIVO": "PRODUTOS",
+                "FORMATO": file_format,
+                "TAMANHO_LOTE": str(batch_size),
+                "REPETIR": "N",
+                "LEITURA_ANTECIPADA": "S" if prefetch else "N",
+            }
+        )
+        db_config = DatabaseConfig(caminho=db_path, driver=DRIVER_SQLITE)
+        
+        cycles_metrics = []
+        for _ in range(cycles):
+            executor = ScriptExecutor(db_config, action, log_callback=lambda message: None)
+            executor.start()
+            executor.join()
+            if executor.last_metrics is None:
+                raise RuntimeError("ciclo sem métricas (erro na execução)")
+            cycles_metrics.append(executor.last_metrics.as_dict())
+        close_all_pools()
+    
+    best = min(cycles_metrics, key=lambda m: m["total"])
+    return {
+        "format": file_format,
+        "rows": best["rows"],
+        "cycles": cycles_metrics,
+        "best_total": round(best["total"], 3),
+        "rows_per_second": round(best["rows"] / best["total"]) if best["total"] else None,
+        "stages": {stage: round(seconds, 3) for stage, seconds in best["stages"].items()},
+        "bytes_written": best["bytes_written"],
+        "peak_rss_bytes": max(m["peak_memory"] or 0 for m in cycles_metrics) or None,
+    }
+
+
+def _to_sqlite(value):
+    """Converte valores sem tipo nativo no sqlite3."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat(sep=" ") if isinstance(value, datetime.datetime) else value.isoformat()
+    if value is not None and not isinstance(value, (int, float, str)):
+        return str(value)
+    return value
+
+
+def _to_mb(value):
+    """Converte bytes em MiB."""
+    return round(value / (1024 * 1024), 1) if value is not None else None
+
+
+def main():
+    """Prepara o banco, executa os formatos em subprocessos e grava o JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--formats", nargs="+", default=list(DEFAULT_FORMATS))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--prefetch", action="store_true", help="lê os lotes em uma thread separada")
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: benchmarks/results/executor_<data>.json)")
+    parser.add_argument("--case", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.case:
+        db_path, file_format = args.case
+        print(json.dumps(run_case(db_path, file_format, args.cycles, args.batch_size, args.prefetch)))
+        return 0
+    
+    db_path = seed_database(args.rows, args.batch_size)
+    print(f"Banco: {db_path} ({args.rows} linhas), {args.cycles} ciclos por formato"
+          f"{', leitura antecipada' if args.prefetch else ''}\n")
+    print(f"{'formato':<9} {'linhas':>10} {'melhor s':>9} {'linhas/s':>10} {'pico RSS MB':>12}  etapas (s)")
+    
+    results = []
+    for file_format in args.formats:
+        completed = subprocess.run(
+            [sys.executable, __file__, "--case", str(db_path), file_format,
+             "--cycles", str(args.cycles), "--batch-size", str(args.batch_size)]
+            + (["--prefetch"] if args.prefetch else []),
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()
+            result = {"format": file_format, "error": error[-1] if error else completed.returncode}
+            print(f"{file_format:<9}  ERRO: {result['error']}")
+        else:
+            result = json.loads(completed.stdout)
+            stages = " ".join(f"{stage}={seconds}" for stage, seconds in result["stages"].items())
+            print(f"{file_format:<9} {result['rows']:>10} {result['best_total']:>9} "
+                  f"{result['rows_per_second']!s:>10} {_to_mb(result['peak_rss_bytes'])!s:>12}  {stages}",
+                  flush=True)
+        results.append(result)
+    
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"executor_{datetime.datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"rows": args.rows, "batch_size": args.batch_size, "prefetch": args.prefetch,
+                   "results": results}, f, indent=2)
+    print(f"\nResultados gravados em {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
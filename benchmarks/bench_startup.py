@@ -0,0 +1,98 @@
+"""
+Verificação do tempo de importação (inicialização) do ScriptBird.
+
+Importa os pontos de entrada em processos novos com python -X importtime
+e falha (código de saída 1) se o tempo passar do limite ou se algum
+pacote pesado for carregado na inicialização. Esses pacotes só devem ser
+importados quando o formato ou driver que os usa é executado.
+
+Uso:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --budget ui.main_window=300
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent / "src"
+
+# Limite (ms) do tempo de importação de cada ponto de entrada
+DEFAULT_BUDGETS = {
+    "scriptbird.cli": 250,
+    "ui.main_window": 500,
+}
+
+# Pacotes que não podem ser importados na inicialização
+HEAVY_MODULES = ("openpyxl", "numpy", "pandas", "pyarrow", "fdb", "lxml")
+
+DEFAULT_RUNS = 5
+
+
+def measure(module: str) -> tuple:
+    """
+    Importa o módulo em um processo novo.
+    
+    Returns:
+        Tempo cumulativo da importação (ms) e módulos de nível superior
+        carregados
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=src_path, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        raise RuntimeError(error[-1] if error else f"código de saída {completed.returncode}")
+    
+    total = None
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        loaded.add(name.strip().split(".")[0])
+        if name.strip() == module:
+            total = int(cumulative) / 1000
+    return total, loaded
+
+
+def main():
+    """Mede os pontos de entrada e compara com os limites."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help="importações por módulo (vale a mais rápida)")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULO=MS",
+                        help="limite de um ponto de entrada (pode repetir)")
+    args = parser.parse_args()
+    
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in args.budget:
+        module, _, value = item.partition("=")
+        budgets[module] = float(value)
+    
+    failures = 0
+    print(f"{'módulo':<20} {'melhor ms':>10} {'limite ms':>10}  resultado")
+    for module, budget in budgets.items():
+        try:
+            runs = [measure(module) for _ in range(max(1, args.runs))]
+        except RuntimeError as e:
+            print(f"{module:<20} {'':>10} {budget:>10}  ERRO: {e}")
+            failures += 1
+            continue
+        best = min(total for total, _ in runs)
+        heavy = sorted(set(HEAVY_MODULES) & set.union(*(loaded for _, loaded in runs)))
+        problems = []
+        if best > budget:
+            problems.append("acima do limite")
+        if heavy:
+            problems.append(f"importa {', '.join(heavy)}")
+        failures += bool(problems)
+        print(f"{module:<20} {best:>10.1f} {budget:>10}  {'; '.join(problems) or 'ok'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
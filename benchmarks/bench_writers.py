@@ -0,0 +1,234 @@
+"""
+Benchmark dos escritores do FileService por formato e volume.
+
+Grava os dados sintéticos de datagen.py em cada formato e mede a vazão
+(linhas/s), o pico de memória (RSS) e o tamanho do arquivo. Cada caso
+roda em um subprocesso próprio para que o pico de RSS seja apenas o
+daquele caso. Os resultados são gravados em JSON e podem ser comparados
+com uma execução anterior.
+
+Uso:
+    python benchmarks/bench_writers.py
+    python benchmarks/bench_writers.py --sizes 10000 100000 --formats .csv .parquet
+    python benchmarks/bench_writers.py --compare benchmarks/results/anterior.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+src_path = Path(__file__).parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from datagen import COLUMNS, DESCRIPTION, generate_batches
+from utils.memory import peak_rss_bytes
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+DEFAULT_FORMATS = ('.csv', '.txt', '.xlsx', '.parquet', '.feather')
+DEFAULT_BATCH_SIZE = 5000
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# save_to_file: lista completa em memória (API original)
+# stream: lotes com save_stream_to_file e tipos do cursor.description
+APIS = ('stream', 'save_to_file')
+
+# Variação tolerada na comparação antes de apontar regressão
+DEFAULT_THRESHOLD = 0.10
+
+
+def run_case(api: str, file_format: str, rows: int, batch_size: int) -> dict:
+    """Executa um caso no processo atual e retorna as medições."""
+    from core.services.file_service import FileService
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, f"bench{file_format}")
+        start = time.perf_counter()
+        if api == 'save_to_file':
+            data = [row for batch in generate_batches(rows, batch_size) for row in batch]
+            FileService.save_to_file(COLUMNS, data, file_path, file_format)
+            written = len(data)
+        else:
+            written = FileService.save_stream_to_file(
+                COLUMNS, generate_batches(rows, batch_size), file_path,
+                file_format, DESCRIPTION
+            )
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(file_path)
+    
+    return {
+        "api": api,
+        "format": file_format,
+        "rows": written,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(written / elapsed) if elapsed else None,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "file_size_bytes": size,
+    }
+
+
+def run_in_subprocess(api: str, file_format: str, rows: int, batch_size: int) -> dict:
+    """Executa um caso em um subprocesso isolado."""
+    completed = subprocess.run(
+        [sys.executable, __file__, "--case", api, file_format, str(rows),
+         "--batch-size", str(batch_size)],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return {
+            "api": api,
+            "format": file_format,
+            "rows": rows,
+            "error": error[-1] if error else f"código de saída {completed.returncode}",
+        }
+    return json.loads(completed.stdout)
+
+
+def environment() -> dict:
+    """Dados do ambiente para identificar a execução."""
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": _git_commit(),
+        "packages": {name: _package_version(name) for name in ("openpyxl", "lxml", "pyarrow", "pandas")},
+    }
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> int:
+    """
+    Compara os resultados com uma execução anterior.
+    
+    Returns:
+        Número de casos com regressão acima do limite
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_case_key(r): r for r in json.load(f)["results"] if "error" not in r}
+    
+    regressions = 0
+    print(f"\nComparação com {baseline_path} (limite {threshold:.0%}):")
+    print(f"{'api':<13} {'formato':<9} {'linhas':>10} {'linhas/s':>10} {'pico RSS':>10} {'arquivo':>10}")
+    for result in results:
+        old = baseline.get(_case_key(result))
+        if old is None or "error" in result:
+            continue
+        speed = _delta(result["rows_per_second"], old["rows_per_second"])
+        memory = _delta(result["peak_rss_bytes"], old["peak_rss_bytes"])
+        size = _delta(result["file_size_bytes"], old["file_size_bytes"])
+        slower = speed is not None and speed < -threshold
+        bigger = memory is not None and memory > threshold
+        flag = "  << regressão" if slower or bigger else ""
+        regressions += bool(flag)
+        print(f"{result['api']:<13} {result['format']:<9} {result['rows']:>10} "
+              f"{_pct(speed):>10} {_pct(memory):>10} {_pct(size):>10}{flag}")
+    return regressions
+
+
+def print_header():
+    """Imprime o cabeçalho da tabela de resultados."""
+    print(f"{'api':<13} {'formato':<9} {'linhas':>10} {'seg':>9} {'linhas/s':>10} "
+          f"{'pico RSS MB':>12} {'arquivo MB':>11}")
+
+
+def print_row(r: dict):
+    """Imprime o resultado de um caso."""
+    if "error" in r:
+        print(f"{r['api']:<13} {r['format']:<9} {r['rows']:>10}  ERRO: {r['error']}")
+        return
+    print(f"{r['api']:<13} {r['format']:<9} {r['rows']:>10} {r['seconds']:>9} "
+          f"{r['rows_per_second']!s:>10} {_to_mb(r['peak_rss_bytes'])!s:>12} "
+          f"{_to_mb(r['file_size_bytes'])!s:>11}", flush=True)
+
+
+def _case_key(result: dict) -> tuple:
+    """Identifica um caso para a comparação."""
+    return result["api"], result["format"], result["rows"]
+
+
+def _delta(new, old):
+    """Variação relativa entre dois valores."""
+    if not new or not old:
+        return None
+    return (new - old) / old
+
+
+def _pct(value) -> str:
+    """Formata uma variação relativa."""
+    return f"{value:+.1%}" if value is not None else "n/d"
+
+
+def _to_mb(value):
+    """Converte bytes em MiB."""
+    return round(value / (1024 * 1024), 1) if value is not None else None
+
+
+def _git_commit():
+    """Commit atual do repositório, se disponível."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _package_version(name: str):
+    """Versão instalada de um pacote, se houver."""
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+
+def main():
+    """Executa os casos em subprocessos, grava o JSON e compara."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--formats", nargs="+", default=list(DEFAULT_FORMATS))
+    parser.add_argument("--apis", nargs="+", choices=APIS, default=list(APIS))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: benchmarks/results/<data>.json)")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--case", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.case:
+        api, file_format, rows = args.case
+        print(json.dumps(run_case(api, file_format, int(rows), args.batch_size)))
+        return 0
+    
+    results = []
+    print_header()
+    for rows in args.sizes:
+        for file_format in args.formats:
+            for api in args.apis:
+                result = run_in_subprocess(api, file_format, rows, args.batch_size)
+                results.append(result)
+                print_row(result)
+    
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"{datetime.datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "batch_size": args.batch_size,
+                   "results": results}, f, indent=2)
+    print(f"\nResultados gravados em {output}")
+    
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Benchmark do escritor XLSX: caminho antigo (pandas) x streaming.
+
+Cada caso roda em um subprocesso próprio para que o pico de memória
+(RSS) medido seja apenas o daquele caso.
+
+Uso:
+    python benchmarks/bench_xlsx.py --rows 100000 --batch-size 5000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adiciona o diretório src ao path
+src_path = Path(__file__).parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from datagen import COLUMNS, generate_batches
+from utils.memory import peak_rss_bytes
+
+CASES = ("pandas", "streaming")
+
+
+def run_pandas(file_path: str, rows: int, batch_size: int) -> int:
+    """Caminho antigo: lista completa -> DataFrame -> to_excel."""
+    import pandas as pd
+    
+    data = [row for batch in generate_batches(rows, batch_size) for row in batch]
+    df = pd.DataFrame(data, columns=COLUMNS)
+    df.to_excel(file_path, index=False)
+    return len(data)
+
+
+def run_streaming(file_path: str, rows: int, batch_size: int) -> int:
+    """Caminho novo: lotes -> escritor write-only do FileService."""
+    from core.services.file_service import FileService
+    
+    return FileService.save_stream_to_file(
+        COLUMNS, generate_batches(rows, batch_size), file_path, '.xlsx'
+    )
+
+
+def run_case(case: str, rows: int, batch_size: int) -> dict:
+    """Executa um caso no processo atual e retorna as medições."""
+    runner = run_pandas if case == "pandas" else run_streaming
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, f"bench_{case}.xlsx")
+        start = time.perf_counter()
+        written = runner(file_path, rows, batch_size)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(file_path)
+    
+    return {
+        "case": case,
+        "rows": written,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(written / elapsed) if elapsed else None,
+        "peak_rss_mb": _to_mb(peak_rss_bytes()),
+        "file_size_mb": _to_mb(size),
+    }
+
+
+def _to_mb(value):
+    """Converte bytes em MiB."""
+    return round(value / (1024 * 1024), 1) if value is not None else None
+
+
+def main():
+    """Executa os casos em subprocessos e imprime a comparação."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--case", choices=CASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.case:
+        print(json.dumps(run_case(args.case, args.rows, args.batch_size)))
+        return
+    
+    results = []
+    for case in CASES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--case", case,
+             "--rows", str(args.rows), "--batch-size", str(args.batch_size)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output))
+    
+    print(f"{'caso':<10} {'linhas':>10} {'seg':>8} {'linhas/s':>10} {'pico RSS MB':>12} {'arquivo MB':>11}")
+    for r in results:
+        print(f"{r['case']:<10} {r['rows']:>10} {r['seconds']:>8} {r['rows_per_second']:>10} "
+              f"{r['peak_rss_mb']!s:>12} {r['file_size_mb']!s:>11}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
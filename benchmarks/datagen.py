@@ -0,0 +1,73 @@
+"""
+Gerador de dados sintéticos para os benchmarks.
+
+Imita uma extração de produtos do Firebird: preços e custos em Decimal,
+datas e timestamps, descrições VARCHAR longas e colunas com NULL. Os
+dados são determinísticos para a mesma semente, de forma que execuções
+em versões diferentes gravam exatamente as mesmas linhas.
+"""
+import datetime
+import random
+from decimal import Decimal
+from typing import Iterator, List, Tuple
+
+# cursor.description no formato do fdb:
+# (nome, tipo, display_size, internal_size, precision, scale, null_ok)
+DESCRIPTION = [
+    ("CODPROD", int, 11, 4, 10, 0, False),
+    ("DESCRICAO", str, 200, 200, 0, 0, False),
+    ("UNIDADE", str, 3, 3, 0, 0, True),
+    ("PRECO", Decimal, 18, 8, 18, -2, True),
+    ("CUSTO", Decimal, 18, 8, 18, -4, True),
+    ("ESTOQUE", Decimal, 18, 8, 15, -3, True),
+    ("DATA_CADASTRO", datetime.date, 10, 4, 0, 0, False),
+    ("ATUALIZADO", datetime.datetime, 24, 8, 0, 0, True),
+    ("OBSERVACAO", str, 1000, 1000, 0, 0, True),
+]
+COLUMNS = [column[0] for column in DESCRIPTION]
+
+DEFAULT_SEED = 20240101
+
+WORDS = (
+    "PARAFUSO SEXTAVADO ZINCADO ACO INOX ROSCA FINA ARRUELA LISA PORCA "
+    "CABO FLEXIVEL COBRE ISOLADO TUBO PVC SOLDAVEL JOELHO LUVA CONEXAO "
+    "TINTA ACRILICA FOSCA BRANCO GELO LATA GALAO CAIXA PACOTE UNIDADE"
+).split()
+UNITS = ("UN", "CX", "PC", "KG", "MT", "LT")
+
+
+def generate_batches(rows: int,
+                     batch_size: int,
+                     seed: int = DEFAULT_SEED) -> Iterator[List[Tuple]]:
+    """
+    Gera lotes de linhas sintéticas.
+    
+    Args:
+        rows: Total de linhas
+        batch_size: Linhas por lote
+        seed: Semente do gerador aleatório
+    
+    Yields:
+        Lotes de tuplas na ordem de COLUMNS
+    """
+    rnd = random.Random(seed)
+    base_date = datetime.date(2015, 1, 1)
+    base_time = datetime.datetime(2024, 1, 1)
+    for start in range(0, rows, batch_size):
+        batch = []
+        for code in range(start + 1, min(start + batch_size, rows) + 1):
+            words = rnd.randint(4, 24)
+            batch.append((
+                code,
+                " ".join(rnd.choice(WORDS) for _ in range(words))[:200],
+                rnd.choice(UNITS) if rnd.random() > 0.05 else None,
+                Decimal(rnd.randint(1, 10_000_000)).scaleb(-2) if rnd.random() > 0.02 else None,
+                Decimal(rnd.randint(1, 100_000_000)).scaleb(-4) if rnd.random() > 0.1 else None,
+                Decimal(rnd.randint(-1000, 5_000_000)).scaleb(-3) if rnd.random() > 0.05 else None,
+                base_date + datetime.timedelta(days=rnd.randint(0, 3650)),
+                base_time + datetime.timedelta(seconds=rnd.randint(0, 31_536_000))
+                if rnd.random() > 0.15 else None,
+                " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(20, 150)))[:1000]
+                if rnd.random() > 0.7 else None,
+            ))
+        yield batch
\ No newline at end of file
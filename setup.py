@@ -38,6 +38,7 @@ setup(
     entry_points={
         "console_scripts": [
             "scriptbird=main:main",
+            "scriptbird-daemon=scriptbird.cli:daemon_main",
         ],
     },
 )
\ No newline at end of file
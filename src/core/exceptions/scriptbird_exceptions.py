@@ -28,6 +28,11 @@ class ScriptExecutionError(ScriptBirdException):
     pass
 
 
+class ExecutionCancelled(ScriptBirdException):
+    """Execução interrompida a pedido do usuário."""
+    pass
+
+
 class FileOperationError(ScriptBirdException):
     """Erro em operações de arquivo."""
     pass
@@ -4,15 +4,21 @@ Modelo de configuração do banco de dados.
 import os
 from dataclasses import dataclass
 
+# Drivers de banco suportados
+DRIVER_FIREBIRD = 'firebird'
+DRIVER_SQLITE = 'sqlite'
+
 
 @dataclass
 class DatabaseConfig:
-    """Configuração do banco de dados Firebird."""
+    """Configuração do banco de dados (Firebird por padrão)."""
     
     caminho: str = ""
     usuario: str = "SYSDBA"
     senha: str = "masterkey"
     porta: str = "3050"
+    max_conexoes: int = 4
+    driver: str = DRIVER_FIREBIRD
     
     def is_valid(self) -> bool:
         """Verifica se a configuração é válida."""
@@ -22,10 +28,14 @@ class DatabaseConfig:
         """
         Constrói o DSN para conexão com Firebird.
         
+        No SQLite o DSN é o próprio caminho do arquivo.
+        
         Returns:
             DSN formatado para conexão
         """
         caminho = self.caminho.strip()
+        if self.driver == DRIVER_SQLITE:
+            return caminho
         
         # Verifica se tem host|caminho
         if "|" in caminho:
@@ -51,7 +61,9 @@ class DatabaseConfig:
             caminho=data.get('caminho', ''),
             usuario=data.get('usuario', 'SYSDBA'),
             senha=data.get('senha', 'masterkey'),
-            porta=data.get('porta', '3050')
+            porta=data.get('porta', '3050'),
+            max_conexoes=_parse_int(data.get('max_conexoes'), 4),
+            driver=data.get('driver', DRIVER_FIREBIRD).strip().lower() or DRIVER_FIREBIRD
         )
     
     def to_dict(self) -> dict:
@@ -60,5 +72,16 @@ class DatabaseConfig:
             'caminho': self.caminho,
             'usuario': self.usuario,
             'senha': self.senha,
-            'porta': self.porta
-        }
\ No newline at end of file
+            'porta': self.porta,
+            'max_conexoes': str(self.max_conexoes),
+            'driver': self.driver
+        }
+
+
+def _parse_int(value, default: int) -> int:
+    """Converte um valor em inteiro positivo, usando o padrão se inválido."""
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
\ No newline at end of file
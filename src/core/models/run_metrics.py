@@ -0,0 +1,220 @@
+"""
+Métricas de execução de um ciclo de script.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional
+
+from .run_progress import PROGRESS_INTERVAL, RunProgress
+
+# Etapas medidas em cada ciclo, na ordem em que acontecem
+STAGE_CONNECT = 'connect'
+STAGE_EXECUTE = 'execute'
+STAGE_FIRST_ROW = 'first_row'
+STAGE_FETCH = 'fetch'
+STAGE_FINGERPRINT = 'fingerprint'
+STAGE_SERIALIZE = 'serialize'
+STAGE_WRITE = 'write'
+STAGE_FSYNC = 'fsync'
+STAGES = (
+    STAGE_CONNECT,
+    STAGE_EXECUTE,
+    STAGE_FIRST_ROW,
+    STAGE_FETCH,
+    STAGE_FINGERPRINT,
+    STAGE_SERIALIZE,
+    STAGE_WRITE,
+    STAGE_FSYNC,
+)
+
+
+@dataclass
+class RunMetrics:
+    """
+    Tempos por etapa, linhas, bytes e memória de um ciclo.
+    
+    Etapas:
+        connect: obtenção da conexão no pool
+        execute: cursor.execute da query
+        first_row: espera pelo primeiro lote (também somada em fetch)
+        fetch: leitura dos lotes (fetchmany)
+        fingerprint: hash do resultado e arquivo temporário das linhas
+            (IGNORAR_SEM_ALTERACAO) ou índice de chaves (modo CDC)
+        serialize: conversão e gravação dos lotes pelo escritor
+        write: finalização do arquivo (flush, save, rename)
+        fsync: gravação em disco (os.fsync)
+    
+    Em execuções paralelas (partições) os tempos das etapas são somados
+    entre as threads, por isso podem superar o tempo total do ciclo.
+    Pode ser atualizado por várias threads ao mesmo tempo.
+    
+    peak_memory é o maior RSS do processo amostrado durante o ciclo
+    (utils.memory.MemorySampler), e não o pico de toda a vida do processo.
+    
+    skipped indica um ciclo cuja gravação foi ignorada porque o resultado
+    não mudou desde o ciclo anterior.
+    
+    statement_cache_hits e statement_cache_misses contam as queries
+    executadas com um comando já preparado na conexão do pool e as que
+    precisaram ser preparadas.
+    
+    rows_fetched conta as linhas lidas do banco; rows e bytes_written, as
+    gravadas em arquivos confirmados. Com watch_progress(), a leitura e a
+    escrita de cada lote avisam o andamento (RunProgress) ao callback, no
+    máximo uma vez por intervalo.
+    """
+    
+    started_at: datetime = field(default_factory=datetime.now)
+    stages: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+    rows: int = 0
+    rows_fetched: int = 0
+    bytes_written: int = 0
+    peak_memory: Optional[int] = None
+    total: float = 0.0
+    skipped: bool = False
+    statement_cache_hits: int = 0
+    statement_cache_misses: int = 0
+    
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._rows_streamed = 0
+        self._bytes_streamed = 0
+        self._progress_callback: Optional[Callable[[RunProgress], None]] = None
+        self._expected_rows: Optional[int] = None
+        self._progress_interval = PROGRESS_INTERVAL
+        self._last_progress = 0.0
+    
+    def __getstate__(self) -> dict:
+        """Estado para pickle (o lock e o callback não são copiados entre processos)."""
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_progress_callback'] = None
+        return state
+    
+    def __setstate__(self, state: dict):
+        """Restaura o estado recebido de outro processo."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def add(self, stage: str, seconds: float):
+        """Soma um tempo (em segundos) à etapa."""
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+    
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Mede o tempo do bloco e soma à etapa."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+    
+    def watch_progress(self,
+                       callback: Callable[[RunProgress], None],
+                       expected_rows: Optional[int] = None,
+                       interval: float = PROGRESS_INTERVAL):
+        """
+        Passa a avisar o andamento do ciclo.
+        
+        Args:
+            callback: Função que recebe o progresso (na thread que leu ou
+                gravou o lote)
+            expected_rows: Linhas esperadas (ex.: lidas no ciclo anterior),
+                base da porcentagem e do tempo restante
+            interval: Intervalo mínimo em segundos entre dois avisos
+        """
+        self._progress_callback = callback
+        self._expected_rows = expected_rows
+        self._progress_interval = interval
+    
+    def add_statement(self, cached: bool):
+        """Conta uma query executada com comando preparado em cache (ou não)."""
+        with self._lock:
+            if cached:
+                self.statement_cache_hits += 1
+            else:
+                self.statement_cache_misses += 1
+    
+    def add_fetched(self, rows: int):
+        """Soma as linhas de um lote lido do banco."""
+        with self._lock:
+            self.rows_fetched += rows
+        self._report_progress()
+    
+    def add_written(self, rows: int, bytes_written: int):
+        """Soma as linhas e bytes de um lote entregue a um escritor."""
+        with self._lock:
+            self._rows_streamed += rows
+            self._bytes_streamed += bytes_written
+        self._report_progress()
+    
+    def progress(self, finished: bool = False) -> RunProgress:
+        """Retrato do andamento do ciclo."""
+        with self._lock:
+            return RunProgress(
+                rows_fetched=self.rows_fetched,
+                rows_written=max(self.rows, self._rows_streamed),
+                bytes_written=max(self.bytes_written, self._bytes_streamed),
+                elapsed=time.perf_counter() - self._start,
+                expected_rows=self._expected_rows,
+                finished=finished
+            )
+    
+    def add_output(self, rows: int, bytes_written: int):
+        """Soma as linhas e bytes gravados em um arquivo."""
+        with self._lock:
+            self.rows += rows
+            self.bytes_written += bytes_written
+    
+    def finish(self, peak_memory: Optional[int] = None):
+        """Registra o tempo total e o pico de memória do ciclo."""
+        self.total = time.perf_counter() - self._start
+        self.peak_memory = peak_memory
+        self._report_progress(finished=True)
+    
+    def as_dict(self) -> dict:
+        """Converte para dicionário (ex.: para gravar em JSON)."""
+        return {
+            'started_at': self.started_at.isoformat(),
+            'total': self.total,
+            'stages': dict(self.stages),
+            'rows': self.rows,
+            'rows_fetched': self.rows_fetched,
+            'bytes_written': self.bytes_written,
+            'peak_memory': self.peak_memory,
+            'skipped': self.skipped,
+            'statement_cache_hits': self.statement_cache_hits,
+            'statement_cache_misses': self.statement_cache_misses,
+        }
+    
+    def summary(self) -> str:
+        """Resumo em uma linha para o log."""
+        stages = ' '.join(f"{stage}={self.stages.get(stage, 0.0):.3f}s" for stage in STAGES)
+        memory = f"{self.peak_memory / 1048576:.1f}MB" if self.peak_memory else 'n/d'
+        skipped = ' (ignorado: resultado inalterado)' if self.skipped else ''
+        return (
+            f"Métricas{skipped}: total={self.total:.3f}s {stages} "
+            f"linhas={self.rows} bytes={self.bytes_written} pico_memoria={memory} "
+            f"comandos_preparados={self.statement_cache_hits}/"
+            f"{self.statement_cache_hits + self.statement_cache_misses}"
+        )
+    
+    def _report_progress(self, finished: bool = False):
+        """Avisa o andamento ao callback se o intervalo já passou."""
+        callback = self._progress_callback
+        if callback is None:
+            return
+        now = time.perf_counter()
+        if not finished and now - self._last_progress < self._progress_interval:
+            return
+        self._last_progress = now
+        try:
+            callback(self.progress(finished))
+        except Exception:
+            # Uma falha na exibição não interrompe a extração
+            pass
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Progresso de um ciclo de script em andamento.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+# Intervalo mínimo (segundos) entre dois avisos de progresso de um ciclo
+PROGRESS_INTERVAL = 0.5
+
+
+@dataclass
+class RunProgress:
+    """
+    Retrato do andamento de um ciclo, enviado periodicamente à interface.
+    
+    expected_rows é a quantidade de linhas lidas no ciclo anterior do
+    mesmo script (None na primeira execução); é a base da porcentagem e
+    do tempo restante, que são estimativas.
+    """
+    
+    rows_fetched: int = 0
+    rows_written: int = 0
+    bytes_written: int = 0
+    elapsed: float = 0.0
+    expected_rows: Optional[int] = None
+    finished: bool = False
+    script: str = ''
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Linhas lidas por segundo desde o início do ciclo."""
+        return self.rows_fetched / self.elapsed if self.elapsed > 0 else 0.0
+    
+    @property
+    def percent(self) -> Optional[int]:
+        """Porcentagem estimada (até 99 enquanto o ciclo não termina)."""
+        if self.finished:
+            return 100
+        if not self.expected_rows:
+            return None
+        return min(99, int(self.rows_fetched * 100 / self.expected_rows))
+    
+    @property
+    def eta(self) -> Optional[float]:
+        """Segundos estimados até o fim da leitura (None se desconhecido)."""
+        if self.finished:
+            return 0.0
+        if not self.expected_rows or not self.rows_per_second:
+            return None
+        return max(0.0, (self.expected_rows - self.rows_fetched) / self.rows_per_second)
+    
+    def describe(self) -> str:
+        """Resumo em uma linha (barra de progresso, tooltip e logs)."""
+        parts = [
+            f"{self.rows_fetched} linhas lidas",
+            f"{self.rows_written} gravadas ({self.bytes_written / 1048576:.1f}MB)",
+            f"{self.rows_per_second:.0f} linhas/s",
+        ]
+        eta = self.eta
+        if eta is not None and not self.finished:
+            minutes, seconds = divmod(round(eta), 60)
+            hours, minutes = divmod(minutes, 60)
+            parts.append(f"restante ~{hours:02d}:{minutes:02d}:{seconds:02d}")
+        text = ' · '.join(parts)
+        return f"[{self.script}] {text}" if self.script else text
\ No newline at end of file
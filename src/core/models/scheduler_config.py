@@ -0,0 +1,59 @@
+"""
+Modelo de configuração do agendador de scripts.
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+# Número padrão de scripts executados ao mesmo tempo
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class SchedulerConfig:
+    """Configuração do agendador de múltiplos scripts."""
+    
+    scripts: List[str] = field(default_factory=list)
+    diretorio: str = ''
+    indice: str = ''
+    max_workers: int = DEFAULT_MAX_WORKERS
+    max_por_banco: int = 0
+    
+    def is_enabled(self) -> bool:
+        """Verifica se há scripts (ou um diretório de scripts) configurados para o agendador."""
+        return bool(self.scripts or self.diretorio)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SchedulerConfig':
+        """
+        Cria uma instância a partir de um dicionário.
+        
+        Os scripts podem ser separados por ';' ou por quebra de linha;
+        'diretorio' acrescenta todos os scripts .ini de um diretório.
+        """
+        scripts = data.get('scripts', '').replace('\n', ';').split(';')
+        return cls(
+            scripts=[script.strip() for script in scripts if script.strip()],
+            diretorio=data.get('diretorio', '').strip(),
+            indice=data.get('indice', '').strip(),
+            max_workers=_parse_int(data.get('max_workers'), DEFAULT_MAX_WORKERS),
+            max_por_banco=_parse_int(data.get('max_por_banco'), 0)
+        )
+    
+    def to_dict(self) -> dict:
+        """Converte para dicionário."""
+        return {
+            'scripts': ';'.join(self.scripts),
+            'diretorio': self.diretorio,
+            'indice': self.indice,
+            'max_workers': str(self.max_workers),
+            'max_por_banco': str(self.max_por_banco)
+        }
+
+
+def _parse_int(value, default: int) -> int:
+    """Converte um valor em inteiro positivo, usando o padrão se inválido."""
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
\ No newline at end of file
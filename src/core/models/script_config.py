@@ -3,7 +3,42 @@ Modelo de configuração do script.
 """
 import os
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.exceptions.scriptbird_exceptions import ScriptConfigurationError
+from utils.cron import CronExpression
+from utils.sql import count_placeholders
+
+# Modos de extração da ação SALVAR_EM_ARQUIVO
+MODO_COMPLETO = 'COMPLETO'
+MODO_INCREMENTAL = 'INCREMENTAL'
+MODO_CDC = 'CDC'
+MODOS = (MODO_COMPLETO, MODO_INCREMENTAL, MODO_CDC)
+
+# Saída da execução particionada
+SAIDA_UNICO = 'UNICO'
+SAIDA_POR_PARTICAO = 'POR_PARTICAO'
+SAIDAS_PARTICOES = (SAIDA_UNICO, SAIDA_POR_PARTICAO)
+
+# Saída da execução por parâmetros: um arquivo por valor ou um único
+SAIDA_POR_VALOR = 'POR_VALOR'
+SAIDAS_PARAMETROS = (SAIDA_POR_VALOR, SAIDA_UNICO)
+
+# Saída do modo CDC: um arquivo por operação ou um único com a coluna OPERACAO
+SAIDA_POR_OPERACAO = 'POR_OPERACAO'
+SAIDAS_CDC = (SAIDA_POR_OPERACAO, SAIDA_UNICO)
+
+# Política quando uma execução ultrapassa o horário seguinte
+SOBREPOSICAO_PULAR = 'PULAR'
+SOBREPOSICAO_ENFILEIRAR = 'ENFILEIRAR'
+SOBREPOSICAO_AGRUPAR = 'AGRUPAR'
+SOBREPOSICOES = (SOBREPOSICAO_PULAR, SOBREPOSICAO_ENFILEIRAR, SOBREPOSICAO_AGRUPAR)
+
+# Tamanho padrão do lote de leitura (fetchmany)
+DEFAULT_BATCH_SIZE = 5000
+
+# Lotes adiantados pela leitura antecipada
+DEFAULT_PREFETCH_BATCHES = 4
 
 
 @dataclass
@@ -35,10 +70,16 @@ class ScriptAction:
     
     @classmethod
     def from_config_sections(cls, acao_section: dict, variaveis_section: dict) -> 'ScriptAction':
-        """Cria uma instância a partir das seções do arquivo de configuração."""
+        """
+        Cria uma instância a partir das seções do arquivo de configuração.
+        
+        O configparser converte as chaves para minúsculas, por isso os
+        nomes são normalizados para maiúsculas como usados no código.
+        """
+        acao = {key.upper(): value for key, value in dict(acao_section).items()}
         return cls(
-            executar=acao_section.get('EXECUTAR', ''),
-            variaveis=dict(variaveis_section)
+            executar=acao.get('EXECUTAR', '').strip(),
+            variaveis={key.upper(): value for key, value in dict(variaveis_section).items()}
         )
     
     def get_variable(self, name: str, default: Any = None) -> Any:
@@ -55,4 +96,207 @@ class ScriptAction:
     def get_bool_variable(self, name: str, default: bool = False) -> bool:
         """Obtém uma variável booleana do script."""
         value = self.variaveis.get(name, 'N' if not default else 'S')
-        return str(value).strip().upper() == 'S'
\ No newline at end of file
+        return str(value).strip().upper() == 'S'
+
+
+@dataclass
+class SaveToFileSettings:
+    """Parâmetros da ação SALVAR_EM_ARQUIVO lidos das variáveis do script."""
+    
+    query: str
+    caminho: str
+    nome_arquivo: str
+    formato: str = '.xlsx'
+    tempo_entre_execucoes: int = 3600
+    repetir: bool = False
+    tamanho_lote: int = DEFAULT_BATCH_SIZE
+    compressao: Optional[str] = None
+    modo: str = MODO_COMPLETO
+    coluna_watermark: str = ''
+    estado: str = ''
+    particoes: int = 1
+    coluna_particao: str = ''
+    saida_particoes: str = SAIDA_UNICO
+    agenda: str = ''
+    sobreposicao: str = SOBREPOSICAO_PULAR
+    ignorar_sem_alteracao: bool = False
+    resultado_temporario: bool = False
+    chave_primaria: str = ''
+    saida_cdc: str = SAIDA_POR_OPERACAO
+    indice: str = ''
+    leitura_antecipada: bool = False
+    fila_lotes: int = DEFAULT_PREFETCH_BATCHES
+    processo_isolado: bool = False
+    parametros: str = ''
+    consulta_parametros: str = ''
+    saida_parametros: str = SAIDA_POR_VALOR
+    
+    @property
+    def file_path(self) -> str:
+        """Caminho completo do arquivo de saída."""
+        return self.file_path_with_suffix('')
+    
+    @property
+    def key_columns(self) -> List[str]:
+        """Colunas da chave primária (CHAVE_PRIMARIA separada por vírgulas)."""
+        return [column.strip() for column in self.chave_primaria.split(',') if column.strip()]
+    
+    @property
+    def parameter_values(self) -> List[Tuple[str, ...]]:
+        """
+        Valores da lista PARAMETROS.
+        
+        As execuções são separadas por ';' e, quando a query tem mais de
+        um parâmetro, os valores de cada execução por ','.
+        """
+        return [
+            tuple(value.strip() for value in item.split(','))
+            for item in self.parametros.split(';') if item.strip()
+        ]
+    
+    @property
+    def has_parameters(self) -> bool:
+        """True se a query é executada uma vez para cada valor de parâmetro."""
+        return bool(self.parametros or self.consulta_parametros)
+    
+    def file_path_with_suffix(self, suffix: str) -> str:
+        """
+        Caminho de um arquivo de saída derivado do principal.
+        
+        Args:
+            suffix: Texto acrescentado ao nome (ex.: '_p01')
+            
+        Returns:
+            Caminho completo do arquivo
+        """
+        return os.path.join(self.caminho, self.nome_arquivo + suffix + self.formato)
+    
+    @classmethod
+    def from_action(cls, action: ScriptAction) -> 'SaveToFileSettings':
+        """
+        Lê e valida as variáveis da ação.
+        
+        Args:
+            action: Ação do script
+            
+        Returns:
+            Parâmetros da ação
+            
+        Raises:
+            ScriptConfigurationError: Se alguma variável for inválida
+        """
+        query = action.get_variable('QUERY')
+        caminho = action.get_variable('CAMINHO', '').strip()
+        nome_arquivo = action.get_variable('NOME_ARQUIVO', '').strip()
+        
+        if not query:
+            raise ScriptConfigurationError("Variável QUERY não definida no script")
+        if not caminho:
+            raise ScriptConfigurationError("Variável CAMINHO não definida no script")
+        if not nome_arquivo:
+            raise ScriptConfigurationError("Variável NOME_ARQUIVO não definida no script")
+        
+        settings = cls(
+            query=query,
+            caminho=caminho,
+            nome_arquivo=nome_arquivo,
+            formato=action.get_variable('FORMATO', '.xlsx').strip().lower(),
+            tempo_entre_execucoes=action.get_int_variable('TEMPO_ENTRE_EXECUCOES', 3600),
+            repetir=action.get_bool_variable('REPETIR', False),
+            tamanho_lote=action.get_int_variable('TAMANHO_LOTE', DEFAULT_BATCH_SIZE),
+            compressao=action.get_variable('COMPRESSAO', '').strip().lower() or None,
+            modo=action.get_variable('MODO', MODO_COMPLETO).strip().upper(),
+            coluna_watermark=action.get_variable('COLUNA_WATERMARK', '').strip(),
+            estado=action.get_variable('ESTADO', '').strip(),
+            particoes=action.get_int_variable('PARTICOES', 1),
+            coluna_particao=action.get_variable('COLUNA_PARTICAO', '').strip(),
+            saida_particoes=action.get_variable('SAIDA_PARTICOES', SAIDA_UNICO).strip().upper(),
+            agenda=action.get_variable('AGENDA', '').strip(),
+            sobreposicao=action.get_variable('SOBREPOSICAO', SOBREPOSICAO_PULAR).strip().upper(),
+            ignorar_sem_alteracao=action.get_bool_variable('IGNORAR_SEM_ALTERACAO', False),
+            resultado_temporario=action.get_bool_variable('RESULTADO_TEMPORARIO', False),
+            chave_primaria=action.get_variable('CHAVE_PRIMARIA', '').strip(),
+            saida_cdc=action.get_variable('SAIDA_CDC', SAIDA_POR_OPERACAO).strip().upper(),
+            indice=action.get_variable('INDICE', '').strip(),
+            leitura_antecipada=action.get_bool_variable('LEITURA_ANTECIPADA', False),
+            fila_lotes=action.get_int_variable('FILA_LOTES', DEFAULT_PREFETCH_BATCHES),
+            processo_isolado=action.get_bool_variable('PROCESSO_ISOLADO', False),
+            parametros=action.get_variable('PARAMETROS', '').strip(),
+            consulta_parametros=action.get_variable('CONSULTA_PARAMETROS', '').strip(),
+            saida_parametros=action.get_variable('SAIDA_PARAMETROS', SAIDA_POR_VALOR).strip().upper()
+        )
+        
+        if settings.tamanho_lote <= 0:
+            raise ScriptConfigurationError("Variável TAMANHO_LOTE deve ser maior que zero")
+        if settings.fila_lotes <= 0:
+            raise ScriptConfigurationError("Variável FILA_LOTES deve ser maior que zero")
+        if settings.modo not in MODOS:
+            raise ScriptConfigurationError(
+                f"Variável MODO inválida: {settings.modo}. Use: {', '.join(MODOS)}"
+            )
+        if settings.modo == MODO_INCREMENTAL and not settings.coluna_watermark:
+            raise ScriptConfigurationError("Modo INCREMENTAL requer a variável COLUNA_WATERMARK")
+        if settings.modo == MODO_CDC:
+            if not settings.key_columns:
+                raise ScriptConfigurationError("Modo CDC requer a variável CHAVE_PRIMARIA")
+            if settings.saida_cdc not in SAIDAS_CDC:
+                raise ScriptConfigurationError(
+                    f"Variável SAIDA_CDC inválida: {settings.saida_cdc}. Use: {', '.join(SAIDAS_CDC)}"
+                )
+        if settings.particoes > 1:
+            if not settings.coluna_particao:
+                raise ScriptConfigurationError("Variável PARTICOES requer a variável COLUNA_PARTICAO")
+            if settings.saida_particoes not in SAIDAS_PARTICOES:
+                raise ScriptConfigurationError(
+                    f"Variável SAIDA_PARTICOES inválida: {settings.saida_particoes}. "
+                    f"Use: {', '.join(SAIDAS_PARTICOES)}"
+                )
+            if settings.modo != MODO_COMPLETO:
+                raise ScriptConfigurationError("Execução particionada só é suportada no modo COMPLETO")
+        if settings.has_parameters:
+            if settings.parametros and settings.consulta_parametros:
+                raise ScriptConfigurationError(
+                    "Use apenas uma das variáveis PARAMETROS e CONSULTA_PARAMETROS"
+                )
+            if settings.saida_parametros not in SAIDAS_PARAMETROS:
+                raise ScriptConfigurationError(
+                    f"Variável SAIDA_PARAMETROS inválida: {settings.saida_parametros}. "
+                    f"Use: {', '.join(SAIDAS_PARAMETROS)}"
+                )
+            placeholders = count_placeholders(settings.query)
+            if not placeholders:
+                raise ScriptConfigurationError(
+                    "Execução por parâmetros requer parâmetros (?) na variável QUERY"
+                )
+            for values in settings.parameter_values:
+                if len(values) != placeholders:
+                    raise ScriptConfigurationError(
+                        f"Valor de PARAMETROS '{','.join(values)}' tem {len(values)} valor(es), "
+                        f"mas a QUERY tem {placeholders} parâmetro(s) (?)"
+                    )
+            if settings.modo != MODO_COMPLETO or settings.particoes > 1 or settings.ignorar_sem_alteracao:
+                raise ScriptConfigurationError(
+                    "Execução por parâmetros só é suportada no modo COMPLETO, sem partições "
+                    "e sem IGNORAR_SEM_ALTERACAO"
+                )
+        if settings.agenda:
+            try:
+                CronExpression(settings.agenda)
+            except ValueError as e:
+                raise ScriptConfigurationError(f"Variável AGENDA inválida: {e}")
+        if settings.sobreposicao not in SOBREPOSICOES:
+            raise ScriptConfigurationError(
+                f"Variável SOBREPOSICAO inválida: {settings.sobreposicao}. "
+                f"Use: {', '.join(SOBREPOSICOES)}"
+            )
+        if settings.ignorar_sem_alteracao and (settings.modo != MODO_COMPLETO or settings.particoes > 1):
+            raise ScriptConfigurationError(
+                "IGNORAR_SEM_ALTERACAO só é suportado no modo COMPLETO sem partições"
+            )
+        
+        if not settings.estado:
+            settings.estado = os.path.join(caminho, f"{nome_arquivo}.estado.json")
+        if not settings.indice:
+            settings.indice = os.path.join(caminho, f"{nome_arquivo}.indice.db")
+        
+        return settings
\ No newline at end of file
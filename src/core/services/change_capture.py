@@ -0,0 +1,365 @@
+"""
+Captura de alterações (CDC) entre ciclos de um script.
+
+Um índice em disco guarda, para cada chave primária do resultado, o hash
+da linha no ciclo anterior. Comparando o resultado atual com o índice,
+cada ciclo grava apenas as linhas incluídas, alteradas e excluídas.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.exceptions.scriptbird_exceptions import (
+    FileOperationError,
+    ScriptBirdException,
+    ScriptExecutionError,
+)
+from core.models.run_metrics import STAGE_FINGERPRINT, RunMetrics
+
+from .file_service import FileService
+from .file_writers import FileWriter
+
+# Operações gravadas na coluna OPERACAO (saída única)
+OPERACAO_INCLUSAO = 'I'
+OPERACAO_ALTERACAO = 'A'
+OPERACAO_EXCLUSAO = 'E'
+
+# Sufixo dos arquivos de cada operação (saída separada)
+SUFIXOS_OPERACOES = {
+    OPERACAO_INCLUSAO: 'inseridos',
+    OPERACAO_ALTERACAO: 'alterados',
+    OPERACAO_EXCLUSAO: 'excluidos',
+}
+SUFIXO_UNICO = 'alteracoes'
+
+OPERATION_COLUMN = 'OPERACAO'
+OPERATION_DESCRIPTION = (OPERATION_COLUMN, str, 1, 1, 0, 0, False)
+
+# Tamanho do hash de cada linha no índice (bytes)
+ROW_HASH_SIZE = 16
+
+# Chaves por consulta ao índice (limite de parâmetros do SQLite)
+LOOKUP_CHUNK_SIZE = 500
+
+
+def row_hash(row: Sequence) -> bytes:
+    """Hash de uma linha (repr é estável para Decimal e datas)."""
+    return hashlib.blake2b(repr(tuple(row)).encode('utf-8'), digest_size=ROW_HASH_SIZE).digest()
+
+
+class RowIndex:
+    """
+    Índice chave primária → hash da linha, gravado em um arquivo SQLite.
+    
+    As chaves do ciclo atual são gravadas em uma tabela nova e só
+    substituem o índice em commit(), depois que os arquivos de saída
+    foram gravados. Se o ciclo falhar, o índice anterior é mantido e as
+    alterações são emitidas novamente no ciclo seguinte.
+    """
+    
+    def __init__(self, file_path: str):
+        """
+        Inicializa o índice.
+        
+        Args:
+            file_path: Caminho do arquivo do índice
+        """
+        self.file_path = file_path
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def open(self):
+        """
+        Abre o índice e inicia a tabela do ciclo atual.
+        
+        Raises:
+            FileOperationError: Se o arquivo não puder ser aberto
+        """
+        try:
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.file_path, isolation_level=None)
+            # Restos de um ciclo interrompido são descartados
+            self._conn.execute("DROP TABLE IF EXISTS novo")
+            for table in ('indice', 'novo'):
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    "(chave TEXT PRIMARY KEY, valores BLOB NOT NULL, hash BLOB NOT NULL) WITHOUT ROWID"
+                )
+            self._conn.execute("BEGIN")
+        except (OSError, sqlite3.Error) as e:
+            self.close()
+            raise FileOperationError(f"Erro ao abrir índice de alterações: {e}")
+    
+    @property
+    def is_empty(self) -> bool:
+        """Indica se não há ciclo anterior no índice."""
+        return self._conn.execute("SELECT 1 FROM indice LIMIT 1").fetchone() is None
+    
+    def lookup(self, keys: Sequence[str]) -> Dict[str, bytes]:
+        """
+        Busca o hash anterior das chaves.
+        
+        Args:
+            keys: Chaves (repr dos valores da chave primária)
+        
+        Returns:
+            Hash anterior das chaves que existiam no ciclo anterior
+        """
+        found = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+            placeholders = ', '.join('?' for _ in chunk)
+            found.update(self._conn.execute(
+                f"SELECT chave, hash FROM indice WHERE chave IN ({placeholders})", chunk
+            ))
+        return found
+    
+    def add(self, entries: Iterable[Tuple[str, bytes, bytes]]):
+        """
+        Registra as chaves do ciclo atual.
+        
+        Args:
+            entries: Tuplas (chave, valores da chave em pickle, hash da linha)
+        
+        Raises:
+            ScriptExecutionError: Se a chave se repetir no resultado
+        """
+        try:
+            self._conn.executemany("INSERT INTO novo (chave, valores, hash) VALUES (?, ?, ?)", entries)
+        except sqlite3.IntegrityError:
+            raise ScriptExecutionError(
+                "Chave primária repetida no resultado da query (verifique CHAVE_PRIMARIA)"
+            )
+    
+    def deleted(self, batch_size: int) -> Iterator[List[tuple]]:
+        """
+        Lê as chaves do ciclo anterior que não vieram no ciclo atual.
+        
+        Args:
+            batch_size: Chaves por lote
+        
+        Yields:
+            Lotes com os valores das chaves excluídas
+        """
+        cursor = self._conn.execute(
+            "SELECT valores FROM indice WHERE chave NOT IN (SELECT chave FROM novo)"
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [pickle.loads(values) for values, in rows]
+    
+    def commit(self):
+        """Substitui o índice anterior pelas chaves do ciclo atual."""
+        try:
+            self._conn.execute("DROP TABLE indice")
+            self._conn.execute("ALTER TABLE novo RENAME TO indice")
+            self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Erro ao gravar índice de alterações: {e}")
+    
+    def close(self):
+        """Fecha o índice (sem commit, o ciclo atual é descartado)."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            conn.close()
+    
+    def __enter__(self):
+        """Context manager entry."""
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+class ChangeCapture:
+    """Classifica as linhas do resultado comparando com o índice."""
+    
+    def __init__(self,
+                 index: RowIndex,
+                 key_indexes: Sequence[int],
+                 column_count: int,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Inicializa a captura.
+        
+        Args:
+            index: Índice aberto do ciclo anterior
+            key_indexes: Índices das colunas da chave primária
+            column_count: Total de colunas do resultado
+            metrics: Métricas do ciclo, que recebem o tempo de hash e índice
+        """
+        self.index = index
+        self.key_indexes = list(key_indexes)
+        self.column_count = column_count
+        self.metrics = metrics
+    
+    def classify(self, batch: Sequence[Sequence]) -> Tuple[List[Sequence], List[Sequence]]:
+        """
+        Classifica um lote e registra suas chaves no índice.
+        
+        Args:
+            batch: Lote de linhas
+        
+        Returns:
+            Linhas incluídas e linhas alteradas desde o ciclo anterior
+        """
+        with self._timer():
+            entries = []
+            for row in batch:
+                key = tuple(row[index] for index in self.key_indexes)
+                entries.append((repr(key), key, row_hash(row)))
+            previous = self.index.lookup([entry[0] for entry in entries])
+            
+            inserted, updated = [], []
+            for row, (chave, _, digest) in zip(batch, entries):
+                old = previous.get(chave)
+                if old is None:
+                    inserted.append(row)
+                elif old != digest:
+                    updated.append(row)
+            
+            self.index.add(
+                (chave, pickle.dumps(key, pickle.HIGHEST_PROTOCOL), digest)
+                for chave, key, digest in entries
+            )
+        return inserted, updated
+    
+    def deleted(self, batch_size: int) -> Iterator[List[tuple]]:
+        """
+        Gera as linhas excluídas desde o ciclo anterior.
+        
+        Apenas as colunas da chave primária são preenchidas; as demais
+        vêm nulas, pois o índice não guarda os valores anteriores.
+        
+        Yields:
+            Lotes de linhas excluídas
+        """
+        for keys in self.index.deleted(batch_size):
+            rows = []
+            for key in keys:
+                row = [None] * self.column_count
+                for index, value in zip(self.key_indexes, key):
+                    row[index] = value
+                rows.append(tuple(row))
+            yield rows
+    
+    def _timer(self):
+        """Mede a etapa de hash/índice se houver métricas."""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.timer(STAGE_FINGERPRINT)
+
+
+class ChangeWriter:
+    """
+    Grava as alterações de um ciclo.
+    
+    Na saída separada cada operação tem seu arquivo; na saída única as
+    linhas vão para um arquivo com a coluna OPERACAO antes das demais.
+    Os arquivos só são criados quando recebem alguma linha.
+    """
+    
+    def __init__(self,
+                 file_service: FileService,
+                 columns: List[str],
+                 description: Optional[Sequence[Sequence]],
+                 path_for: Callable[[str], str],
+                 file_format: str,
+                 compression: Optional[str] = None,
+                 single: bool = False,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Inicializa o escritor de alterações.
+        
+        Args:
+            file_service: Serviço de arquivos
+            columns: Nomes das colunas do resultado
+            description: cursor.description da query
+            path_for: Função que recebe o sufixo e retorna o caminho do arquivo
+            file_format: Formato dos arquivos
+            compression: Codec de compressão dos formatos colunares
+            single: True para gravar um único arquivo com a coluna OPERACAO
+            metrics: Métricas do ciclo, que recebem os tempos de escrita
+        """
+        self.file_service = file_service
+        self.single = single
+        self.path_for = path_for
+        self.file_format = file_format
+        self.compression = compression
+        self.metrics = metrics
+        if single:
+            self.columns = [OPERATION_COLUMN] + list(columns)
+            self.description = [OPERATION_DESCRIPTION] + list(description) if description else None
+        else:
+            self.columns = list(columns)
+            self.description = description
+        self.counts = dict.fromkeys(SUFIXOS_OPERACOES, 0)
+        self._writers: Dict[str, FileWriter] = {}
+    
+    @property
+    def file_paths(self) -> List[str]:
+        """Arquivos gravados no ciclo."""
+        return [writer.file_path for writer in self._writers.values()]
+    
+    def write(self, operation: str, rows: Sequence[Sequence]):
+        """
+        Grava linhas de uma operação.
+        
+        Args:
+            operation: OPERACAO_INCLUSAO, OPERACAO_ALTERACAO ou OPERACAO_EXCLUSAO
+            rows: Linhas da operação
+        """
+        if not rows:
+            return
+        if self.single:
+            rows = [(operation,) + tuple(row) for row in rows]
+        suffix = SUFIXO_UNICO if self.single else SUFIXOS_OPERACOES[operation]
+        writer = self._writers.get(suffix)
+        if writer is None:
+            writer = self.file_service.open_writer(
+                self.columns, self.path_for(suffix), self.file_format, self.description,
+                self.compression, metrics=self.metrics
+            )
+            self._writers[suffix] = writer
+        try:
+            writer.write_batch(rows)
+        except ScriptBirdException:
+            raise
+        except Exception as e:
+            raise FileOperationError(f"Erro ao salvar arquivo: {e}")
+        self.counts[operation] += len(rows)
+    
+    def commit(self):
+        """Finaliza todos os arquivos abertos."""
+        try:
+            for writer in self._writers.values():
+                writer.commit()
+        except Exception as e:
+            self.abort()
+            if isinstance(e, ScriptBirdException):
+                raise
+            raise FileOperationError(f"Erro ao salvar arquivo: {e}")
+    
+    def abort(self):
+        """Descarta os arquivos em andamento."""
+        for writer in self._writers.values():
+            writer.abort()
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit: confirma ou descarta a escrita."""
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
\ No newline at end of file
@@ -3,20 +3,28 @@ Serviço de banco de dados do ScriptBird.
 """
 import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from core.models.database_config import DatabaseConfig
+from core.models.run_metrics import RunMetrics
 
 # Adiciona o diretório src ao path
 src_path = Path(__file__).parent.parent.parent
 if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
-from infrastructure.database.firebird_connection import FirebirdConnection
+from infrastructure.database.database_connection import DatabaseConnection
+from core.models.script_config import DEFAULT_BATCH_SIZE
+from infrastructure.database.result_stream import ResultStream
 
 
 class DatabaseService:
-    """Serviço para operações de banco de dados."""
+    """
+    Serviço para operações de banco de dados.
+    
+    As conexões vêm de um pool compartilhado por DSN e usuário, então
+    várias instâncias do serviço reutilizam as mesmas conexões físicas.
+    """
     
     def __init__(self, config: DatabaseConfig):
         """
@@ -26,7 +34,7 @@ class DatabaseService:
             config: Configuração do banco de dados
         """
         self.config = config
-        self.connection = FirebirdConnection(config)
+        self.connection = DatabaseConnection(config)
     
     def test_connection(self) -> bool:
         """
@@ -49,6 +57,30 @@ class DatabaseService:
         """
         return self.connection.execute_query(query)
     
+    def execute_query_iter(self,
+                           query: str,
+                           batch_size: int = DEFAULT_BATCH_SIZE,
+                           params: Optional[Sequence] = None,
+                           metrics: Optional[RunMetrics] = None) -> ResultStream:
+        """
+        Executa uma query para leitura em lotes.
+        
+        Args:
+            query: Query SQL a ser executada
+            batch_size: Quantidade de linhas por lote (fetchmany)
+            params: Valores dos parâmetros (?) da query
+            metrics: Métricas do ciclo (tempos de conexão, execução e leitura)
+            
+        Returns:
+            Resultado iterável em lotes, com os nomes em .columns
+        """
+        return self.connection.execute_query_iter(query, batch_size, params, metrics)
+    
+    @property
+    def max_connections(self) -> int:
+        """Número máximo de conexões simultâneas do pool."""
+        return self.config.max_conexoes
+    
     def validate_config(self) -> bool:
         """
         Valida se a configuração do banco é válida.
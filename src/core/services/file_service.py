@@ -1,13 +1,13 @@
 """
 Serviço para operações de arquivo.
 """
-import csv
 import os
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
 
-import pandas as pd
+from core.exceptions.scriptbird_exceptions import FileOperationError, ScriptBirdException
+from core.models.run_metrics import RunMetrics
 
-from core.exceptions.scriptbird_exceptions import FileOperationError
+from .file_writers import FileWriter, get_writer, supports_append
 
 
 class FileService:
@@ -15,9 +15,9 @@ class FileService:
     
     @staticmethod
     def save_to_file(
-        columns: List[str], 
-        data: List[Tuple], 
-        file_path: str, 
+        columns: List[str],
+        data: List[Tuple],
+        file_path: str,
         file_format: str = '.xlsx'
     ):
         """
@@ -28,51 +28,119 @@ class FileService:
             data: Dados a serem salvos
             file_path: Caminho completo do arquivo
             file_format: Formato do arquivo (.xlsx, .csv, .txt)
-            
+        
         Raises:
             FileOperationError: Se houver erro ao salvar arquivo
         """
+        FileService.save_stream_to_file(columns, [data], file_path, file_format)
+    
+    @staticmethod
+    def save_stream_to_file(
+        columns: List[str],
+        batches: Iterable[Sequence[Sequence]],
+        file_path: str,
+        file_format: str = '.xlsx',
+        description: Optional[Sequence[Sequence]] = None,
+        compression: Optional[str] = None,
+        append: bool = False,
+        metrics: Optional[RunMetrics] = None
+    ) -> int:
+        """
+        Salva em arquivo dados recebidos em lotes.
+        
+        Cada lote é gravado assim que chega, de forma que a memória usada
+        fica limitada ao tamanho do lote. O arquivo final só é substituído
+        quando todos os lotes foram gravados.
+        
+        Args:
+            columns: Nomes das colunas
+            batches: Iterável de lotes de linhas (ex.: ResultStream)
+            file_path: Caminho completo do arquivo
+            file_format: Formato do arquivo (.xlsx, .csv, .txt, .parquet, .feather)
+            description: cursor.description da query (tipos das colunas)
+            compression: Codec de compressão dos formatos colunares
+            append: True para acrescentar as linhas ao arquivo existente
+                (apenas .csv e .txt)
+            metrics: Métricas do ciclo, que recebem os tempos de escrita
+        
+        Returns:
+            Total de linhas gravadas
+        
+        Raises:
+            FileOperationError: Se houver erro ao salvar arquivo
+        """
+        writer = FileService.open_writer(
+            columns, file_path, file_format, description, compression, append, metrics
+        )
         try:
-            # Cria diretório se não existir
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            file_format = file_format.lower().strip()
-            
-            if file_format == '.csv':
-                FileService._save_to_csv(columns, data, file_path)
-            elif file_format == '.txt':
-                FileService._save_to_txt(columns, data, file_path)
-            elif file_format == '.xlsx':
-                FileService._save_to_xlsx(columns, data, file_path)
-            else:
-                raise FileOperationError(f"Formato não suportado: {file_format}")
-                
+            for batch in batches:
+                writer.write_batch(batch)
+            writer.commit()
+            return writer.rows_written
+        
         except Exception as e:
-            if isinstance(e, FileOperationError):
+            writer.abort()
+            if isinstance(e, ScriptBirdException):
                 raise
             raise FileOperationError(f"Erro ao salvar arquivo: {e}")
     
     @staticmethod
-    def _save_to_csv(columns: List[str], data: List[Tuple], file_path: str):
-        """Salva dados em arquivo CSV."""
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(columns)
-            writer.writerows(data)
-    
-    @staticmethod
-    def _save_to_txt(columns: List[str], data: List[Tuple], file_path: str):
-        """Salva dados em arquivo TXT."""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\t'.join(columns) + '\n')
-            for row in data:
-                f.write('\t'.join(map(str, row)) + '\n')
+    def open_writer(
+        columns: List[str],
+        file_path: str,
+        file_format: str = '.xlsx',
+        description: Optional[Sequence[Sequence]] = None,
+        compression: Optional[str] = None,
+        append: bool = False,
+        metrics: Optional[RunMetrics] = None
+    ) -> FileWriter:
+        """
+        Cria um escritor incremental para o arquivo.
+        
+        Args:
+            columns: Nomes das colunas
+            file_path: Caminho completo do arquivo
+            file_format: Formato do arquivo (.xlsx, .csv, .txt, .parquet, .feather)
+            description: cursor.description da query (tipos das colunas)
+            compression: Codec de compressão dos formatos colunares
+            append: True para acrescentar as linhas ao arquivo existente
+                (apenas .csv e .txt)
+            metrics: Métricas do ciclo, que recebem os tempos de escrita
+        
+        Returns:
+            Escritor já aberto; deve receber commit() ou abort()
+        
+        Raises:
+            FileOperationError: Se o formato não for suportado ou o arquivo
+                não puder ser aberto
+        """
+        writer = get_writer(
+            file_path, columns, file_format, description, compression, append, metrics
+        )
+        try:
+            # Cria diretório se não existir
+            FileService.ensure_directory_exists(file_path)
+            writer.open()
+            return writer
+        
+        except Exception as e:
+            writer.abort()
+            if isinstance(e, FileOperationError):
+                raise
+            raise FileOperationError(f"Erro ao abrir arquivo: {e}")
     
     @staticmethod
-    def _save_to_xlsx(columns: List[str], data: List[Tuple], file_path: str):
-        """Salva dados em arquivo Excel."""
-        df = pd.DataFrame(data, columns=columns)
-        df.to_excel(file_path, index=False)
+    def supports_append(file_format: str) -> bool:
+        """
+        Indica se o formato aceita acrescentar linhas a um arquivo existente.
+        
+        Args:
+            file_format: Formato do arquivo
+            
+        Returns:
+            True se o formato aceita acréscimo
+        """
+        return supports_append(file_format)
     
     @staticmethod
     def ensure_directory_exists(file_path: str):
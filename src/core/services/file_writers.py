@@ -0,0 +1,533 @@
+"""
+Escritores de arquivo incrementais do ScriptBird.
+
+Cada escritor recebe as linhas em lotes, grava em um arquivo temporário
+e só substitui o arquivo final quando a escrita termina sem erros. Os
+formatos de texto também aceitam acrescentar linhas a um arquivo
+existente, desfazendo o acréscimo se a escrita falhar.
+"""
+import csv
+import datetime
+import decimal
+import os
+from contextlib import nullcontext
+from typing import List, Optional, Sequence
+
+from core.exceptions.scriptbird_exceptions import FileOperationError
+from core.models.run_metrics import STAGE_FSYNC, STAGE_SERIALIZE, STAGE_WRITE, RunMetrics
+
+# Limite de linhas por planilha do Excel (incluindo o cabeçalho)
+XLSX_MAX_ROWS = 1048576
+
+# Linhas acumuladas por row group nos arquivos Parquet
+PARQUET_ROW_GROUP_SIZE = 131072
+
+# Codecs de compressão aceitos por formato colunar
+PARQUET_CODECS = ('none', 'snappy', 'gzip', 'brotli', 'lz4', 'zstd')
+FEATHER_CODECS = ('none', 'lz4', 'zstd')
+
+# Precisão dos decimais Arrow pelo tamanho em bytes do inteiro que guarda o
+# NUMERIC/DECIMAL (internal_size do description). No Firebird a precisão
+# declarada é mínima: um DECIMAL(4,2) guardado em INTEGER aceita 123456.78
+DECIMAL_STORAGE_PRECISION = {2: 18, 4: 18, 8: 18, 16: 38}
+
+
+class FileWriter:
+    """Base para escrita de arquivos em lotes."""
+    
+    supports_append = False
+    
+    def __init__(self,
+                 file_path: str,
+                 columns: List[str],
+                 description: Optional[Sequence[Sequence]] = None,
+                 compression: Optional[str] = None,
+                 append: bool = False,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Inicializa o escritor.
+        
+        Args:
+            file_path: Caminho final do arquivo
+            columns: Nomes das colunas
+            description: cursor.description da query, usado pelos formatos
+                tipados para definir o tipo de cada coluna
+            compression: Codec de compressão (formatos que suportam)
+            append: True para acrescentar linhas ao arquivo existente
+            metrics: Métricas do ciclo, que recebem os tempos de escrita
+            
+        Raises:
+            FileOperationError: Se o formato não aceitar acréscimo
+        """
+        if append and not self.supports_append:
+            raise FileOperationError(
+                f"Formato {os.path.splitext(file_path)[1]} não permite acrescentar linhas"
+            )
+        self.file_path = file_path
+        self.columns = list(columns)
+        self.description = description
+        self.compression = compression
+        self.append = append
+        self.metrics = metrics
+        self.rows_written = 0
+        root, ext = os.path.splitext(file_path)
+        self.temp_path = f"{root}.tmp{ext}"
+        self.target_path = file_path if append else self.temp_path
+        self._original_size = 0
+        self._reported_size = 0
+        self._opened = False
+        self._finished = False
+    
+    @property
+    def write_header(self) -> bool:
+        """Indica se o cabeçalho deve ser gravado."""
+        return not self.append or self._original_size == 0
+    
+    def open(self):
+        """Abre o arquivo de destino para escrita."""
+        if self.append and os.path.exists(self.file_path):
+            self._original_size = os.path.getsize(self.file_path)
+        self._open()
+        self._opened = True
+    
+    def write_batch(self, rows: Sequence[Sequence]):
+        """
+        Grava um lote de linhas.
+        
+        Args:
+            rows: Linhas a serem gravadas
+        """
+        if not self._opened:
+            self.open()
+        with self._timer(STAGE_SERIALIZE):
+            self._write_rows(rows)
+        self.rows_written += len(rows)
+        if self.metrics is not None:
+            size = self._size_on_disk()
+            self.metrics.add_written(len(rows), size - self._reported_size)
+            self._reported_size = size
+    
+    def finish(self):
+        """
+        Fecha o arquivo temporário e o grava em disco, sem substituir o final.
+        
+        Permite confirmar vários arquivos juntos: cada escritor termina a
+        escrita com finish() e só depois que todos terminaram os arquivos
+        finais são substituídos com commit(). Um escritor terminado ainda
+        pode ser descartado com abort().
+        """
+        if self._finished:
+            return
+        if not self._opened:
+            self.open()
+        with self._timer(STAGE_WRITE):
+            self._close()
+        self._opened = False
+        with self._timer(STAGE_FSYNC):
+            _fsync(self.target_path)
+        self._finished = True
+    
+    def commit(self):
+        """
+        Finaliza a escrita e substitui o arquivo final.
+        
+        O arquivo é gravado em disco (fsync) antes de substituir o final,
+        para que uma queda de energia não deixe um arquivo incompleto.
+        """
+        self.finish()
+        with self._timer(STAGE_WRITE):
+            if not self.append:
+                os.replace(self.temp_path, self.file_path)
+        if self.metrics is not None:
+            self.metrics.add_output(
+                self.rows_written, os.path.getsize(self.file_path) - self._original_size
+            )
+    
+    def abort(self):
+        """Descarta a escrita em andamento."""
+        try:
+            if self._opened:
+                self._close()
+        except Exception:
+            pass
+        self._opened = False
+        if self.append:
+            # Desfaz o acréscimo voltando ao tamanho original
+            if os.path.exists(self.file_path):
+                if self._original_size:
+                    os.truncate(self.file_path, self._original_size)
+                else:
+                    os.remove(self.file_path)
+        elif os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+    
+    def _size_on_disk(self) -> int:
+        """Bytes já gravados no destino (formatos em memória só gravam no fim)."""
+        try:
+            return os.path.getsize(self.target_path) - self._original_size
+        except OSError:
+            return self._reported_size
+    
+    def _timer(self, stage: str):
+        """Mede uma etapa nas métricas, se houver."""
+        return self.metrics.timer(stage) if self.metrics is not None else nullcontext()
+    
+    def _open(self):
+        """Abre o destino da escrita (implementado pelas subclasses)."""
+        raise NotImplementedError
+    
+    def _write_rows(self, rows: Sequence[Sequence]):
+        """Grava as linhas no destino (implementado pelas subclasses)."""
+        raise NotImplementedError
+    
+    def _close(self):
+        """Fecha o destino da escrita (implementado pelas subclasses)."""
+        raise NotImplementedError
+    
+    def __enter__(self):
+        """Context manager entry."""
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit: confirma ou descarta a escrita."""
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class CsvFileWriter(FileWriter):
+    """Escritor de arquivos CSV."""
+    
+    supports_append = True
+    
+    def _open(self):
+        """Abre o arquivo de destino e grava o cabeçalho."""
+        mode = 'a' if self.append else 'w'
+        self._file = open(self.target_path, mode, newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if self.write_header:
+            self._writer.writerow(self.columns)
+    
+    def _write_rows(self, rows: Sequence[Sequence]):
+        """Grava as linhas no arquivo."""
+        self._writer.writerows(rows)
+    
+    def _close(self):
+        """Fecha o arquivo."""
+        self._file.close()
+
+
+class TxtFileWriter(FileWriter):
+    """Escritor de arquivos TXT separados por tabulação."""
+    
+    supports_append = True
+    
+    def _open(self):
+        """Abre o arquivo de destino e grava o cabeçalho."""
+        mode = 'a' if self.append else 'w'
+        self._file = open(self.target_path, mode, encoding='utf-8')
+        if self.write_header:
+            self._file.write('\t'.join(self.columns) + '\n')
+    
+    def _write_rows(self, rows: Sequence[Sequence]):
+        """Grava as linhas no arquivo."""
+        self._file.writelines('\t'.join(map(str, row)) + '\n' for row in rows)
+    
+    def _close(self):
+        """Fecha o arquivo."""
+        self._file.close()
+
+
+class XlsxFileWriter(FileWriter):
+    """
+    Escritor de arquivos Excel em modo write-only.
+    
+    As linhas vão direto do lote para o openpyxl, sem DataFrame
+    intermediário, e a memória usada não cresce com o número de linhas.
+    Ao atingir o limite de linhas do Excel, continua em uma nova planilha.
+    O openpyxl (que carrega o numpy) só é importado no primeiro uso.
+    """
+    
+    def _open(self):
+        """Cria a pasta de trabalho e a primeira planilha."""
+        from openpyxl import Workbook
+        
+        self._workbook = Workbook(write_only=True)
+        self._sheet_count = 0
+        self._new_sheet()
+    
+    def _new_sheet(self):
+        """Cria uma nova planilha com o cabeçalho."""
+        self._sheet_count += 1
+        self._sheet = self._workbook.create_sheet(f"Sheet{self._sheet_count}")
+        self._sheet.append(self.columns)
+        self._sheet_rows = 1
+    
+    def _write_rows(self, rows: Sequence[Sequence]):
+        """Grava as linhas, criando novas planilhas quando necessário."""
+        start = 0
+        while start < len(rows):
+            if self._sheet_rows >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            chunk = rows[start:start + XLSX_MAX_ROWS - self._sheet_rows]
+            append = self._sheet.append
+            for row in chunk:
+                append(row)
+            self._sheet_rows += len(chunk)
+            start += len(chunk)
+    
+    def _close(self):
+        """Grava a pasta de trabalho no arquivo."""
+        self._workbook.save(self.target_path)
+
+
+class ArrowFileWriter(FileWriter):
+    """
+    Base para os formatos colunares gravados com pyarrow.
+    
+    Cada lote é convertido em um RecordBatch tipado assim que chega. Os
+    tipos vêm do cursor.description quando disponível e, caso contrário,
+    são inferidos a partir do primeiro lote.
+    """
+    
+    codecs: Sequence[str] = ()
+    default_codec = 'none'
+    
+    def _open(self):
+        """Carrega o pyarrow e valida o codec de compressão."""
+        try:
+            import pyarrow
+        except ImportError:
+            raise FileOperationError(
+                "O formato requer o pacote pyarrow (pip install pyarrow)"
+            )
+        self._pa = pyarrow
+        codec = (self.compression or self.default_codec).strip().lower()
+        if codec not in self.codecs:
+            raise FileOperationError(
+                f"Compressão '{codec}' não suportada. Use: {', '.join(self.codecs)}"
+            )
+        self._codec = None if codec == 'none' else codec
+        self._schema = None
+    
+    def _write_rows(self, rows: Sequence[Sequence]):
+        """Converte o lote em RecordBatch e o grava."""
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        if self._schema is None:
+            self._schema = self._build_schema(columns)
+            self._open_arrow_writer()
+        try:
+            arrays = [
+                self._pa.array(values, type=field.type)
+                for values, field in zip(columns, self._schema)
+            ]
+        except (self._pa.ArrowException, TypeError, ValueError) as e:
+            raise FileOperationError(f"Erro ao converter dados para o formato colunar: {e}")
+        self._write_record_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+    
+    def _close(self):
+        """Garante o schema em resultados vazios e fecha o arquivo."""
+        if self._schema is None:
+            self._schema = self._build_schema([() for _ in self.columns])
+            self._open_arrow_writer()
+        self._close_arrow_writer()
+    
+    def _build_schema(self, columns: Sequence[Sequence]):
+        """Monta o schema a partir do description ou do primeiro lote."""
+        pa = self._pa
+        fields = []
+        for index, name in enumerate(self.columns):
+            arrow_type = None
+            if self.description and index < len(self.description):
+                arrow_type = self._arrow_type(self.description[index], columns[index])
+            if arrow_type is None:
+                arrow_type = pa.array(columns[index]).type if columns[index] else pa.null()
+                if pa.types.is_null(arrow_type):
+                    arrow_type = pa.string()
+            fields.append(pa.field(name, arrow_type))
+        return pa.schema(fields)
+    
+    def _arrow_type(self, column_description: Sequence, values: Sequence):
+        """
+        Converte o tipo informado pelo driver em tipo Arrow.
+        
+        Args:
+            column_description: Descrição da coluna (cursor.description)
+            values: Valores da coluna no primeiro lote
+        
+        Returns:
+            Tipo Arrow, ou None para inferir dos valores
+        """
+        pa = self._pa
+        type_code = column_description[1] if len(column_description) > 1 else None
+        if type_code is decimal.Decimal:
+            # A precisão vem do armazenamento; do description só a escala
+            internal_size = column_description[3] if len(column_description) > 3 else None
+            scale = column_description[5] if len(column_description) > 5 else None
+            precision = DECIMAL_STORAGE_PRECISION.get(internal_size)
+            if precision is None or scale is None:
+                return None
+            return pa.decimal128(precision, abs(scale))
+        if type_code is str:
+            # BLOB SUB_TYPE 0 é descrito como str, mas o driver devolve bytes
+            sample = next((value for value in values if value is not None), None)
+            if isinstance(sample, (bytes, bytearray, memoryview)):
+                return pa.binary()
+        mapping = {
+            str: pa.string(),
+            int: pa.int64(),
+            float: pa.float64(),
+            bool: pa.bool_(),
+            bytes: pa.binary(),
+            datetime.datetime: pa.timestamp('us'),
+            datetime.date: pa.date32(),
+            datetime.time: pa.time64('us'),
+        }
+        return mapping.get(type_code)
+    
+    def _open_arrow_writer(self):
+        """Abre o escritor pyarrow (implementado pelas subclasses)."""
+        raise NotImplementedError
+    
+    def _write_record_batch(self, record_batch):
+        """Grava um RecordBatch (implementado pelas subclasses)."""
+        raise NotImplementedError
+    
+    def _close_arrow_writer(self):
+        """Fecha o escritor pyarrow (implementado pelas subclasses)."""
+        raise NotImplementedError
+
+
+class ParquetFileWriter(ArrowFileWriter):
+    """
+    Escritor de arquivos Parquet.
+    
+    Os RecordBatches são agrupados em row groups de até
+    PARQUET_ROW_GROUP_SIZE linhas antes de serem gravados.
+    """
+    
+    codecs = PARQUET_CODECS
+    default_codec = 'snappy'
+    
+    def _open_arrow_writer(self):
+        """Abre o ParquetWriter com o schema e a compressão escolhidos."""
+        import pyarrow.parquet as pq
+        
+        self._writer = pq.ParquetWriter(
+            self.target_path, self._schema, compression=self._codec or 'none'
+        )
+        self._pending = []
+        self._pending_rows = 0
+    
+    def _write_record_batch(self, record_batch):
+        """Acumula o lote e grava um row group quando completo."""
+        self._pending.append(record_batch)
+        self._pending_rows += record_batch.num_rows
+        if self._pending_rows >= PARQUET_ROW_GROUP_SIZE:
+            self._flush_row_group()
+    
+    def _flush_row_group(self):
+        """Grava os lotes acumulados como um row group."""
+        if self._pending:
+            table = self._pa.Table.from_batches(self._pending, schema=self._schema)
+            self._writer.write_table(table, row_group_size=max(self._pending_rows, 1))
+            self._pending = []
+            self._pending_rows = 0
+    
+    def _close_arrow_writer(self):
+        """Grava o último row group e fecha o arquivo."""
+        self._flush_row_group()
+        self._writer.close()
+
+
+class FeatherFileWriter(ArrowFileWriter):
+    """Escritor de arquivos Feather (formato Arrow IPC v2)."""
+    
+    codecs = FEATHER_CODECS
+    default_codec = 'lz4'
+    
+    def _open_arrow_writer(self):
+        """Abre o arquivo IPC com o schema e a compressão escolhidos."""
+        import pyarrow.ipc
+        
+        options = self._pa.ipc.IpcWriteOptions(compression=self._codec)
+        self._sink = self._pa.OSFile(self.target_path, 'wb')
+        self._writer = self._pa.ipc.new_file(self._sink, self._schema, options=options)
+    
+    def _write_record_batch(self, record_batch):
+        """Grava o lote no arquivo."""
+        self._writer.write_batch(record_batch)
+    
+    def _close_arrow_writer(self):
+        """Finaliza o arquivo IPC."""
+        self._writer.close()
+        self._sink.close()
+
+
+# Escritores disponíveis por extensão
+WRITERS = {
+    '.csv': CsvFileWriter,
+    '.txt': TxtFileWriter,
+    '.xlsx': XlsxFileWriter,
+    '.parquet': ParquetFileWriter,
+    '.feather': FeatherFileWriter,
+}
+
+
+def get_writer(file_path: str,
+               columns: List[str],
+               file_format: str,
+               description: Optional[Sequence[Sequence]] = None,
+               compression: Optional[str] = None,
+               append: bool = False,
+               metrics: Optional[RunMetrics] = None) -> FileWriter:
+    """
+    Cria o escritor adequado ao formato.
+    
+    Args:
+        file_path: Caminho final do arquivo
+        columns: Nomes das colunas
+        file_format: Formato do arquivo (.xlsx, .csv, .txt, .parquet, .feather)
+        description: cursor.description da query (tipos das colunas)
+        compression: Codec de compressão dos formatos colunares
+        append: True para acrescentar linhas ao arquivo existente
+        metrics: Métricas do ciclo, que recebem os tempos de escrita
+    
+    Returns:
+        Escritor do formato solicitado
+    
+    Raises:
+        FileOperationError: Se o formato não for suportado ou não aceitar
+            acréscimo
+    """
+    writer_class = WRITERS.get(file_format.lower().strip())
+    if writer_class is None:
+        raise FileOperationError(f"Formato não suportado: {file_format}")
+    return writer_class(file_path, columns, description, compression, append, metrics)
+
+
+def supports_append(file_format: str) -> bool:
+    """
+    Indica se o formato aceita acrescentar linhas a um arquivo existente.
+    
+    Args:
+        file_format: Formato do arquivo
+    
+    Returns:
+        True se o formato aceita acréscimo
+    """
+    writer_class = WRITERS.get(file_format.lower().strip())
+    return bool(writer_class and writer_class.supports_append)
+
+
+def _fsync(file_path: str):
+    """Força a gravação do arquivo em disco."""
+    fd = os.open(file_path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
\ No newline at end of file
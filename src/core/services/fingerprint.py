@@ -0,0 +1,137 @@
+"""
+Impressão digital (hash) do resultado de uma query.
+
+Permite ignorar a gravação de um ciclo quando os dados retornados são
+os mesmos do ciclo anterior.
+"""
+import hashlib
+import pickle
+import tempfile
+from contextlib import nullcontext
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core.models.run_metrics import STAGE_FINGERPRINT, RunMetrics
+
+# Chave da impressão digital no estado do script
+FINGERPRINT_KEY = 'fingerprint'
+
+
+class ResultFingerprint:
+    """
+    Hash de um resultado lido em lotes.
+    
+    Os lotes só passam pelo hash, sem serem guardados: comparar o
+    resultado com o do ciclo anterior não grava nada em disco.
+    """
+    
+    def __init__(self, metrics: Optional[RunMetrics] = None):
+        """
+        Inicializa o hash.
+        
+        Args:
+            metrics: Métricas do ciclo, que recebem o tempo de hash
+        """
+        self.metrics = metrics
+        self.rows = 0
+        self._digest = hashlib.blake2b(digest_size=32)
+    
+    def update(self, *values: Any):
+        """Inclui no hash valores que não são linhas (ex.: query e colunas)."""
+        self._digest.update(repr(values).encode('utf-8'))
+    
+    def consume(self, batches: Iterable[Sequence[Sequence]]) -> int:
+        """
+        Lê todos os lotes.
+        
+        Args:
+            batches: Lotes de linhas
+        
+        Returns:
+            Total de linhas lidas
+        """
+        for _ in self.hash_batches(batches):
+            pass
+        return self.rows
+    
+    def hash_batches(self, batches: Iterable[Sequence[Sequence]]) -> Iterator[Sequence[Sequence]]:
+        """
+        Repassa os lotes incluindo cada um no hash.
+        
+        Args:
+            batches: Lotes de linhas
+        
+        Returns:
+            Os mesmos lotes, na mesma ordem
+        """
+        for batch in batches:
+            with self._timer():
+                self._add_batch(batch)
+            yield batch
+    
+    def hexdigest(self) -> str:
+        """Hash do resultado lido."""
+        return self._digest.hexdigest()
+    
+    def _add_batch(self, batch: Sequence[Sequence]):
+        """Inclui um lote no hash."""
+        # repr é estável entre execuções (inclusive para Decimal e datas),
+        # ao contrário do pickle, que depende da identidade dos objetos
+        # repetidos
+        self._digest.update(repr(batch).encode('utf-8'))
+        self.rows += len(batch)
+    
+    def _timer(self):
+        """Mede a etapa de hash se houver métricas."""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.timer(STAGE_FINGERPRINT)
+
+
+class ResultSpool(ResultFingerprint):
+    """
+    Calcula o hash guardando as linhas em um arquivo temporário.
+    
+    As linhas são gravadas (pickle) em um arquivo temporário, para que, se
+    o resultado tiver mudado, o arquivo seja gravado a partir dele sem
+    repetir a query nem manter tudo em memória. O custo é gravar o
+    resultado inteiro no disco a cada ciclo, mesmo quando ele não mudou;
+    por isso só é usado com RESULTADO_TEMPORARIO = S.
+    """
+    
+    def __init__(self, metrics: Optional[RunMetrics] = None):
+        """
+        Inicializa o spool.
+        
+        Args:
+            metrics: Métricas do ciclo, que recebem o tempo de hash e spool
+        """
+        super().__init__(metrics)
+        self._file = tempfile.TemporaryFile(prefix='scriptbird_')
+    
+    def __iter__(self) -> Iterator[List[Tuple]]:
+        """Itera sobre os lotes guardados."""
+        self._file.seek(0)
+        while True:
+            with self._timer():
+                try:
+                    batch = pickle.load(self._file)
+                except EOFError:
+                    return
+            yield batch
+    
+    def close(self):
+        """Remove o arquivo temporário."""
+        self._file.close()
+    
+    def _add_batch(self, batch: Sequence[Sequence]):
+        """Inclui um lote no hash e o grava no arquivo temporário."""
+        super()._add_batch(batch)
+        pickle.dump(batch, self._file, pickle.HIGHEST_PROTOCOL)
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
\ No newline at end of file
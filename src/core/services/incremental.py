@@ -0,0 +1,74 @@
+"""
+Suporte à extração incremental por watermark.
+"""
+from typing import Any, Iterable, Iterator, List, Sequence
+
+from core.exceptions.scriptbird_exceptions import ScriptConfigurationError
+
+# Chave do watermark no estado do script
+WATERMARK_KEY = 'watermark'
+
+
+def build_incremental_query(query: str, column: str) -> str:
+    """
+    Restringe a query às linhas posteriores ao último watermark.
+    
+    A query original é usada como tabela derivada, então o filtro se
+    aplica à coluna de saída com o nome informado em COLUNA_WATERMARK.
+    
+    Args:
+        query: Query original do script
+        column: Coluna de watermark
+    
+    Returns:
+        Query com o parâmetro (?) do watermark
+    """
+    query = query.strip().rstrip(';')
+    return f"SELECT * FROM ({query}) INC WHERE INC.{column} > ?"
+
+
+def find_column(columns: List[str], name: str) -> int:
+    """
+    Localiza uma coluna do resultado sem diferenciar maiúsculas.
+    
+    Args:
+        columns: Nomes das colunas do resultado
+        name: Nome procurado
+    
+    Returns:
+        Índice da coluna
+    
+    Raises:
+        ScriptConfigurationError: Se a coluna não existir no resultado
+    """
+    for index, column in enumerate(columns):
+        if column.upper() == name.upper():
+            return index
+    raise ScriptConfigurationError(f"Coluna {name} não encontrada no resultado da query")
+
+
+class WatermarkTracker:
+    """Repassa os lotes registrando o maior valor da coluna de watermark."""
+    
+    def __init__(self, batches: Iterable[Sequence[Sequence]], column_index: int):
+        """
+        Inicializa o rastreador.
+        
+        Args:
+            batches: Lotes de linhas
+            column_index: Índice da coluna de watermark
+        """
+        self._batches = batches
+        self._index = column_index
+        self.value: Any = None
+    
+    def __iter__(self) -> Iterator[Sequence[Sequence]]:
+        """Itera sobre os lotes atualizando o watermark."""
+        index = self._index
+        for batch in self._batches:
+            values = [row[index] for row in batch if row[index] is not None]
+            if values:
+                batch_max = max(values)
+                if self.value is None or batch_max > self.value:
+                    self.value = batch_max
+            yield batch
\ No newline at end of file
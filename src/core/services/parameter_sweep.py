@@ -0,0 +1,77 @@
+"""
+Execução de uma query para cada valor de parâmetro do script.
+
+A query do script usa parâmetros (?) e os valores vêm de uma lista
+(PARAMETROS) ou de outra query (CONSULTA_PARAMETROS). Cada valor vira
+uma fatia executada pelo SliceRunner, como na execução particionada.
+"""
+import re
+from typing import List, Sequence, Tuple
+
+from core.exceptions.scriptbird_exceptions import ScriptConfigurationError
+from core.models.script_config import SaveToFileSettings
+from utils.sql import count_placeholders
+
+from .database_service import DatabaseService
+from .partitioning import QuerySlice
+
+# Caracteres trocados por '_' no sufixo do arquivo de cada valor
+_UNSAFE_LABEL = re.compile(r'[^\w.-]+')
+
+
+def load_parameter_values(settings: SaveToFileSettings, db_service: DatabaseService) -> List[Tuple]:
+    """
+    Obtém os valores dos parâmetros da query do script.
+    
+    Com PARAMETROS cada item da lista preenche os parâmetros (validado em
+    SaveToFileSettings); com CONSULTA_PARAMETROS cada linha do resultado
+    preenche os parâmetros na ordem das colunas.
+    
+    Args:
+        settings: Parâmetros da ação do script
+        db_service: Serviço de banco, para a consulta dos valores
+    
+    Returns:
+        Valores de cada execução, na ordem da lista ou da consulta
+    
+    Raises:
+        ScriptConfigurationError: Se a consulta não trouxer uma coluna para
+            cada parâmetro (?) da query
+    """
+    if not settings.consulta_parametros:
+        return settings.parameter_values
+    
+    columns, rows = db_service.execute_query(settings.consulta_parametros)
+    placeholders = count_placeholders(settings.query)
+    if len(columns) != placeholders:
+        raise ScriptConfigurationError(
+            f"CONSULTA_PARAMETROS retorna {len(columns)} coluna(s), "
+            f"mas a QUERY tem {placeholders} parâmetro(s) (?)"
+        )
+    return [tuple(row) for row in rows]
+
+
+def build_sweep_slices(query: str, values: Sequence[Tuple]) -> List[QuerySlice]:
+    """
+    Monta uma fatia da query para cada valor.
+    
+    O rótulo de cada fatia (sufixo do arquivo POR_VALOR) é o valor com os
+    caracteres inválidos em nomes de arquivo trocados por '_'; rótulos
+    repetidos recebem o número da posição.
+    
+    Args:
+        query: Query do script, com os parâmetros (?)
+        values: Valores de cada execução
+    
+    Returns:
+        Fatias na ordem dos valores
+    """
+    slices = []
+    labels = set()
+    for position, params in enumerate(values, 1):
+        label = _UNSAFE_LABEL.sub('_', '_'.join(str(value) for value in params)).strip('_') or 'vazio'
+        if label in labels:
+            label = f"{label}_{position}"
+        labels.add(label)
+        slices.append(QuerySlice(label, query, tuple(params)))
+    return slices
\ No newline at end of file
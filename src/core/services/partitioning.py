@@ -0,0 +1,331 @@
+"""
+Execução particionada de queries por faixas de chave.
+
+A query do script é dividida em fatias pela coluna de partição e as
+fatias são executadas em paralelo, cada uma em uma conexão do pool.
+"""
+import math
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from core.exceptions.scriptbird_exceptions import (
+    ExecutionCancelled,
+    FileOperationError,
+    ScriptBirdException,
+    ScriptConfigurationError,
+)
+from core.models.run_metrics import RunMetrics
+
+from .database_service import DatabaseService
+from .file_service import FileService
+from .file_writers import FileWriter
+
+# Lotes que cada fatia pode adiantar enquanto aguarda o escritor
+DEFAULT_QUEUE_SIZE = 4
+
+
+@dataclass
+class QuerySlice:
+    """
+    Fatia de uma query particionada.
+    
+    Uma fatia opcional só gera arquivo na gravação por fatia se trouxer
+    alguma linha.
+    """
+    
+    label: str
+    query: str
+    params: Tuple = ()
+    optional: bool = False
+
+
+def compute_ranges(minimum: Any, maximum: Any, count: int) -> List[Tuple[int, int]]:
+    """
+    Divide o intervalo [minimum, maximum] em faixas inteiras contíguas.
+    
+    Args:
+        minimum: Menor valor da coluna de partição
+        maximum: Maior valor da coluna de partição
+        count: Número de faixas desejado
+    
+    Returns:
+        Lista de (inicio, fim) com início inclusivo e fim exclusivo,
+        exceto a última faixa, cujo fim é inclusivo
+    
+    Raises:
+        ScriptConfigurationError: Se a coluna não for numérica inteira
+    """
+    if isinstance(minimum, bool) or not isinstance(minimum, (int, Decimal)) \
+            or not isinstance(maximum, (int, Decimal)):
+        raise ScriptConfigurationError(
+            "A coluna de partição deve ser numérica inteira"
+        )
+    low = math.floor(minimum)
+    high = math.ceil(maximum)
+    count = max(1, min(count, high - low + 1))
+    step = math.ceil((high - low + 1) / count)
+    
+    ranges = []
+    start = low
+    while start <= high:
+        end = min(start + step, high)
+        ranges.append((start, end))
+        start += step
+    return ranges
+
+
+def build_slices(query: str, column: str, ranges: List[Tuple[int, int]]) -> List[QuerySlice]:
+    """
+    Monta as fatias da query para as faixas informadas.
+    
+    Uma fatia extra (opcional) traz as linhas com a coluna de partição
+    nula, que não pertencem a nenhuma faixa.
+    
+    Args:
+        query: Query original do script
+        column: Coluna de partição
+        ranges: Faixas calculadas por compute_ranges
+    
+    Returns:
+        Fatias na ordem das faixas
+    """
+    base = f"SELECT * FROM ({query.strip().rstrip(';')}) PART WHERE "
+    slices = []
+    for index, (start, end) in enumerate(ranges, 1):
+        last = index == len(ranges)
+        condition = f"PART.{column} >= ? AND PART.{column} {'<=' if last else '<'} ?"
+        slices.append(QuerySlice(f"p{index:02d}", base + condition, (start, end)))
+    slices.append(QuerySlice("nulos", base + f"PART.{column} IS NULL", optional=True))
+    return slices
+
+
+class SliceRunner:
+    """
+    Executa fatias de query em paralelo e grava os resultados.
+    
+    Se cancel_event for sinalizado, as fatias são interrompidas antes do
+    lote seguinte, os arquivos em gravação são descartados e a execução
+    termina com ExecutionCancelled.
+    """
+    
+    def __init__(self,
+                 db_service: DatabaseService,
+                 file_service: FileService,
+                 batch_size: int,
+                 max_workers: int,
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 metrics: Optional[RunMetrics] = None,
+                 cancel_event: Optional[threading.Event] = None):
+        """
+        Inicializa o executor de fatias.
+        
+        Args:
+            db_service: Serviço de banco (conexões do pool)
+            file_service: Serviço de arquivos
+            batch_size: Quantidade de linhas por lote
+            max_workers: Número máximo de fatias simultâneas
+            log_callback: Função de callback para logs
+            queue_size: Lotes que cada fatia pode adiantar
+            metrics: Métricas do ciclo, somadas entre as fatias
+            cancel_event: Evento que interrompe as fatias em andamento
+        """
+        self.db_service = db_service
+        self.file_service = file_service
+        self.batch_size = batch_size
+        self.max_workers = max(1, max_workers)
+        self.log_callback = log_callback
+        self.queue_size = queue_size
+        self.metrics = metrics
+        self.cancel_event = cancel_event
+    
+    def run_per_slice(self,
+                      slices: List[QuerySlice],
+                      path_for: Callable[[QuerySlice], str],
+                      file_format: str,
+                      compression: Optional[str] = None) -> int:
+        """
+        Executa as fatias em paralelo gravando um arquivo por fatia.
+        
+        Os arquivos só substituem os anteriores depois que todas as fatias
+        terminaram sem erro. Fatias opcionais sem linhas não geram arquivo. Na primeira falha as demais fatias são
+        interrompidas e todos os arquivos em gravação são descartados,
+        mantendo os arquivos do ciclo anterior.
+        
+        Args:
+            slices: Fatias a executar
+            path_for: Função que devolve o caminho do arquivo de cada fatia
+            file_format: Formato dos arquivos
+            compression: Codec de compressão dos formatos colunares
+        
+        Returns:
+            Total de linhas gravadas
+        """
+        stop = threading.Event()
+        writers: List[Tuple[QuerySlice, FileWriter]] = []
+        writers_lock = threading.Lock()
+        
+        def run(query_slice: QuerySlice):
+            if stop.is_set():
+                return
+            self._check_cancelled()
+            with self.db_service.execute_query_iter(
+                query_slice.query, self.batch_size, query_slice.params, self.metrics
+            ) as result:
+                def open_writer() -> FileWriter:
+                    writer = self.file_service.open_writer(
+                        result.columns, path_for(query_slice), file_format,
+                        result.description, compression, metrics=self.metrics
+                    )
+                    with writers_lock:
+                        writers.append((query_slice, writer))
+                    return writer
+                
+                # A fatia opcional só abre o arquivo ao receber o primeiro lote
+                writer = None if query_slice.optional else open_writer()
+                try:
+                    for batch in result:
+                        if stop.is_set():
+                            return
+                        self._check_cancelled()
+                        if writer is None:
+                            writer = open_writer()
+                        writer.write_batch(batch)
+                    if writer is not None:
+                        writer.finish()
+                except ScriptBirdException:
+                    raise
+                except Exception as e:
+                    raise FileOperationError(f"Erro ao salvar arquivo: {e}")
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = [executor.submit(run, query_slice) for query_slice in slices]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for _, writer in writers:
+                writer.abort()
+            raise
+        executor.shutdown(wait=True)
+        
+        writers.sort(key=lambda item: slices.index(item[0]))
+        for query_slice, writer in writers:
+            writer.commit()
+            self._log(f"Fatia {query_slice.label}: {writer.rows_written} registros em {writer.file_path}")
+        return sum(writer.rows_written for _, writer in writers)
+    
+    def run_merged(self,
+                   slices: List[QuerySlice],
+                   file_path: str,
+                   file_format: str,
+                   compression: Optional[str] = None) -> int:
+        """
+        Executa as fatias em paralelo gravando um único arquivo.
+        
+        Cada fatia lê seus lotes para uma fila limitada; o escritor consome
+        as filas na ordem das fatias, de forma que o arquivo mantém a ordem
+        das faixas e a memória fica limitada ao tamanho das filas.
+        
+        Args:
+            slices: Fatias a executar
+            file_path: Caminho do arquivo de saída
+            file_format: Formato do arquivo
+            compression: Codec de compressão dos formatos colunares
+        
+        Returns:
+            Total de linhas gravadas
+        """
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in slices]
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # Envio em ordem: uma fatia sempre inicia antes das seguintes
+        futures = [
+            executor.submit(self._produce, query_slice, slice_queue, stop)
+            for query_slice, slice_queue in zip(slices, queues)
+        ]
+        
+        try:
+            columns, description = self._read_header(queues[0])
+            
+            def batches() -> Iterator[Sequence[Sequence]]:
+                for index, slice_queue in enumerate(queues):
+                    if index:
+                        self._read_header(slice_queue)
+                    for batch in self._read_batches(slice_queue):
+                        self._check_cancelled()
+                        yield batch
+            
+            return self.file_service.save_stream_to_file(
+                columns, batches(), file_path, file_format, description, compression,
+                metrics=self.metrics
+            )
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+    
+    def _produce(self, query_slice: QuerySlice, slice_queue: queue.Queue, stop: threading.Event):
+        """Executa uma fatia colocando cabeçalho, lotes e fim na fila."""
+        try:
+            with self.db_service.execute_query_iter(
+                query_slice.query, self.batch_size, query_slice.params, self.metrics
+            ) as result:
+                if not self._put(slice_queue, ('header', (result.columns, result.description)), stop):
+                    return
+                for batch in result:
+                    self._check_cancelled()
+                    if not self._put(slice_queue, ('batch', batch), stop):
+                        return
+            self._put(slice_queue, ('end', None), stop)
+        except Exception as e:
+            self._put(slice_queue, ('error', e), stop)
+    
+    @staticmethod
+    def _put(slice_queue: queue.Queue, item: Tuple, stop: threading.Event) -> bool:
+        """Coloca um item na fila aguardando espaço até a interrupção."""
+        while not stop.is_set():
+            try:
+                slice_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    @staticmethod
+    def _read_header(slice_queue: queue.Queue) -> Tuple[List[str], Any]:
+        """Lê o cabeçalho (colunas e description) de uma fatia."""
+        kind, payload = slice_queue.get()
+        if kind == 'error':
+            raise payload
+        return payload
+    
+    @staticmethod
+    def _read_batches(slice_queue: queue.Queue) -> Iterator[Sequence[Sequence]]:
+        """Lê os lotes de uma fatia até o fim."""
+        while True:
+            kind, payload = slice_queue.get()
+            if kind == 'end':
+                return
+            if kind == 'error':
+                raise payload
+            yield payload
+    
+    def _check_cancelled(self):
+        """Lança ExecutionCancelled se o cancelamento foi pedido."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ExecutionCancelled("Ciclo interrompido.")
+    
+    def _log(self, message: str):
+        """Registra uma mensagem de log."""
+        if self.log_callback:
+            self.log_callback(message)
\ No newline at end of file
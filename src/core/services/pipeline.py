@@ -0,0 +1,91 @@
+"""
+Leitura antecipada de lotes em uma thread separada.
+
+Enquanto o escritor serializa um lote, a thread de leitura já busca os
+próximos no banco, de forma que rede e disco/CPU trabalham ao mesmo
+tempo e o ciclo tende a durar o maior dos dois tempos, não a soma.
+"""
+import queue
+import threading
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+# Lotes que a leitura pode adiantar enquanto aguarda o escritor
+DEFAULT_QUEUE_SIZE = 4
+
+
+class BatchPrefetcher:
+    """
+    Lê os lotes de um iterável em uma thread, através de uma fila limitada.
+    
+    A fila cheia bloqueia a leitura (backpressure), então a memória fica
+    limitada a queue_size lotes. Erros da leitura são repassados a quem
+    consome os lotes. Deve ser usado como context manager: ao sair, a
+    thread de leitura é interrompida e aguardada antes que o resultado
+    (e a conexão) seja fechado.
+    """
+    
+    def __init__(self, batches: Iterable[Sequence[Sequence]], queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Inicializa a leitura antecipada.
+        
+        Args:
+            batches: Lotes de linhas (ex.: ResultStream)
+            queue_size: Lotes que podem ser adiantados
+        """
+        self._batches = batches
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Inicia a thread de leitura."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._produce, name='BatchPrefetcher', daemon=True)
+            self._thread.start()
+    
+    def __iter__(self) -> Iterator[Sequence[Sequence]]:
+        """Itera sobre os lotes lidos pela thread."""
+        self.start()
+        while True:
+            kind, payload = self._queue.get()
+            if kind == 'end':
+                return
+            if kind == 'error':
+                raise payload
+            yield payload
+    
+    def close(self):
+        """Interrompe a leitura e aguarda o fim da thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _produce(self):
+        """Lê os lotes colocando-os na fila, seguidos do fim ou do erro."""
+        try:
+            for batch in self._batches:
+                if not self._put(('batch', batch)):
+                    return
+            self._put(('end', None))
+        except Exception as e:
+            self._put(('error', e))
+    
+    def _put(self, item: Tuple) -> bool:
+        """Coloca um item na fila aguardando espaço até a interrupção."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
\ No newline at end of file
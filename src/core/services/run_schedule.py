@@ -0,0 +1,134 @@
+"""
+Cálculo dos horários de execução dos scripts.
+"""
+import math
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from core.models.script_config import (
+    SOBREPOSICAO_AGRUPAR,
+    SOBREPOSICAO_ENFILEIRAR,
+    SaveToFileSettings,
+)
+from utils.cron import CronExpression
+
+
+class RunSchedule:
+    """
+    Horários de execução de um script no relógio monotônico.
+    
+    Com TEMPO_ENTRE_EXECUCOES as execuções são ancoradas no início
+    (início + n * intervalo), sem acumular a duração de cada ciclo. Com
+    AGENDA os horários seguem a expressão cron no relógio do sistema.
+    
+    Quando uma execução passa do horário seguinte, a política
+    SOBREPOSICAO decide o que fazer com os horários perdidos: PULAR
+    descarta, ENFILEIRAR executa um ciclo para cada e AGRUPAR executa um
+    único ciclo logo em seguida.
+    """
+    
+    def __init__(self,
+                 settings: SaveToFileSettings,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Inicializa a agenda.
+        
+        Args:
+            settings: Parâmetros da ação do script
+            log_callback: Função de callback para logs
+        """
+        self._configure(settings)
+        self.log_callback = log_callback
+        self._anchor = time.monotonic()
+        self._last_due: Optional[float] = None
+        self.due = self._anchor if self.cron is None else self._next_tick(self._anchor)
+    
+    def update(self, settings: SaveToFileSettings) -> bool:
+        """
+        Aplica os parâmetros de agenda de um script recarregado.
+        
+        Mantém a âncora. Se a agenda estiver aguardando, a próxima execução
+        passa a ser o primeiro horário da nova agenda após a última (ou
+        imediata, se já passou); se o horário já chegou, o ciclo atual é
+        mantido e a nova agenda vale a partir de advance().
+        
+        Args:
+            settings: Parâmetros da ação do script
+        
+        Returns:
+            True se a agenda mudou
+        """
+        previous = (self.interval, self.cron and self.cron.expression, self.policy, self.repeat)
+        self._configure(settings)
+        if previous == (self.interval, self.cron and self.cron.expression, self.policy, self.repeat):
+            return False
+        if self.due > time.monotonic():
+            self.due = self._next_tick(self._last_due if self._last_due is not None else self._anchor)
+        return True
+    
+    def delay(self) -> float:
+        """Segundos até a próxima execução (0 se já estiver atrasada)."""
+        return max(0.0, self.due - time.monotonic())
+    
+    def describe_next(self) -> str:
+        """Descreve o horário da próxima execução para os logs."""
+        moment = datetime.now().timestamp() + self.delay()
+        return datetime.fromtimestamp(round(moment)).strftime('%d/%m/%Y %H:%M:%S')
+    
+    def advance(self):
+        """
+        Calcula a próxima execução após o término de um ciclo.
+        
+        Deve ser chamado apenas quando repeat for verdadeiro.
+        """
+        now = time.monotonic()
+        self._last_due = self.due
+        following = self._next_tick(self.due)
+        if following > now:
+            self.due = following
+            return
+        
+        if self.policy == SOBREPOSICAO_ENFILEIRAR:
+            self.due = following
+            self._log("Execução ultrapassou o horário seguinte; executando o horário pendente.")
+        elif self.policy == SOBREPOSICAO_AGRUPAR:
+            self.due = now
+            self._log("Execução ultrapassou o horário seguinte; horários perdidos agrupados em uma execução.")
+        else:
+            skipped = self._count_ticks(self.due, now)
+            self.due = self._next_tick(now)
+            self._log(f"Execução ultrapassou o horário seguinte; {skipped} horário(s) pulado(s).")
+    
+    def _configure(self, settings: SaveToFileSettings):
+        """Lê os parâmetros de agenda do script."""
+        self.interval = settings.tempo_entre_execucoes
+        self.cron = CronExpression(settings.agenda) if settings.agenda else None
+        self.policy = settings.sobreposicao
+        self.repeat = settings.repetir or self.cron is not None
+    
+    def _next_tick(self, after: float) -> float:
+        """Primeiro horário da agenda estritamente posterior a 'after'."""
+        if self.cron is None:
+            interval = max(1, self.interval)
+            ticks = math.floor((after - self._anchor) / interval) + 1
+            return self._anchor + ticks * interval
+        
+        # Converte para o relógio do sistema e volta para o monotônico
+        offset = time.time() - time.monotonic()
+        moment = datetime.fromtimestamp(after + offset)
+        return self.cron.next_after(moment).timestamp() - offset
+    
+    def _count_ticks(self, after: float, until: float) -> int:
+        """Quantidade de horários em (after, until]."""
+        count = 0
+        tick = self._next_tick(after)
+        while tick <= until:
+            count += 1
+            tick = self._next_tick(tick)
+        return count
+    
+    def _log(self, message: str):
+        """Registra uma mensagem de log."""
+        if self.log_callback:
+            self.log_callback(message)
\ No newline at end of file
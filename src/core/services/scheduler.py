@@ -0,0 +1,355 @@
+"""
+Agendador de múltiplos scripts do ScriptBird.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.exceptions.scriptbird_exceptions import ExecutionCancelled, ScriptConfigurationError
+from core.models.database_config import DatabaseConfig
+from core.models.run_metrics import RunMetrics
+from core.models.run_progress import RunProgress
+from core.models.scheduler_config import DEFAULT_MAX_WORKERS
+from core.models.script_config import SaveToFileSettings, ScriptAction
+from utils.signals import Signal
+
+from .database_service import DatabaseService
+from .file_service import FileService
+from .run_schedule import RunSchedule
+from .script_reloader import ScriptReloader
+from .script_runner import ScriptRunner
+from .worker_pool import WorkerPool
+
+
+@dataclass
+class ScheduledJob:
+    """Script registrado no agendador."""
+    
+    name: str
+    settings: SaveToFileSettings
+    db_config: DatabaseConfig
+    schedule: RunSchedule
+    priority: int = 0
+    sequence: int = 0
+    running: bool = False
+    last_metrics: Optional[RunMetrics] = None
+    reloader: Optional[ScriptReloader] = None
+    last_error: Optional[Exception] = None
+    path: str = ''
+    
+    @property
+    def next_run(self) -> float:
+        """Horário (monotônico) da próxima execução."""
+        return self.schedule.due
+    
+    @property
+    def database_key(self) -> Tuple[str, str]:
+        """Identifica o banco do script (mesma chave do pool de conexões)."""
+        return self.db_config.get_dsn(), self.db_config.usuario.upper()
+
+
+class Scheduler:
+    """
+    Executa vários scripts em um pool de threads.
+    
+    Os scripts prontos aguardam em fila e são despachados por prioridade
+    (maior valor de PRIORIDADE primeiro, depois o que está esperando há
+    mais tempo), respeitando o limite de execuções simultâneas por banco.
+    Todos os scripts compartilham o pool de conexões e o FileService;
+    scripts com PROCESSO_ISOLADO = S executam seus ciclos em um pool de
+    processos com max_workers processos, criado no primeiro uso. O sinal
+    finished é emitido na thread do agendador ao terminar.
+    
+    Scripts registrados com script_loader são relidos antes de cada ciclo
+    e em reload(); as alterações valem a partir do ciclo seguinte. reload()
+    lê os arquivos fora do lock do agendador, então pode ser chamado da
+    thread da janela sem esperar pelo despacho.
+    
+    Um erro em um ciclo (ex.: queda de rede) é informado no log e o script
+    continua agendado; apenas um erro de configuração do script ou o
+    cancelamento o retiram da agenda. failed_jobs lista os scripts cujo
+    último ciclo falhou.
+    """
+    
+    def __init__(self,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 max_per_database: int = 0,
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 progress_callback: Optional[Callable[[RunProgress], None]] = None):
+        """
+        Inicializa o agendador.
+        
+        Args:
+            max_workers: Número máximo de scripts executando ao mesmo tempo
+            max_per_database: Limite de scripts simultâneos por banco
+                (0 usa o max_conexoes de cada banco)
+            log_callback: Função de callback para logs
+            progress_callback: Função chamada com o andamento de cada ciclo,
+                com o nome do script em RunProgress.script
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_per_database = max_per_database
+        self.log_callback = log_callback or print
+        self.progress_callback = progress_callback
+        self.file_service = FileService()
+        self._jobs: List[ScheduledJob] = []
+        self._finished_jobs: List[ScheduledJob] = []
+        self._active: Dict[Tuple[str, str], int] = {}
+        self._active_count = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._cancel_event = threading.Event()
+        self.finished = Signal()
+        self._thread = None
+        self._worker_pool: Optional[WorkerPool] = None
+    
+    def add_job(self,
+                name: str,
+                script_action: ScriptAction,
+                db_config: DatabaseConfig,
+                script_loader: Optional[Callable[[], ScriptAction]] = None,
+                script_path: str = '') -> ScheduledJob:
+        """
+        Registra um script no agendador.
+        
+        Args:
+            name: Nome usado nos logs
+            script_action: Ação do script
+            db_config: Configuração do banco usado pelo script
+            script_loader: Função que relê a ação do arquivo do script (a
+                mesma instância enquanto ele não muda)
+            script_path: Arquivo do script, usado por reload(path)
+        
+        Returns:
+            Job registrado
+        
+        Raises:
+            ScriptConfigurationError: Se a ação ou as variáveis forem inválidas
+        """
+        if script_action.executar != "SALVAR_EM_ARQUIVO":
+            raise ScriptConfigurationError(
+                f"Ação '{script_action.executar}' não reconhecida."
+            )
+        settings = SaveToFileSettings.from_action(script_action)
+        log = lambda message: self._log(f"[{name}] {message}")
+        job = ScheduledJob(
+            name=name,
+            settings=settings,
+            db_config=db_config,
+            schedule=RunSchedule(settings, log),
+            priority=script_action.get_int_variable('PRIORIDADE', 0),
+            reloader=ScriptReloader(script_action, script_loader, log),
+            path=script_path
+        )
+        with self._cond:
+            job.sequence = len(self._jobs)
+            self._jobs.append(job)
+            self._cond.notify_all()
+        return job
+    
+    def start(self):
+        """Inicia o agendador em thread separada."""
+        self._stopping = False
+        self._cancel_event.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.start()
+    
+    def stop(self):
+        """
+        Pede a parada do agendador sem bloquear (aguarde o sinal finished).
+        
+        Os ciclos em andamento são interrompidos antes do lote seguinte;
+        os de scripts em processo isolado são concluídos.
+        """
+        self._cancel_event.set()
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+    
+    def reload(self, path: Optional[str] = None):
+        """
+        Relê os scripts que aguardam a próxima execução.
+        
+        Os arquivos são lidos sem o lock e só a aplicação dos parâmetros
+        novos o usa. Os scripts em execução guardam as alterações para o
+        ciclo seguinte.
+        
+        Args:
+            path: Arquivo do script alterado (None relê todos)
+        """
+        with self._cond:
+            jobs = [
+                job for job in self._jobs
+                if job.reloader is not None and (path is None or _same_file(job.path, path))
+            ]
+        changed = [job for job in jobs if job.reloader.poll()]
+        if not changed:
+            return
+        with self._cond:
+            for job in changed:
+                if not job.running and job in self._jobs:
+                    self._apply_settings(job, job.reloader.take())
+            self._cond.notify_all()
+    
+    @property
+    def failed_jobs(self) -> List[str]:
+        """Nomes dos scripts cujo último ciclo terminou com erro."""
+        with self._cond:
+            return [job.name for job in self._jobs + self._finished_jobs if job.last_error is not None]
+    
+    def is_alive(self) -> bool:
+        """Verifica se a thread está ativa."""
+        return self._thread.is_alive() if self._thread else False
+    
+    def join(self, timeout: Optional[float] = None):
+        """
+        Aguarda a thread terminar.
+        
+        Args:
+            timeout: Espera máxima em segundos (None aguarda indefinidamente)
+        """
+        if self._thread:
+            self._thread.join(timeout)
+    
+    def _run(self):
+        """Laço de despacho dos scripts."""
+        self._log(
+            f"Agendador iniciado com {len(self._jobs)} scripts "
+            f"e até {self.max_workers} execuções simultâneas."
+        )
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            with self._cond:
+                while not self._stopping and (self._jobs or self._active_count):
+                    self._dispatch_ready(executor)
+                    self._cond.wait(self._time_to_next_run())
+                if self._stopping:
+                    self._log("Execução interrompida.")
+        finally:
+            executor.shutdown(wait=True)
+            if self._worker_pool is not None:
+                self._worker_pool.shutdown()
+                self._worker_pool = None
+            self._log("Agendador finalizado.")
+            self.finished.emit()
+    
+    def _dispatch_ready(self, executor: ThreadPoolExecutor):
+        """Despacha os scripts prontos enquanto houver vagas (com o lock)."""
+        now = time.monotonic()
+        ready = sorted(
+            (job for job in self._jobs if not job.running and job.next_run <= now),
+            key=lambda job: (-job.priority, job.next_run, job.sequence)
+        )
+        for job in ready:
+            if self._active_count >= self.max_workers:
+                return
+            key = job.database_key
+            if self._active.get(key, 0) >= self._database_limit(job):
+                continue
+            job.running = True
+            self._active[key] = self._active.get(key, 0) + 1
+            self._active_count += 1
+            executor.submit(self._run_job, job)
+    
+    def _database_limit(self, job: ScheduledJob) -> int:
+        """Número máximo de scripts simultâneos no banco do job."""
+        limit = job.db_config.max_conexoes
+        if self.max_per_database:
+            limit = min(limit, self.max_per_database)
+        return max(1, limit)
+    
+    def _time_to_next_run(self) -> Optional[float]:
+        """
+        Tempo até o próximo script agendado ficar pronto (com o lock).
+        
+        Scripts prontos que aguardam vaga não contam: são despachados
+        quando uma execução termina e notifica a condição.
+        """
+        now = time.monotonic()
+        waiting = [job.next_run for job in self._jobs if not job.running and job.next_run > now]
+        if not waiting:
+            return None
+        return min(waiting) - now
+    
+    def _run_job(self, job: ScheduledJob):
+        """Executa um ciclo do script e reagenda se necessário."""
+        def log(message: str):
+            self._log(f"[{job.name}] {message}")
+        
+        self._refresh_job(job)
+        progress = None
+        if self.progress_callback:
+            progress = lambda value: self.progress_callback(replace(value, script=job.name))
+        expected_rows = job.last_metrics.rows_fetched if job.last_metrics else None
+        
+        keep = job.schedule.repeat
+        try:
+            if job.settings.processo_isolado:
+                job.last_metrics = self._get_worker_pool().run_cycle(
+                    job.settings, job.db_config, log, progress, expected_rows
+                )
+            else:
+                runner = ScriptRunner(
+                    job.settings, DatabaseService(job.db_config), self.file_service, log,
+                    self._cancel_event, progress
+                )
+                job.last_metrics = runner.run_cycle(expected_rows)
+            job.last_error = None
+        except ExecutionCancelled:
+            log("Ciclo em andamento interrompido.")
+            keep = False
+        except ScriptConfigurationError as e:
+            job.last_error = e
+            log(f"Erro de configuração do script; script retirado da agenda: {e}")
+            keep = False
+        except Exception as e:
+            job.last_error = e
+            log(f"Erro ao processar ciclo do script: {e}")
+        
+        with self._cond:
+            job.running = False
+            self._active[job.database_key] -= 1
+            self._active_count -= 1
+            if keep:
+                job.schedule.advance()
+                log(f"Próxima execução em {job.schedule.describe_next()}")
+            else:
+                self._jobs.remove(job)
+                self._finished_jobs.append(job)
+                log("Script concluído.")
+            self._cond.notify_all()
+    
+    def _refresh_job(self, job: ScheduledJob):
+        """Aplica ao job as alterações do arquivo do script, se houver."""
+        self._apply_settings(job, job.reloader.check() if job.reloader else None)
+    
+    def _apply_settings(self, job: ScheduledJob, settings: Optional[SaveToFileSettings]):
+        """Aplica ao job os parâmetros do script recarregado (None não altera)."""
+        if settings is None:
+            return
+        job.settings = settings
+        job.priority = job.reloader.action.get_int_variable('PRIORIDADE', 0)
+        if job.schedule.update(settings):
+            self._log(f"[{job.name}] Agenda alterada; próxima execução em {job.schedule.describe_next()}")
+    
+    def _get_worker_pool(self) -> WorkerPool:
+        """Pool de processos dos scripts isolados, criado no primeiro uso."""
+        with self._cond:
+            if self._worker_pool is None:
+                self._worker_pool = WorkerPool(self.max_workers)
+            return self._worker_pool
+    
+    def _log(self, message: str):
+        """Registra uma mensagem de log."""
+        if self.log_callback:
+            self.log_callback(message)
+
+
+def _same_file(first: str, second: str) -> bool:
+    """Compara dois caminhos de arquivo (relativos ou com outra grafia)."""
+    if not first or not second:
+        return False
+    return os.path.normcase(os.path.abspath(first)) == os.path.normcase(os.path.abspath(second))
\ No newline at end of file
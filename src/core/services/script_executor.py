@@ -1,30 +1,52 @@
 """
 Executor de scripts do ScriptBird.
 """
-import os
 import threading
-import time
-from typing import Callable, Optional
+from collections import deque
+from typing import Callable, Deque, List, Optional
 
-from PyQt5.QtCore import QObject, pyqtSignal
-
-from core.exceptions.scriptbird_exceptions import ScriptConfigurationError
+from core.exceptions.scriptbird_exceptions import ExecutionCancelled, ScriptConfigurationError
 from core.models.database_config import DatabaseConfig
-from core.models.script_config import ScriptAction
+from core.models.run_metrics import RunMetrics
+from core.models.run_progress import RunProgress
+from core.models.script_config import SaveToFileSettings, ScriptAction
+from utils.signals import Signal
 
 from .database_service import DatabaseService
 from .file_service import FileService
+from .run_schedule import RunSchedule
+from .script_reloader import ScriptReloader
+from .script_runner import ScriptRunner
+from .worker_pool import WorkerPool
+
 
+# Quantidade de ciclos mantidos no histórico de métricas
+METRICS_HISTORY_SIZE = 100
 
-class ScriptExecutor(QObject):
-    """Executor de scripts em thread separada."""
+
+class ScriptExecutor:
+    """
+    Executor de scripts em thread separada.
+    
+    O sinal finished é emitido na thread do executor ao terminar; last_error
+    guarda o erro que interrompeu a execução, se houver. stop() não
+    bloqueia: interrompe a espera pelo próximo ciclo e o ciclo em
+    andamento antes do lote seguinte (em processo isolado, o ciclo em
+    andamento é concluído).
     
-    finished = pyqtSignal()
+    Com script_loader, o arquivo do script é verificado antes de cada
+    ciclo: alterações (inclusive de agenda) valem a partir do ciclo
+    seguinte, sem reiniciar a execução. reload() faz a espera pelo
+    próximo ciclo verificar o arquivo imediatamente.
+    """
     
     def __init__(self, 
                  db_config: DatabaseConfig, 
                  script_action: ScriptAction,
-                 log_callback: Optional[Callable[[str], None]] = None):
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 metrics_callback: Optional[Callable[[RunMetrics], None]] = None,
+                 progress_callback: Optional[Callable[[RunProgress], None]] = None,
+                 script_loader: Optional[Callable[[], ScriptAction]] = None):
         """
         Inicializa o executor.
         
@@ -32,13 +54,24 @@ class ScriptExecutor(QObject):
             db_config: Configuração do banco de dados
             script_action: Ação do script a ser executada
             log_callback: Função de callback para logs
+            metrics_callback: Função chamada com as métricas de cada ciclo
+            progress_callback: Função chamada com o andamento do ciclo em
+                execução, algumas vezes por segundo
+            script_loader: Função que relê a ação do arquivo do script (a
+                mesma instância enquanto ele não muda)
         """
-        super().__init__()
         self.db_config = db_config
         self.script_action = script_action
         self.log_callback = log_callback or print
-        self._running = threading.Event()
-        self._running.set()
+        self.metrics_callback = metrics_callback
+        self.progress_callback = progress_callback
+        self.script_loader = script_loader
+        self._metrics: Deque[RunMetrics] = deque(maxlen=METRICS_HISTORY_SIZE)
+        self.finished = Signal()
+        self.last_error: Optional[Exception] = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._worker_pool: Optional[WorkerPool] = None
         self._thread = None
     
     def start(self):
@@ -47,17 +80,42 @@ class ScriptExecutor(QObject):
         self._thread.start()
     
     def stop(self):
-        """Para a execução."""
-        self._running.clear()
+        """Pede a parada da execução (aguarde o sinal finished)."""
+        self._stop_event.set()
+        self._wake_event.set()
+    
+    def reload(self, path: Optional[str] = None):
+        """
+        Avisa que o arquivo do script mudou (ex.: pelo observador de arquivos).
+        
+        Args:
+            path: Arquivo alterado (ignorado: o executor tem um só script)
+        """
+        self._wake_event.set()
     
     def is_alive(self) -> bool:
         """Verifica se a thread está ativa."""
         return self._thread.is_alive() if self._thread else False
     
-    def join(self):
-        """Aguarda a thread terminar."""
+    def join(self, timeout: Optional[float] = None):
+        """
+        Aguarda a thread terminar.
+        
+        Args:
+            timeout: Espera máxima em segundos (None aguarda indefinidamente)
+        """
         if self._thread:
-            self._thread.join()
+            self._thread.join(timeout)
+    
+    @property
+    def last_metrics(self) -> Optional[RunMetrics]:
+        """Métricas do último ciclo concluído."""
+        return self._metrics[-1] if self._metrics else None
+    
+    @property
+    def metrics_history(self) -> List[RunMetrics]:
+        """Métricas dos últimos ciclos, do mais antigo ao mais recente."""
+        return list(self._metrics)
     
     def _run(self):
         """Executa o script."""
@@ -67,9 +125,12 @@ class ScriptExecutor(QObject):
             if self.script_action.executar == "SALVAR_EM_ARQUIVO":
                 self._execute_save_to_file()
             else:
-                self._log(f"Ação '{self.script_action.executar}' não reconhecida.")
+                raise ScriptConfigurationError(
+                    f"Ação '{self.script_action.executar}' não reconhecida."
+                )
                 
         except Exception as e:
+            self.last_error = e
             self._log(f"Erro durante execução do BOT: {e}")
         finally:
             self.finished.emit()
@@ -77,57 +138,88 @@ class ScriptExecutor(QObject):
     def _execute_save_to_file(self):
         """Executa a ação de salvar em arquivo."""
         # Validação das variáveis necessárias
-        query = self.script_action.get_variable('QUERY')
-        caminho = self.script_action.get_variable('CAMINHO', '').strip()
-        nome_arquivo = self.script_action.get_variable('NOME_ARQUIVO', '').strip()
-        formato = self.script_action.get_variable('FORMATO', '.xlsx').strip().lower()
-        tempo_entre_execucoes = self.script_action.get_int_variable('TEMPO_ENTRE_EXECUCOES', 3600)
-        repetir = self.script_action.get_bool_variable('REPETIR', False)
-        
-        if not query:
-            raise ScriptConfigurationError("Variável QUERY não definida no script")
-        if not caminho:
-            raise ScriptConfigurationError("Variável CAMINHO não definida no script")
-        if not nome_arquivo:
-            raise ScriptConfigurationError("Variável NOME_ARQUIVO não definida no script")
+        settings = SaveToFileSettings.from_action(self.script_action)
         
         self._log(f"Ação a ser executada: {self.script_action.executar}")
+        if settings.processo_isolado:
+            self._log("Ciclos executados em processo isolado.")
         
-        # Serviços
-        db_service = DatabaseService(self.db_config)
         file_service = FileService()
+        reloader = ScriptReloader(self.script_action, self.script_loader, self._log)
+        schedule = RunSchedule(settings, self._log)
+        if schedule.cron:
+            self._log(f"Agenda: {schedule.cron} (primeira execução em {schedule.describe_next()})")
         
-        while self._running.is_set():
-            try:
-                # Executa a query
-                self._log("Executando consulta SQL...")
-                columns, data = db_service.execute_query(query)
-                
-                # Monta o caminho completo do arquivo
-                file_path = os.path.join(caminho, nome_arquivo + formato)
-                
-                # Salva o arquivo
-                self._log(f"Salvando dados em: {file_path}")
-                file_service.save_to_file(columns, data, file_path, formato)
-                
-                self._log(f"Arquivo gerado com sucesso: {file_path}")
-                self._log(f"Total de registros: {len(data)}")
+        try:
+            while self._wait(schedule.delay()):
+                # Script alterado: vale a partir deste ciclo
+                reloaded = reloader.check()
+                if reloaded is not None:
+                    settings = reloaded
+                    if schedule.update(settings):
+                        self._log(f"Agenda alterada; próxima execução em {schedule.describe_next()}")
+                if schedule.delay() > 0:
+                    continue
                 
-                if not repetir:
-                    self._log("Execução única concluída.")
+                try:
+                    self._record_metrics(self._run_cycle(settings, file_service))
+                    
+                    if not schedule.repeat:
+                        self._log("Execução única concluída.")
+                        break
+                    
+                    # Aguarda o próximo horário (interrompido imediatamente por stop)
+                    schedule.advance()
+                    self._log(f"Próxima execução em {schedule.describe_next()}")
+                    
+                except ExecutionCancelled:
+                    self._log("Ciclo em andamento interrompido.")
                     break
-                
-                # Aguarda o tempo especificado
-                self._log(f"Aguardando {tempo_entre_execucoes} segundos para próxima execução...")
-                for _ in range(tempo_entre_execucoes):
-                    if not self._running.is_set():
-                        self._log("Execução interrompida.")
-                        return
-                    time.sleep(1)
-                
-            except Exception as e:
-                self._log(f"Erro ao processar ciclo do script: {e}")
-                break
+                except Exception as e:
+                    self.last_error = e
+                    self._log(f"Erro ao processar ciclo do script: {e}")
+                    break
+            else:
+                self._log("Execução interrompida.")
+        finally:
+            if self._worker_pool is not None:
+                self._worker_pool.shutdown()
+                self._worker_pool = None
+    
+    def _wait(self, timeout: float) -> bool:
+        """
+        Aguarda o próximo ciclo, a parada ou um aviso de reload().
+        
+        Returns:
+            False se a parada foi pedida
+        """
+        self._wake_event.wait(timeout)
+        self._wake_event.clear()
+        return not self._stop_event.is_set()
+    
+    def _run_cycle(self, settings: SaveToFileSettings, file_service: FileService) -> RunMetrics:
+        """Executa um ciclo no próprio processo ou em um processo isolado."""
+        if settings.processo_isolado:
+            if self._worker_pool is None:
+                self._worker_pool = WorkerPool(1)
+            return self._worker_pool.run_cycle(
+                settings, self.db_config, self._log, self.progress_callback, self._expected_rows()
+            )
+        runner = ScriptRunner(
+            settings, DatabaseService(self.db_config), file_service, self._log,
+            self._stop_event, self.progress_callback
+        )
+        return runner.run_cycle(self._expected_rows())
+    
+    def _expected_rows(self) -> Optional[int]:
+        """Linhas lidas no ciclo anterior (base das estimativas de progresso)."""
+        return self.last_metrics.rows_fetched if self.last_metrics else None
+    
+    def _record_metrics(self, metrics: RunMetrics):
+        """Guarda as métricas do ciclo e avisa o callback."""
+        self._metrics.append(metrics)
+        if self.metrics_callback:
+            self.metrics_callback(metrics)
     
     def _log(self, message: str):
         """Registra uma mensagem de log."""
@@ -0,0 +1,98 @@
+"""
+Recarga de scripts alterados durante a execução.
+"""
+import threading
+from typing import Callable, Optional
+
+from core.models.script_config import SaveToFileSettings, ScriptAction
+
+
+class ScriptReloader:
+    """
+    Verifica, entre um ciclo e outro, se o arquivo do script mudou.
+    
+    loader deve devolver a mesma instância de ScriptAction enquanto o
+    arquivo não muda (como ConfigManager.load_script_action), de forma que
+    a verificação custa apenas uma consulta à data de modificação. Um
+    script alterado com erro é informado no log uma vez e a configuração
+    anterior continua valendo.
+    
+    poll() faz a leitura e guarda os parâmetros novos até take(), para que
+    a leitura do arquivo possa ser feita fora do lock de quem os aplica;
+    check() faz as duas coisas. Os métodos podem ser chamados de threads
+    diferentes.
+    """
+    
+    def __init__(self,
+                 action: ScriptAction,
+                 loader: Optional[Callable[[], ScriptAction]] = None,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        """
+        Inicializa a verificação.
+        
+        Args:
+            action: Ação carregada no início da execução
+            loader: Função que lê a ação atual do arquivo (None desativa)
+            log_callback: Função de callback para logs
+        """
+        self.action = action
+        self.loader = loader
+        self.log_callback = log_callback
+        self._last_error: Optional[str] = None
+        self._pending: Optional[SaveToFileSettings] = None
+        self._lock = threading.Lock()
+    
+    def check(self) -> Optional[SaveToFileSettings]:
+        """
+        Lê o script e devolve os novos parâmetros se ele mudou.
+        
+        Returns:
+            Parâmetros do script alterado (inclusive os guardados por um
+            poll() anterior), ou None se não mudou ou é inválido
+        """
+        self.poll()
+        return self.take()
+    
+    def poll(self) -> bool:
+        """
+        Lê o script e guarda os novos parâmetros se ele mudou.
+        
+        Returns:
+            True se há parâmetros novos aguardando take()
+        """
+        if self.loader is None:
+            return False
+        with self._lock:
+            try:
+                action = self.loader()
+                if action is self.action:
+                    return self._pending is not None
+                self.action = action
+                if action.executar != "SALVAR_EM_ARQUIVO":
+                    raise ValueError(f"Ação '{action.executar}' não reconhecida.")
+                settings = SaveToFileSettings.from_action(action)
+            except Exception as e:
+                if str(e) != self._last_error:
+                    self._last_error = str(e)
+                    self._log(f"Script alterado com erro; mantida a configuração anterior: {e}")
+                return self._pending is not None
+            self._last_error = None
+            self._pending = settings
+        self._log("Script alterado: nova configuração aplicada a partir do próximo ciclo.")
+        return True
+    
+    def take(self) -> Optional[SaveToFileSettings]:
+        """
+        Devolve e descarta os parâmetros guardados por poll().
+        
+        Returns:
+            Parâmetros do script alterado, ou None se não houver
+        """
+        with self._lock:
+            settings, self._pending = self._pending, None
+        return settings
+    
+    def _log(self, message: str):
+        """Registra uma mensagem de log."""
+        if self.log_callback:
+            self.log_callback(message)
\ No newline at end of file
@@ -0,0 +1,438 @@
+"""
+Execução dos ciclos da ação SALVAR_EM_ARQUIVO.
+"""
+import itertools
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Callable, ContextManager, Iterable, Iterator, List, Optional, Sequence
+
+from core.exceptions.scriptbird_exceptions import ExecutionCancelled
+from core.models.run_metrics import RunMetrics
+from core.models.run_progress import RunProgress
+from core.models.script_config import (
+    MODO_CDC,
+    MODO_INCREMENTAL,
+    SAIDA_POR_PARTICAO,
+    SAIDA_POR_VALOR,
+    SAIDA_UNICO,
+    SaveToFileSettings,
+)
+from utils.memory import MemorySampler
+
+from .change_capture import (
+    OPERACAO_ALTERACAO,
+    OPERACAO_EXCLUSAO,
+    OPERACAO_INCLUSAO,
+    ChangeCapture,
+    ChangeWriter,
+    RowIndex,
+)
+from .database_service import DatabaseService
+from .file_service import FileService
+from .fingerprint import FINGERPRINT_KEY, ResultFingerprint, ResultSpool
+from .incremental import WATERMARK_KEY, WatermarkTracker, build_incremental_query, find_column
+from .parameter_sweep import build_sweep_slices, load_parameter_values
+from .partitioning import QuerySlice, SliceRunner, build_slices, compute_ranges
+from .pipeline import BatchPrefetcher
+from .script_state import ScriptState
+
+
+class ScriptRunner:
+    """
+    Executa um ciclo (consulta e gravação) de um script.
+    
+    Não mantém thread própria: é usado pelo ScriptExecutor e pelo
+    agendador, que controlam quando cada ciclo acontece. Se cancel_event
+    for sinalizado, o ciclo é interrompido com ExecutionCancelled antes
+    do lote seguinte e os arquivos em gravação são descartados.
+    """
+    
+    def __init__(self,
+                 settings: SaveToFileSettings,
+                 db_service: DatabaseService,
+                 file_service: FileService,
+                 log_callback: Optional[Callable[[str], None]] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 progress_callback: Optional[Callable[[RunProgress], None]] = None):
+        """
+        Inicializa o executor de ciclos.
+        
+        Args:
+            settings: Parâmetros da ação do script
+            db_service: Serviço de banco de dados
+            file_service: Serviço de arquivos
+            log_callback: Função de callback para logs
+            cancel_event: Evento que interrompe o ciclo em andamento
+            progress_callback: Função que recebe o andamento de cada ciclo
+                (algumas vezes por segundo, na thread que lê ou grava)
+        """
+        self.settings = settings
+        self.db_service = db_service
+        self.file_service = file_service
+        self.log_callback = log_callback
+        self.cancel_event = cancel_event
+        self.progress_callback = progress_callback
+    
+    def run_cycle(self, expected_rows: Optional[int] = None) -> RunMetrics:
+        """
+        Executa um ciclo conforme o modo configurado no script.
+        
+        Args:
+            expected_rows: Linhas lidas no ciclo anterior, usadas para
+                estimar a porcentagem e o tempo restante do progresso
+        
+        Returns:
+            Métricas do ciclo (tempos por etapa, linhas, bytes e memória)
+        
+        Raises:
+            ExecutionCancelled: Se cancel_event for sinalizado durante o ciclo
+        """
+        self._check_cancelled()
+        metrics = RunMetrics()
+        if self.progress_callback:
+            metrics.watch_progress(self.progress_callback, expected_rows)
+        with MemorySampler() as memory:
+            if self.settings.modo == MODO_INCREMENTAL:
+                self._run_incremental_cycle(metrics)
+            elif self.settings.modo == MODO_CDC:
+                self._run_cdc_cycle(metrics)
+            elif self.settings.has_parameters:
+                self._run_sweep_cycle(metrics)
+            elif self.settings.particoes > 1:
+                self._run_partitioned_cycle(metrics)
+            else:
+                self._run_full_cycle(metrics)
+        metrics.finish(memory.peak)
+        self._log(metrics.summary())
+        return metrics
+    
+    def _run_full_cycle(self, metrics: RunMetrics):
+        """Executa a query completa e regrava o arquivo."""
+        settings = self.settings
+        
+        # Executa a query
+        self._log("Executando consulta SQL...")
+        result = self.db_service.execute_query_iter(
+            settings.query, settings.tamanho_lote, metrics=metrics
+        )
+        if settings.ignorar_sem_alteracao:
+            self._save_if_changed(result, metrics)
+            return
+        
+        # Salva o arquivo à medida que os lotes são lidos
+        file_path = settings.file_path
+        self._log(f"Salvando dados em: {file_path}")
+        with result, self._prefetch(result) as batches:
+            total = self.file_service.save_stream_to_file(
+                result.columns, batches, file_path, settings.formato,
+                result.description, settings.compressao, metrics=metrics
+            )
+        
+        self._log(f"Arquivo gerado com sucesso: {file_path}")
+        self._log(f"Total de registros: {total}")
+    
+    def _save_if_changed(self, result, metrics: RunMetrics):
+        """
+        Grava o arquivo apenas se o resultado mudou desde o último ciclo.
+        
+        As linhas são lidas só para calcular o hash (junto com a query, o
+        formato e as colunas), sem serem guardadas. Se o hash for igual ao
+        do ciclo anterior e o arquivo de saída ainda existir, a gravação é
+        ignorada; senão a query é executada de novo e o arquivo é gravado
+        dessa segunda leitura, cujo hash é o persistido (só depois que o
+        arquivo foi gravado com sucesso). Com RESULTADO_TEMPORARIO as
+        linhas são guardadas em um arquivo temporário durante o hash e a
+        query não é repetida.
+        """
+        if self.settings.resultado_temporario:
+            self._save_spooled_if_changed(result, metrics)
+            return
+        
+        settings = self.settings
+        file_path = settings.file_path
+        state = ScriptState(settings.estado).load()
+        
+        fingerprint = ResultFingerprint(metrics)
+        with result, self._prefetch(result) as batches:
+            fingerprint.update(settings.query, settings.formato, settings.compressao, result.description)
+            fingerprint.consume(batches)
+        
+        if fingerprint.hexdigest() == state.get(FINGERPRINT_KEY) and os.path.exists(file_path):
+            metrics.skipped = True
+            self._log(f"Resultado inalterado ({fingerprint.rows} registros): gravação ignorada.")
+            return
+        
+        # O arquivo é gravado de uma nova leitura; o hash guardado é o dela,
+        # caso os dados tenham mudado entre as duas execuções
+        self._check_cancelled()
+        self._log("Resultado alterado: executando a consulta novamente para gravar.")
+        result = self.db_service.execute_query_iter(
+            settings.query, settings.tamanho_lote, metrics=metrics
+        )
+        written = ResultFingerprint(metrics)
+        self._log(f"Salvando dados em: {file_path}")
+        with result, self._prefetch(result) as batches:
+            written.update(settings.query, settings.formato, settings.compressao, result.description)
+            total = self.file_service.save_stream_to_file(
+                result.columns, written.hash_batches(batches), file_path, settings.formato,
+                result.description, settings.compressao, metrics=metrics
+            )
+        
+        state.set(FINGERPRINT_KEY, written.hexdigest())
+        state.save()
+        
+        self._log(f"Arquivo gerado com sucesso: {file_path}")
+        self._log(f"Total de registros: {total}")
+    
+    def _save_spooled_if_changed(self, result, metrics: RunMetrics):
+        """
+        Como _save_if_changed, guardando as linhas em um arquivo temporário.
+        
+        Evita a segunda execução da query quando o resultado mudou, ao custo
+        de gravar o resultado inteiro no disco a cada ciclo.
+        """
+        settings = self.settings
+        file_path = settings.file_path
+        state = ScriptState(settings.estado).load()
+        
+        with ResultSpool(metrics) as spool:
+            with result, self._prefetch(result) as batches:
+                spool.update(settings.query, settings.formato, settings.compressao, result.description)
+                spool.consume(batches)
+            fingerprint = spool.hexdigest()
+            
+            if fingerprint == state.get(FINGERPRINT_KEY) and os.path.exists(file_path):
+                metrics.skipped = True
+                self._log(f"Resultado inalterado ({spool.rows} registros): gravação ignorada.")
+                return
+            
+            self._log(f"Salvando dados em: {file_path}")
+            total = self.file_service.save_stream_to_file(
+                result.columns, spool, file_path, settings.formato,
+                result.description, settings.compressao, metrics=metrics
+            )
+        
+        state.set(FINGERPRINT_KEY, fingerprint)
+        state.save()
+        
+        self._log(f"Arquivo gerado com sucesso: {file_path}")
+        self._log(f"Total de registros: {total}")
+    
+    def _run_partitioned_cycle(self, metrics: RunMetrics):
+        """
+        Executa a query em fatias paralelas por faixa de COLUNA_PARTICAO.
+        
+        As faixas são calculadas a partir do MIN/MAX da coluna e as fatias
+        executadas por _run_slices().
+        """
+        settings = self.settings
+        column = settings.coluna_particao
+        self._log(f"Calculando faixas de {column} para {settings.particoes} partições...")
+        query = settings.query.strip().rstrip(';')
+        _, bounds = self.db_service.execute_query(
+            f"SELECT MIN(PART.{column}), MAX(PART.{column}) FROM ({query}) PART"
+        )
+        minimum, maximum = bounds[0]
+        if minimum is None:
+            ranges = []
+        else:
+            ranges = compute_ranges(minimum, maximum, settings.particoes)
+        slices = build_slices(settings.query, column, ranges)
+        
+        self._run_slices(slices, settings.saida_particoes == SAIDA_POR_PARTICAO, metrics)
+    
+    def _run_sweep_cycle(self, metrics: RunMetrics):
+        """
+        Executa a query uma vez para cada valor de parâmetro.
+        
+        Cada valor é uma fatia executada por _run_slices(). Como o texto da
+        query é o mesmo, ela é preparada uma vez por conexão e as demais
+        execuções reaproveitam o comando preparado.
+        """
+        settings = self.settings
+        if settings.consulta_parametros:
+            self._log("Executando consulta dos valores dos parâmetros...")
+        values = load_parameter_values(settings, self.db_service)
+        if not values:
+            self._log("Nenhum valor de parâmetro: nada a executar.")
+            return
+        self._log(f"{len(values)} valores de parâmetro.")
+        slices = build_sweep_slices(settings.query, values)
+        self._run_slices(slices, settings.saida_parametros == SAIDA_POR_VALOR, metrics)
+    
+    def _run_slices(self, slices: List[QuerySlice], per_slice: bool, metrics: RunMetrics):
+        """
+        Executa as fatias em paralelo e grava o resultado.
+        
+        Cada fatia usa uma conexão do pool, limitadas ao máximo de conexões
+        do banco.
+        
+        Args:
+            slices: Fatias a executar
+            per_slice: True para um arquivo por fatia (rótulo como sufixo),
+                False para um único arquivo na ordem das fatias
+            metrics: Métricas do ciclo, somadas entre as fatias
+        """
+        settings = self.settings
+        workers = min(len(slices), self.db_service.max_connections)
+        self._log(f"Executando {len(slices)} fatias com até {workers} conexões simultâneas...")
+        runner = SliceRunner(
+            self.db_service, self.file_service, settings.tamanho_lote, workers, self._log,
+            metrics=metrics, cancel_event=self.cancel_event
+        )
+        
+        if per_slice:
+            total = runner.run_per_slice(
+                slices,
+                lambda query_slice: settings.file_path_with_suffix(f"_{query_slice.label}"),
+                settings.formato, settings.compressao
+            )
+            self._log(f"Arquivos gerados com sucesso em: {settings.caminho}")
+        else:
+            file_path = settings.file_path
+            self._log(f"Salvando dados em: {file_path}")
+            total = runner.run_merged(slices, file_path, settings.formato, settings.compressao)
+            self._log(f"Arquivo gerado com sucesso: {file_path}")
+        
+        self._log(f"Total de registros: {total}")
+    
+    def _run_incremental_cycle(self, metrics: RunMetrics):
+        """
+        Busca apenas as linhas posteriores ao último watermark.
+        
+        Na primeira execução (sem estado) a query completa é gravada no
+        arquivo principal. Nas seguintes, as novas linhas são acrescentadas
+        ao arquivo (.csv/.txt) ou gravadas em um arquivo parcial com data e
+        hora no nome (demais formatos). O watermark só é persistido depois
+        que o arquivo foi gravado com sucesso.
+        """
+        settings = self.settings
+        file_service = self.file_service
+        state = ScriptState(settings.estado).load()
+        watermark = state.get(WATERMARK_KEY)
+        
+        self._log("Executando consulta SQL...")
+        if watermark is None:
+            self._log("Nenhum watermark salvo: executando carga completa.")
+            result = self.db_service.execute_query_iter(
+                settings.query, settings.tamanho_lote, metrics=metrics
+            )
+        else:
+            self._log(f"Buscando registros com {settings.coluna_watermark} > {watermark}")
+            query = build_incremental_query(settings.query, settings.coluna_watermark)
+            result = self.db_service.execute_query_iter(
+                query, settings.tamanho_lote, (watermark,), metrics
+            )
+        
+        with result, self._prefetch(result) as prefetched:
+            tracker = WatermarkTracker(
+                prefetched, find_column(result.columns, settings.coluna_watermark)
+            )
+            batches = iter(tracker)
+            first_batch = next(batches, None)
+            if watermark is not None and first_batch is None:
+                self._log("Nenhum registro novo desde a última execução.")
+                return
+            
+            append = watermark is not None and file_service.supports_append(settings.formato)
+            if watermark is None or append:
+                file_path = settings.file_path
+            else:
+                suffix = datetime.now().strftime('%Y%m%d%H%M%S')
+                file_path = settings.file_path_with_suffix(f"_{suffix}")
+            
+            self._log(f"{'Acrescentando' if append else 'Salvando'} dados em: {file_path}")
+            total = file_service.save_stream_to_file(
+                result.columns,
+                itertools.chain([first_batch] if first_batch else [], batches),
+                file_path, settings.formato,
+                result.description, settings.compressao, append, metrics
+            )
+        
+        if tracker.value is not None:
+            state.set(WATERMARK_KEY, tracker.value)
+            state.save()
+        
+        self._log(f"Arquivo gerado com sucesso: {file_path}")
+        self._log(f"Total de registros: {total}")
+        self._log(f"Watermark atual: {tracker.value if tracker.value is not None else watermark}")
+    
+    def _run_cdc_cycle(self, metrics: RunMetrics):
+        """
+        Grava apenas as linhas incluídas, alteradas e excluídas.
+        
+        Cada linha é comparada, pela CHAVE_PRIMARIA, com o hash gravado no
+        índice do ciclo anterior. As alterações vão para arquivos com data
+        e hora no nome: um por operação ou um único com a coluna OPERACAO.
+        Excluídas trazem apenas as colunas da chave. O índice só é
+        atualizado depois que os arquivos foram gravados com sucesso.
+        """
+        settings = self.settings
+        suffix = datetime.now().strftime('%Y%m%d%H%M%S')
+        
+        self._log("Executando consulta SQL...")
+        result = self.db_service.execute_query_iter(
+            settings.query, settings.tamanho_lote, metrics=metrics
+        )
+        with result, self._prefetch(result) as batches, RowIndex(settings.indice) as index:
+            if index.is_empty:
+                self._log("Índice vazio: todas as linhas serão gravadas como inclusões.")
+            key_indexes = [find_column(result.columns, column) for column in settings.key_columns]
+            capture = ChangeCapture(index, key_indexes, len(result.columns), metrics)
+            writer = ChangeWriter(
+                self.file_service, result.columns, result.description,
+                lambda operation: settings.file_path_with_suffix(f"_{suffix}_{operation}"),
+                settings.formato, settings.compressao, settings.saida_cdc == SAIDA_UNICO, metrics
+            )
+            with writer:
+                for batch in batches:
+                    inserted, updated = capture.classify(batch)
+                    writer.write(OPERACAO_INCLUSAO, inserted)
+                    writer.write(OPERACAO_ALTERACAO, updated)
+                for deleted in capture.deleted(settings.tamanho_lote):
+                    writer.write(OPERACAO_EXCLUSAO, deleted)
+            index.commit()
+        
+        counts = writer.counts
+        if not writer.file_paths:
+            self._log("Nenhuma alteração desde a última execução.")
+            return
+        for file_path in writer.file_paths:
+            self._log(f"Arquivo gerado com sucesso: {file_path}")
+        self._log(
+            f"Incluídos: {counts[OPERACAO_INCLUSAO]}, alterados: {counts[OPERACAO_ALTERACAO]}, "
+            f"excluídos: {counts[OPERACAO_EXCLUSAO]}"
+        )
+    
+    @contextmanager
+    def _prefetch(self, batches: Iterable[Sequence[Sequence]]) -> Iterator[Iterable[Sequence[Sequence]]]:
+        """
+        Lê os lotes em uma thread separada se LEITURA_ANTECIPADA estiver ativa.
+        
+        Deve ser aberto depois do resultado, para que a thread de leitura
+        termine antes de a conexão ser devolvida ao pool. Os lotes entregues
+        verificam o cancelamento antes de cada lote.
+        """
+        reader: ContextManager = nullcontext(batches)
+        if self.settings.leitura_antecipada:
+            reader = BatchPrefetcher(batches, self.settings.fila_lotes)
+        with reader as prefetched:
+            yield self._cancellable(prefetched)
+    
+    def _cancellable(self, batches: Iterable[Sequence[Sequence]]) -> Iterator[Sequence[Sequence]]:
+        """Repassa os lotes, interrompendo se o ciclo for cancelado."""
+        for batch in batches:
+            self._check_cancelled()
+            yield batch
+    
+    def _check_cancelled(self):
+        """Lança ExecutionCancelled se o cancelamento foi pedido."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ExecutionCancelled("Ciclo interrompido.")
+    
+    def _log(self, message: str):
+        """Registra uma mensagem de log."""
+        if self.log_callback:
+            self.log_callback(message)
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Estado persistido dos scripts entre execuções.
+"""
+import datetime
+import decimal
+import json
+import os
+from typing import Any, Dict
+
+from core.exceptions.scriptbird_exceptions import FileOperationError
+
+
+class ScriptState:
+    """
+    Estado de um script gravado em arquivo JSON.
+    
+    Os valores preservam o tipo original (datas, horas e decimais), para
+    que possam ser usados novamente como parâmetros de query.
+    """
+    
+    def __init__(self, file_path: str):
+        """
+        Inicializa o estado.
+        
+        Args:
+            file_path: Caminho do arquivo de estado
+        """
+        self.file_path = file_path
+        self._data: Dict[str, Any] = {}
+    
+    def load(self) -> 'ScriptState':
+        """
+        Carrega o estado do arquivo, se existir.
+        
+        Returns:
+            A própria instância
+        
+        Raises:
+            FileOperationError: Se o arquivo de estado estiver corrompido
+        """
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError) as e:
+                raise FileOperationError(f"Erro ao ler estado do script: {e}")
+        return self
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Obtém um valor do estado."""
+        if key not in self._data:
+            return default
+        return _decode(self._data[key])
+    
+    def set(self, key: str, value: Any):
+        """Define um valor do estado."""
+        self._data[key] = _encode(value)
+    
+    def save(self):
+        """
+        Grava o estado de forma atômica.
+        
+        Raises:
+            FileOperationError: Se não for possível gravar o arquivo
+        """
+        temp_path = f"{self.file_path}.tmp"
+        try:
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.file_path)
+        except OSError as e:
+            raise FileOperationError(f"Erro ao gravar estado do script: {e}")
+
+
+def _encode(value: Any) -> Any:
+    """Converte um valor em representação JSON preservando o tipo."""
+    if isinstance(value, datetime.datetime):
+        return {'tipo': 'datetime', 'valor': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'tipo': 'date', 'valor': value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {'tipo': 'time', 'valor': value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return {'tipo': 'decimal', 'valor': str(value)}
+    if isinstance(value, bytes):
+        return {'tipo': 'bytes', 'valor': value.hex()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Restaura um valor gravado por _encode."""
+    if not isinstance(value, dict) or 'tipo' not in value:
+        return value
+    decoders = {
+        'datetime': datetime.datetime.fromisoformat,
+        'date': datetime.date.fromisoformat,
+        'time': datetime.time.fromisoformat,
+        'decimal': decimal.Decimal,
+        'bytes': bytes.fromhex,
+    }
+    decoder = decoders.get(value['tipo'])
+    return decoder(value['valor']) if decoder else value
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Execução de ciclos em processos separados.
+
+Cada ciclo roda em um processo do pool, fora do processo da interface:
+a serialização não disputa o GIL com a UI, scripts simultâneos usam
+vários núcleos e uma falha grave (ex.: falta de memória) encerra apenas
+o processo do ciclo. Os logs voltam ao processo principal por uma fila.
+"""
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Tuple
+
+from core.exceptions.scriptbird_exceptions import ScriptExecutionError
+from core.models.database_config import DatabaseConfig
+from core.models.run_metrics import RunMetrics
+from core.models.run_progress import RunProgress
+from core.models.script_config import SaveToFileSettings
+
+from .database_service import DatabaseService
+from .file_service import FileService
+from .script_runner import ScriptRunner
+
+# Eventos enviados pelos processos de trabalho: (id do ciclo, tipo, dados)
+EVENT_LOG = 'log'
+EVENT_PROGRESS = 'progress'
+EVENT_END = 'end'
+
+# Espera máxima (segundos) pelos últimos logs de um ciclo concluído
+LOG_FLUSH_TIMEOUT = 5
+
+# Fila de eventos no processo de trabalho (definida pelo initializer do pool)
+_events = None
+
+
+def _init_worker(events):
+    """Inicializa um processo de trabalho com a fila de eventos."""
+    global _events
+    _events = events
+
+
+def _run_cycle(cycle_id: int,
+               settings: SaveToFileSettings,
+               db_config: DatabaseConfig,
+               expected_rows: Optional[int]) -> RunMetrics:
+    """Executa um ciclo no processo de trabalho."""
+    try:
+        runner = ScriptRunner(
+            settings, DatabaseService(db_config), FileService(),
+            lambda message: _events.put((cycle_id, EVENT_LOG, message)),
+            progress_callback=lambda progress: _events.put((cycle_id, EVENT_PROGRESS, progress))
+        )
+        return runner.run_cycle(expected_rows)
+    finally:
+        # Marca o fim dos logs do ciclo: o resultado volta por outro canal
+        # e pode chegar antes das últimas mensagens
+        _events.put((cycle_id, EVENT_END, None))
+
+
+class WorkerPool:
+    """
+    Pool de processos que executam ciclos de scripts.
+    
+    Os processos são criados com 'spawn' (também no Linux), para não
+    herdar as threads e o estado do Qt do processo principal, e são
+    reutilizados entre ciclos, mantendo seu próprio pool de conexões. Se
+    um processo morrer, o ciclo falha com ScriptExecutionError e o pool
+    é recriado no ciclo seguinte.
+    """
+    
+    def __init__(self, max_workers: int = 1):
+        """
+        Inicializa o pool (os processos são criados no primeiro ciclo).
+        
+        Args:
+            max_workers: Número máximo de processos
+        """
+        self.max_workers = max(1, max_workers)
+        self._context = multiprocessing.get_context('spawn')
+        self._events = self._context.Queue()
+        self._cycles: Dict[int, Tuple[Optional[Callable[[str], None]],
+                                      Optional[Callable[[RunProgress], None]],
+                                      threading.Event]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._relay_thread: Optional[threading.Thread] = None
+    
+    def run_cycle(self,
+                  settings: SaveToFileSettings,
+                  db_config: DatabaseConfig,
+                  log_callback: Optional[Callable[[str], None]] = None,
+                  progress_callback: Optional[Callable[[RunProgress], None]] = None,
+                  expected_rows: Optional[int] = None) -> RunMetrics:
+        """
+        Executa um ciclo em um processo do pool e aguarda o resultado.
+        
+        Args:
+            settings: Parâmetros da ação do script
+            db_config: Configuração do banco de dados
+            log_callback: Função que recebe os logs do ciclo
+            progress_callback: Função que recebe o andamento do ciclo
+            expected_rows: Linhas lidas no ciclo anterior (estimativas)
+        
+        Returns:
+            Métricas do ciclo (memória medida no processo de trabalho)
+        
+        Raises:
+            ScriptExecutionError: Se o processo terminar inesperadamente
+        """
+        cycle_id = next(self._ids)
+        done = threading.Event()
+        with self._lock:
+            self._cycles[cycle_id] = (log_callback, progress_callback, done)
+            executor = self._start()
+        try:
+            try:
+                metrics = executor.submit(
+                    _run_cycle, cycle_id, settings, db_config, expected_rows
+                ).result()
+            except BrokenProcessPool:
+                self._discard(executor)
+                raise ScriptExecutionError(
+                    "Processo de execução encerrado inesperadamente (ex.: falta de memória)"
+                )
+            except Exception:
+                done.wait(LOG_FLUSH_TIMEOUT)
+                raise
+            done.wait(LOG_FLUSH_TIMEOUT)
+            return metrics
+        finally:
+            with self._lock:
+                self._cycles.pop(cycle_id, None)
+    
+    def shutdown(self):
+        """Encerra os processos e a thread de logs."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            relay, self._relay_thread = self._relay_thread, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if relay is not None:
+            self._events.put(None)
+            relay.join()
+    
+    def _start(self) -> ProcessPoolExecutor:
+        """Cria o pool e a thread de logs se necessário (com o lock)."""
+        if self._relay_thread is None:
+            self._relay_thread = threading.Thread(target=self._relay, name='WorkerPoolRelay', daemon=True)
+            self._relay_thread.start()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._events,)
+            )
+        return self._executor
+    
+    def _discard(self, executor: ProcessPoolExecutor):
+        """Descarta um pool com processo morto; o próximo ciclo cria outro."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+    
+    def _relay(self):
+        """Repassa os eventos dos processos aos callbacks de cada ciclo."""
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            cycle_id, kind, payload = event
+            with self._lock:
+                log_callback, progress_callback, done = self._cycles.get(cycle_id, (None, None, None))
+            if kind == EVENT_END:
+                if done is not None:
+                    done.set()
+                continue
+            callback = {EVENT_LOG: log_callback, EVENT_PROGRESS: progress_callback}.get(kind)
+            if callback is not None:
+                try:
+                    callback(payload)
+                except Exception:
+                    pass
\ No newline at end of file
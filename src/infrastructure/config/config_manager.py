@@ -5,6 +5,7 @@ import configparser
 import os
 import sys
 from pathlib import Path
+from typing import List
 
 # Adiciona o diretório src ao path para imports
 src_path = Path(__file__).parent.parent.parent
@@ -13,8 +14,12 @@ if str(src_path) not in sys.path:
 
 from core.exceptions.scriptbird_exceptions import ConfigurationError
 from core.models.database_config import DatabaseConfig
+from core.models.scheduler_config import SchedulerConfig
 from core.models.script_config import ScriptAction, ScriptConfig
 
+from .script_cache import ScriptCache
+from .script_index import IndexedScript, ScriptIndex, parse_script_sections
+
 
 class ConfigManager:
     """Gerenciador de configurações do aplicativo."""
@@ -28,6 +33,7 @@ class ConfigManager:
         """
         self.config_file = config_file
         self.config = configparser.ConfigParser()
+        self._script_cache = ScriptCache()
     
     def load_config(self) -> tuple[DatabaseConfig, ScriptConfig]:
         """
@@ -56,6 +62,26 @@ class ConfigManager:
         except Exception as e:
             raise ConfigurationError(f"Erro ao carregar configurações: {e}")
     
+    def load_scheduler_config(self) -> SchedulerConfig:
+        """
+        Carrega a configuração do agendador (seção [AGENDADOR]).
+        
+        Returns:
+            Configuração do agendador
+            
+        Raises:
+            ConfigurationError: Se houver erro ao carregar configurações
+        """
+        try:
+            if os.path.exists(self.config_file):
+                self.config.read(self.config_file)
+            
+            section = self.config['AGENDADOR'] if 'AGENDADOR' in self.config else {}
+            return SchedulerConfig.from_dict(dict(section))
+            
+        except Exception as e:
+            raise ConfigurationError(f"Erro ao carregar configurações do agendador: {e}")
+    
     def save_config(self, db_config: DatabaseConfig, script_config: ScriptConfig):
         """
         Salva as configurações no arquivo.
@@ -103,6 +129,9 @@ class ConfigManager:
         """
         Carrega ação do arquivo de script.
         
+        O arquivo só é interpretado de novo se o conteúdo mudou: enquanto
+        não muda, a mesma instância de ScriptAction é devolvida.
+        
         Args:
             script_path: Caminho do arquivo de script
             
@@ -116,18 +145,80 @@ class ConfigManager:
             if not os.path.exists(script_path):
                 raise ConfigurationError(f"Arquivo de script não encontrado: {script_path}")
             
+            return self._script_cache.get(script_path, self._parse_script_action)
+            
+        except Exception as e:
+            if isinstance(e, ConfigurationError):
+                raise
+            raise ConfigurationError(f"Erro ao carregar script: {e}")
+    
+    def load_script_directory(self, directory: str, index_file: str = '') -> List[IndexedScript]:
+        """
+        Carrega e valida os scripts .ini de um diretório.
+        
+        Apenas os scripts novos ou alterados desde a última leitura são
+        interpretados (veja ScriptIndex). Os scripts válidos passam a ser
+        devolvidos por load_script_action sem reler o arquivo.
+        
+        Args:
+            directory: Diretório dos scripts
+            index_file: Arquivo do índice (padrão: no próprio diretório)
+            
+        Returns:
+            Scripts do diretório em ordem de nome (inclusive os inválidos)
+            
+        Raises:
+            ConfigurationError: Se o diretório não puder ser lido
+        """
+        try:
+            scripts = ScriptIndex(directory, index_file).scan()
+        except OSError as e:
+            raise ConfigurationError(f"Erro ao ler diretório de scripts: {e}")
+        
+        for script in scripts:
+            if script.valid:
+                self._script_cache.store(
+                    script.path, script.mtime_ns, script.size, bytes.fromhex(script.digest), script.action
+                )
+        return scripts
+    
+    @staticmethod
+    def _parse_script_action(content: bytes) -> ScriptAction:
+        """Interpreta o conteúdo de um arquivo de script."""
+        sections = parse_script_sections(content)
+        
+        if 'ACAO' not in sections or 'VARIAVEIS' not in sections:
+            raise ConfigurationError("Script deve conter seções [ACAO] e [VARIAVEIS]")
+        
+        return ScriptAction.from_config_sections(sections['ACAO'], sections['VARIAVEIS'])
+    
+    def load_script_database(self, script_path: str, default: DatabaseConfig) -> DatabaseConfig:
+        """
+        Carrega a configuração de banco de um script.
+        
+        Um script pode ter uma seção [DB] própria; as chaves informadas
+        substituem as da configuração padrão.
+        
+        Args:
+            script_path: Caminho do arquivo de script
+            default: Configuração de banco padrão
+            
+        Returns:
+            Configuração de banco do script
+            
+        Raises:
+            ConfigurationError: Se houver erro ao carregar script
+        """
+        try:
             script_config = configparser.ConfigParser()
             script_config.read(script_path)
             
-            if 'ACAO' not in script_config or 'VARIAVEIS' not in script_config:
-                raise ConfigurationError("Script deve conter seções [ACAO] e [VARIAVEIS]")
+            if 'DB' not in script_config:
+                return default
             
-            acao_section = dict(script_config['ACAO'])
-            variaveis_section = dict(script_config['VARIAVEIS'])
-            
-            return ScriptAction.from_config_sections(acao_section, variaveis_section)
+            data = default.to_dict()
+            data.update(dict(script_config['DB']))
+            return DatabaseConfig.from_dict(data)
             
         except Exception as e:
-            if isinstance(e, ConfigurationError):
-                raise
-            raise ConfigurationError(f"Erro ao carregar script: {e}")
\ No newline at end of file
+            raise ConfigurationError(f"Erro ao carregar banco do script: {e}")
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Cache dos scripts de ação já interpretados.
+"""
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+
+@dataclass
+class _CacheEntry:
+    """Script interpretado e a identificação do arquivo lido."""
+    
+    mtime_ns: int
+    size: int
+    digest: bytes
+    value: Any
+
+
+class ScriptCache:
+    """
+    Resultado da leitura de cada arquivo, reaproveitado enquanto ele não muda.
+    
+    A data de modificação e o tamanho evitam reler o arquivo. Se mudarem,
+    o hash do conteúdo evita interpretar de novo um arquivo regravado sem
+    alterações. Enquanto o arquivo não muda, get() devolve o mesmo objeto,
+    então quem usa o valor pode comparar por identidade para saber se o
+    script foi alterado.
+    """
+    
+    def __init__(self):
+        """Inicializa o cache vazio."""
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, path: str, parse: Callable[[bytes], Any]) -> Any:
+        """
+        Obtém o valor do arquivo, interpretando-o só se o conteúdo mudou.
+        
+        Args:
+            path: Caminho do arquivo
+            parse: Função que interpreta o conteúdo do arquivo
+        
+        Returns:
+            Valor devolvido por parse (o mesmo objeto se o arquivo não mudou)
+        
+        Raises:
+            OSError: Se o arquivo não puder ser lido
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            stat = os.stat(key)
+            entry = self._entries.get(key)
+            if entry and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                return entry.value
+            
+            with open(key, 'rb') as f:
+                content = f.read()
+            digest = hashlib.blake2b(content, digest_size=16).digest()
+            if entry is None or entry.digest != digest:
+                entry = _CacheEntry(0, 0, digest, parse(content))
+                self._entries[key] = entry
+            entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+            return entry.value
+    
+    def store(self, path: str, mtime_ns: int, size: int, digest: bytes, value):
+        """
+        Registra um valor já interpretado por outro meio (ex.: ScriptIndex).
+        
+        Args:
+            path: Caminho do arquivo
+            mtime_ns: Data de modificação do arquivo lido
+            size: Tamanho do arquivo lido
+            digest: Hash blake2b (16 bytes) do conteúdo lido
+            value: Valor correspondente ao conteúdo
+        """
+        with self._lock:
+            self._entries[os.path.abspath(path)] = _CacheEntry(mtime_ns, size, digest, value)
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""
+Índice compilado dos scripts de um diretório.
+"""
+import configparser
+import hashlib
+import io
+import json
+import locale
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from core.models.database_config import DatabaseConfig
+from core.models.script_config import SaveToFileSettings, ScriptAction
+
+# Nome padrão do arquivo de índice, gravado no próprio diretório dos scripts
+INDEX_FILE_NAME = '.scriptbird_index.json'
+
+# Versão do formato do índice (alterar quando a validação mudar)
+INDEX_VERSION = 1
+
+# Extensão dos arquivos de script
+SCRIPT_EXTENSION = '.ini'
+
+
+def parse_script_sections(content: bytes) -> Dict[str, Dict[str, str]]:
+    """
+    Lê as seções de um arquivo de script.
+    
+    Args:
+        content: Conteúdo do arquivo
+    
+    Returns:
+        Chaves de cada seção, por nome da seção
+    """
+    # Mesma codificação e quebras de linha de ConfigParser.read()
+    parser = configparser.ConfigParser()
+    parser.read_file(io.TextIOWrapper(io.BytesIO(content), encoding=locale.getpreferredencoding(False)))
+    return {name: dict(parser[name]) for name in parser.sections()}
+
+
+@dataclass
+class IndexedScript:
+    """Script do diretório, com as seções lidas e o resultado da validação."""
+    
+    path: str
+    mtime_ns: int
+    size: int
+    digest: str
+    secoes: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    erro: str = ''
+    _action: Optional[ScriptAction] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def name(self) -> str:
+        """Nome do script (arquivo sem a extensão)."""
+        return os.path.splitext(os.path.basename(self.path))[0]
+    
+    @property
+    def valid(self) -> bool:
+        """True se o script passou na validação."""
+        return not self.erro
+    
+    @property
+    def action(self) -> ScriptAction:
+        """Ação do script (criada uma vez, a partir das seções)."""
+        if self._action is None:
+            self._action = ScriptAction.from_config_sections(
+                self.secoes.get('ACAO', {}), self.secoes.get('VARIAVEIS', {})
+            )
+        return self._action
+    
+    def database(self, default: DatabaseConfig) -> DatabaseConfig:
+        """
+        Configuração de banco do script (como ConfigManager.load_script_database).
+        
+        Args:
+            default: Configuração de banco padrão
+        
+        Returns:
+            Configuração de banco do script
+        """
+        if 'DB' not in self.secoes:
+            return default
+        data = default.to_dict()
+        data.update(self.secoes['DB'])
+        return DatabaseConfig.from_dict(data)
+    
+    def to_dict(self) -> dict:
+        """Converte para o formato gravado no índice."""
+        return {
+            'mtime_ns': self.mtime_ns,
+            'tamanho': self.size,
+            'hash': self.digest,
+            'secoes': self.secoes,
+            'erro': self.erro
+        }
+    
+    @classmethod
+    def from_dict(cls, path: str, data: dict) -> 'IndexedScript':
+        """Cria uma instância a partir de uma entrada do índice."""
+        return cls(
+            path=path,
+            mtime_ns=int(data['mtime_ns']),
+            size=int(data['tamanho']),
+            digest=str(data['hash']),
+            secoes=dict(data.get('secoes') or {}),
+            erro=str(data.get('erro') or '')
+        )
+
+
+class ScriptIndex:
+    """
+    Scripts .ini de um diretório, validados e guardados em um índice JSON.
+    
+    Na leitura do diretório, um script só é lido de novo se a data de
+    modificação ou o tamanho mudaram em relação ao índice, e só é
+    interpretado e validado de novo se o hash do conteúdo também mudou.
+    Os scripts a ler são processados em paralelo, o que ajuda
+    principalmente em diretórios de rede. Scripts inválidos ficam no
+    índice com a mensagem de erro, para não serem validados a cada início.
+    """
+    
+    def __init__(self,
+                 directory: str,
+                 index_file: str = '',
+                 max_workers: Optional[int] = None):
+        """
+        Inicializa o índice.
+        
+        Args:
+            directory: Diretório dos scripts
+            index_file: Arquivo do índice (padrão: INDEX_FILE_NAME no diretório)
+            max_workers: Leituras simultâneas (padrão do ThreadPoolExecutor)
+        """
+        self.directory = directory
+        self.index_file = index_file or os.path.join(directory, INDEX_FILE_NAME)
+        self.max_workers = max_workers
+        self.compiled = 0
+    
+    def scan(self) -> List[IndexedScript]:
+        """
+        Lê o diretório, validando os scripts novos ou alterados.
+        
+        Returns:
+            Scripts do diretório em ordem de nome (inclusive os inválidos)
+        
+        Raises:
+            OSError: Se o diretório não puder ser lido
+        """
+        previous = self._load()
+        with os.scandir(self.directory) as entries:
+            files = sorted(
+                (entry for entry in entries
+                 if entry.name.lower().endswith(SCRIPT_EXTENSION) and entry.is_file()),
+                key=lambda entry: entry.name
+            )
+        
+        scripts: Dict[str, IndexedScript] = {}
+        pending: List[Tuple[os.DirEntry, Optional[IndexedScript]]] = []
+        for entry in files:
+            stat = entry.stat()
+            indexed = previous.get(entry.name)
+            if indexed and (indexed.mtime_ns, indexed.size) == (stat.st_mtime_ns, stat.st_size):
+                scripts[entry.name] = replace(indexed, path=entry.path)
+            else:
+                pending.append((entry, indexed))
+        
+        if pending:
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                compiled = executor.map(lambda item: self._compile(*item), pending)
+                for (entry, _), script in zip(pending, compiled):
+                    scripts[entry.name] = script
+        self.compiled = len(pending)
+        
+        if pending or scripts.keys() != previous.keys():
+            self._save(scripts)
+        return [scripts[entry.name] for entry in files]
+    
+    def _compile(self, entry: os.DirEntry, indexed: Optional[IndexedScript]) -> IndexedScript:
+        """Lê e valida um script (só valida se o conteúdo mudou)."""
+        # A data de modificação é lida antes do conteúdo: se o arquivo mudar
+        # durante a leitura, ele será lido de novo na próxima vez
+        try:
+            stat = os.stat(entry.path)
+            with open(entry.path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            return IndexedScript(entry.path, 0, 0, '', erro=f"Erro ao ler script: {e}")
+        
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        if indexed and indexed.digest == digest:
+            return replace(indexed, path=entry.path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        
+        script = IndexedScript(entry.path, stat.st_mtime_ns, stat.st_size, digest)
+        try:
+            script.secoes = parse_script_sections(content)
+            if 'ACAO' not in script.secoes or 'VARIAVEIS' not in script.secoes:
+                raise ValueError("Script deve conter seções [ACAO] e [VARIAVEIS]")
+            if script.action.executar != "SALVAR_EM_ARQUIVO":
+                raise ValueError(f"Ação '{script.action.executar}' não reconhecida.")
+            SaveToFileSettings.from_action(script.action)
+        except Exception as e:
+            script.erro = str(e)
+        return script
+    
+    def _load(self) -> Dict[str, IndexedScript]:
+        """Lê o índice gravado (vazio se não existir, for de outra versão ou estiver corrompido)."""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('versao') != INDEX_VERSION:
+                return {}
+            return {
+                name: IndexedScript.from_dict(os.path.join(self.directory, name), entry)
+                for name, entry in data['scripts'].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+    
+    def _save(self, scripts: Dict[str, IndexedScript]):
+        """Grava o índice de forma atômica."""
+        # Sem permissão de escrita o índice apenas deixa de acelerar o início
+        data = {
+            'versao': INDEX_VERSION,
+            'scripts': {name: script.to_dict() for name, script in scripts.items() if script.digest}
+        }
+        temp_path = f"{self.index_file}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.index_file)
+        except OSError:
+            pass
\ No newline at end of file
@@ -0,0 +1,352 @@
+"""
+Pool de conexões com o banco de dados.
+
+Mantém conexões físicas abertas entre as execuções do script, evitando o
+custo de attach/detach no servidor a cada ciclo.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.exceptions.scriptbird_exceptions import DatabaseConnectionError
+
+from .statement_cache import DEFAULT_STATEMENT_CACHE_SIZE, StatementCache
+
+# Limites padrão do pool
+DEFAULT_MAX_SIZE = 4
+DEFAULT_MAX_IDLE_TIME = 300
+DEFAULT_MAX_LIFETIME = 1800
+DEFAULT_ACQUIRE_TIMEOUT = 30
+DEFAULT_HEALTH_CHECK_INTERVAL = 10
+DEFAULT_HEALTH_CHECK_QUERY = "SELECT 1 FROM RDB$DATABASE"
+
+# Intervalo da limpeza periódica de conexões ociosas
+REAPER_INTERVAL = 30
+
+
+class PooledConnection:
+    """
+    Conexão física gerenciada pelo pool.
+    
+    statements guarda os comandos preparados na conexão, reaproveitados
+    entre os ciclos enquanto ela permanece no pool.
+    """
+    
+    def __init__(self, raw: Any, pool: 'ConnectionPool'):
+        """
+        Inicializa a conexão gerenciada.
+        
+        Args:
+            raw: Conexão física retornada pelo driver
+            pool: Pool ao qual a conexão pertence
+        """
+        self.raw = raw
+        self.pool = pool
+        self.statements = StatementCache(pool.statement_cache_size)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+    
+    def release(self, discard: bool = False):
+        """
+        Devolve a conexão ao pool de origem.
+        
+        Args:
+            discard: True para fechar a conexão em vez de reutilizá-la
+        """
+        self.pool.release(self, discard)
+    
+    def close(self):
+        """Fecha os comandos preparados e a conexão física ignorando erros."""
+        self.statements.clear()
+        try:
+            self.raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Pool limitado e thread-safe de conexões."""
+    
+    def __init__(self,
+                 factory: Callable[[], Any],
+                 max_size: int = DEFAULT_MAX_SIZE,
+                 max_idle_time: float = DEFAULT_MAX_IDLE_TIME,
+                 max_lifetime: float = DEFAULT_MAX_LIFETIME,
+                 acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+                 health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+                 health_check_query: str = DEFAULT_HEALTH_CHECK_QUERY,
+                 statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE):
+        """
+        Inicializa o pool.
+        
+        Args:
+            factory: Função que abre uma nova conexão física
+            max_size: Número máximo de conexões abertas (ociosas + em uso)
+            max_idle_time: Segundos que uma conexão pode ficar ociosa
+            max_lifetime: Segundos máximos de vida de uma conexão
+            acquire_timeout: Segundos de espera por uma conexão livre
+            health_check_interval: Ociosidade mínima, em segundos, para
+                validar a conexão antes de entregá-la
+            health_check_query: Query usada na validação da conexão
+            statement_cache_size: Comandos preparados mantidos por conexão
+                (0 desativa o cache)
+        """
+        self._factory = factory
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_query = health_check_query
+        self.statement_cache_size = statement_cache_size
+        
+        self._idle: List[PooledConnection] = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+    
+    @property
+    def size(self) -> int:
+        """Número de conexões físicas abertas."""
+        with self._cond:
+            return self._size
+    
+    @property
+    def idle_count(self) -> int:
+        """Número de conexões ociosas no pool."""
+        with self._cond:
+            return len(self._idle)
+    
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """
+        Obtém uma conexão do pool, abrindo uma nova se necessário.
+        
+        Args:
+            timeout: Segundos de espera por uma conexão livre
+        
+        Returns:
+            Conexão gerenciada pelo pool
+        
+        Raises:
+            DatabaseConnectionError: Se o pool estiver encerrado ou esgotado
+        """
+        if timeout is None:
+            timeout = self.acquire_timeout
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise DatabaseConnectionError("Pool de conexões encerrado")
+                
+                expired = self._pop_expired_locked(time.monotonic())
+                pooled = None
+                create = False
+                if self._idle:
+                    # LIFO: reutiliza a conexão usada mais recentemente
+                    pooled = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DatabaseConnectionError(
+                            f"Tempo esgotado aguardando conexão livre no pool "
+                            f"({self.max_size} conexões em uso)"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+            
+            for conn in expired:
+                conn.close()
+            
+            if create:
+                return self._create()
+            
+            if self._is_healthy(pooled):
+                return pooled
+            
+            self._discard(pooled)
+    
+    def release(self, pooled: PooledConnection, discard: bool = False):
+        """
+        Devolve uma conexão ao pool.
+        
+        A transação corrente é desfeita para que o próximo uso enxergue
+        os dados atuais. Conexões com falha ou expiradas são fechadas.
+        
+        Args:
+            pooled: Conexão obtida com acquire()
+            discard: True para fechar a conexão em vez de reutilizá-la
+        """
+        if not discard:
+            try:
+                pooled.raw.rollback()
+            except Exception:
+                discard = True
+        
+        now = time.monotonic()
+        if not discard and now - pooled.created_at >= self.max_lifetime:
+            discard = True
+        
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                pooled.last_used = now
+                self._idle.append(pooled)
+                pooled = None
+            self._cond.notify()
+        
+        if pooled is not None:
+            pooled.close()
+    
+    def resize(self, max_size: int):
+        """
+        Altera o número máximo de conexões do pool.
+        
+        Args:
+            max_size: Novo limite de conexões abertas
+        """
+        with self._cond:
+            self.max_size = max_size
+            self._cond.notify_all()
+    
+    def evict_idle(self):
+        """Fecha conexões ociosas ou que ultrapassaram o tempo de vida."""
+        with self._cond:
+            expired = self._pop_expired_locked(time.monotonic())
+            if expired:
+                self._cond.notify_all()
+        for conn in expired:
+            conn.close()
+    
+    def close(self):
+        """Encerra o pool fechando todas as conexões ociosas."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+    
+    def _create(self) -> PooledConnection:
+        """Abre uma nova conexão física (vaga já reservada)."""
+        try:
+            return PooledConnection(self._factory(), self)
+        except Exception as e:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            if isinstance(e, DatabaseConnectionError):
+                raise
+            raise DatabaseConnectionError(f"Erro ao conectar: {e}")
+    
+    def _discard(self, pooled: PooledConnection):
+        """Fecha uma conexão retirada do pool e libera sua vaga."""
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        pooled.close()
+    
+    def _is_healthy(self, pooled: PooledConnection) -> bool:
+        """Valida a conexão se ela ficou ociosa por tempo suficiente."""
+        if time.monotonic() - pooled.last_used < self.health_check_interval:
+            return True
+        try:
+            cursor = pooled.raw.cursor()
+            cursor.execute(self.health_check_query)
+            cursor.fetchall()
+            pooled.raw.rollback()
+            return True
+        except Exception:
+            return False
+    
+    def _pop_expired_locked(self, now: float) -> List[PooledConnection]:
+        """Remove do pool as conexões expiradas (chamar com o lock)."""
+        expired = [
+            conn for conn in self._idle
+            if now - conn.last_used >= self.max_idle_time
+            or now - conn.created_at >= self.max_lifetime
+        ]
+        if expired:
+            self._idle = [conn for conn in self._idle if conn not in expired]
+            self._size -= len(expired)
+        return expired
+
+
+# Registro de pools compartilhados pelo processo
+_pools: Dict[Tuple[str, str], Tuple[str, ConnectionPool]] = {}
+_pools_lock = threading.Lock()
+_reaper: Optional[threading.Thread] = None
+
+
+def get_shared_pool(dsn: str,
+                    user: str,
+                    password: str,
+                    factory: Callable[[], Any],
+                    **pool_options) -> ConnectionPool:
+    """
+    Obtém o pool compartilhado para um DSN e usuário.
+    
+    Se a senha mudou desde a criação do pool, o pool antigo é encerrado
+    e substituído por um novo. Um novo max_size é aplicado ao pool
+    existente.
+    
+    Args:
+        dsn: DSN do banco de dados
+        user: Usuário da conexão
+        password: Senha da conexão
+        factory: Função que abre uma nova conexão física
+        **pool_options: Parâmetros repassados ao ConnectionPool
+    
+    Returns:
+        Pool compartilhado
+    """
+    key = (dsn, user.upper())
+    old_pool = None
+    with _pools_lock:
+        entry = _pools.get(key)
+        if entry and entry[0] == password:
+            pool = entry[1]
+            if 'max_size' in pool_options:
+                pool.resize(pool_options['max_size'])
+            return pool
+        if entry:
+            old_pool = entry[1]
+        pool = ConnectionPool(factory, **pool_options)
+        _pools[key] = (password, pool)
+        _start_reaper_locked()
+    
+    if old_pool:
+        old_pool.close()
+    return pool
+
+
+def close_all_pools():
+    """Encerra todos os pools compartilhados."""
+    with _pools_lock:
+        pools = [pool for _, pool in _pools.values()]
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _start_reaper_locked():
+    """Inicia a thread de limpeza de conexões ociosas (chamar com o lock)."""
+    global _reaper
+    if _reaper is None or not _reaper.is_alive():
+        _reaper = threading.Thread(target=_reap_idle_connections, daemon=True)
+        _reaper.start()
+
+
+def _reap_idle_connections():
+    """Fecha periodicamente as conexões ociosas de todos os pools."""
+    while True:
+        time.sleep(REAPER_INTERVAL)
+        with _pools_lock:
+            pools = [pool for _, pool in _pools.values()]
+        for pool in pools:
+            pool.evict_idle()
\ No newline at end of file
@@ -0,0 +1,207 @@
+"""
+Conexão com o banco de dados.
+"""
+from contextlib import nullcontext
+from dataclasses import replace
+from functools import partial
+from typing import List, Optional, Sequence, Tuple
+
+from core.exceptions.scriptbird_exceptions import (
+    DatabaseConnectionError,
+    DatabaseQueryError,
+)
+from core.models.database_config import DatabaseConfig
+from core.models.run_metrics import STAGE_CONNECT, STAGE_EXECUTE, RunMetrics
+from core.models.script_config import DEFAULT_BATCH_SIZE
+
+from .connection_pool import ConnectionPool, PooledConnection, get_shared_pool
+from .drivers import get_driver
+from .result_stream import ResultStream
+
+
+class DatabaseConnection:
+    """
+    Gerenciador de conexão com o banco de dados.
+    
+    O acesso ao banco é feito pelo driver configurado em [DB] driver
+    (Firebird por padrão).
+    """
+    
+    def __init__(self, config: DatabaseConfig):
+        """
+        Inicializa a conexão.
+        
+        Args:
+            config: Configuração do banco de dados
+            
+        Raises:
+            ConfigurationError: Se o driver não for suportado
+        """
+        self.config = config
+        self.driver = get_driver(config.driver)
+        self._connection = None
+        self._pooled = None
+    
+    def test_connection(self) -> bool:
+        """
+        Testa a conexão com o banco.
+        
+        Returns:
+            True se a conexão foi bem-sucedida
+            
+        Raises:
+            DatabaseConnectionError: Se não conseguir conectar
+        """
+        try:
+            conn = self.driver.connect(self.config)
+            conn.close()
+            return True
+        except Exception as e:
+            raise DatabaseConnectionError(f"Erro ao conectar: {e}")
+    
+    def execute_query(self, query: str) -> Tuple[List[str], List[Tuple]]:
+        """
+        Executa uma query e retorna os resultados.
+        
+        A conexão é obtida do pool compartilhado e devolvida ao final.
+        
+        Args:
+            query: Query SQL a ser executada
+            
+        Returns:
+            Tupla com (nomes_colunas, dados)
+            
+        Raises:
+            DatabaseConnectionError: Se não conseguir conectar
+            DatabaseQueryError: Se houver erro na execução da query
+        """
+        result = self.execute_query_iter(query)
+        return result.columns, result.fetchall()
+    
+    def execute_query_iter(self,
+                           query: str,
+                           batch_size: int = DEFAULT_BATCH_SIZE,
+                           params: Optional[Sequence] = None,
+                           metrics: Optional[RunMetrics] = None) -> ResultStream:
+        """
+        Executa uma query para leitura em lotes.
+        
+        O cursor usa arraysize igual a batch_size, de forma que cada lote
+        corresponde a um fetchmany. A memória usada fica limitada ao
+        tamanho do lote e não ao tamanho do resultado.
+        
+        A query é preparada uma vez por conexão do pool e o comando é
+        reaproveitado nas execuções seguintes (veja StatementCache).
+        
+        Args:
+            query: Query SQL a ser executada
+            batch_size: Quantidade de linhas por lote
+            params: Valores dos parâmetros (?) da query
+            metrics: Métricas do ciclo, que recebem os tempos de conexão,
+                execução e leitura
+            
+        Returns:
+            Resultado iterável em lotes (deve ser consumido ou fechado)
+            
+        Raises:
+            DatabaseConnectionError: Se não conseguir conectar
+            DatabaseQueryError: Se houver erro na execução da query
+        """
+        with _timer(metrics, STAGE_CONNECT):
+            pooled = self._acquire()
+        try:
+            with _timer(metrics, STAGE_EXECUTE):
+                cursor = self._execute(pooled, query, params, batch_size, metrics)
+            return ResultStream(pooled, cursor, batch_size, metrics)
+            
+        except self.driver.errors as e:
+            pooled.release()
+            raise DatabaseQueryError(f"Erro na execução da query: {e}")
+        except Exception as e:
+            pooled.release()
+            raise DatabaseConnectionError(f"Erro de conexão: {e}")
+    
+    @property
+    def pool(self) -> ConnectionPool:
+        """Retorna o pool compartilhado para o DSN e usuário configurados."""
+        return get_shared_pool(
+            self.config.get_dsn(),
+            self.config.usuario,
+            self.config.senha,
+            partial(self.driver.connect, replace(self.config)),
+            max_size=self.config.max_conexoes,
+            health_check_query=self.driver.health_check_query
+        )
+    
+    def _execute(self,
+                 pooled: PooledConnection,
+                 query: str,
+                 params: Optional[Sequence],
+                 batch_size: int,
+                 metrics: Optional[RunMetrics]):
+        """
+        Executa a query com o comando preparado em cache na conexão.
+        
+        Um comando que falha é descartado. Se ele veio do cache (ex.:
+        invalidado por uma alteração na estrutura do banco), a query é
+        preparada e executada de novo uma vez.
+        
+        Returns:
+            Cursor com a query executada
+        """
+        prepare = partial(self.driver.prepare, pooled.raw)
+        while True:
+            cursor, statement, cached = pooled.statements.get(query, prepare)
+            try:
+                _run(cursor, statement, params, batch_size)
+                break
+            except self.driver.errors:
+                pooled.statements.discard(query)
+                if not cached:
+                    raise
+        if metrics is not None:
+            metrics.add_statement(cached)
+        return cursor
+    
+    def _acquire(self) -> PooledConnection:
+        """Obtém uma conexão do pool."""
+        try:
+            return self.pool.acquire()
+        except DatabaseConnectionError:
+            raise
+        except Exception as e:
+            raise DatabaseConnectionError(f"Erro ao conectar: {e}")
+    
+    def __enter__(self):
+        """Context manager entry."""
+        self._pooled = self._acquire()
+        self._connection = self._pooled.raw
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        if self._pooled:
+            self._pooled.release()
+            self._pooled = None
+            self._connection = None
+    
+    @property
+    def connection(self):
+        """Retorna a conexão ativa."""
+        if not self._connection:
+            raise DatabaseConnectionError("Conexão não estabelecida")
+        return self._connection
+
+
+def _run(cursor, statement, params: Optional[Sequence], batch_size: int):
+    """Executa um comando no cursor com o tamanho de lote informado."""
+    cursor.arraysize = batch_size
+    if params:
+        cursor.execute(statement, params)
+    else:
+        cursor.execute(statement)
+
+
+def _timer(metrics: Optional[RunMetrics], stage: str):
+    """Mede uma etapa nas métricas, se houver."""
+    return metrics.timer(stage) if metrics is not None else nullcontext()
\ No newline at end of file
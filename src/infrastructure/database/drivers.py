@@ -0,0 +1,137 @@
+"""
+Drivers de banco de dados suportados pelo ScriptBird.
+
+Cada driver adapta um módulo DB-API (fdb, sqlite3) ao DatabaseConnection:
+como montar o DSN, abrir a conexão física, preparar uma query, quais
+exceções representam erros de query e qual query valida uma conexão
+ociosa do pool.
+"""
+import sqlite3
+from typing import Any, Dict, Tuple, Type
+
+from core.exceptions.scriptbird_exceptions import ConfigurationError
+from core.models.database_config import DRIVER_FIREBIRD, DRIVER_SQLITE, DatabaseConfig
+
+
+class DatabaseDriver:
+    """Base dos drivers de banco de dados."""
+    
+    name = ''
+    health_check_query = 'SELECT 1'
+    
+    def connect(self, config: DatabaseConfig) -> Any:
+        """
+        Abre uma conexão física.
+        
+        Args:
+            config: Configuração do banco de dados
+        
+        Returns:
+            Conexão DB-API
+        """
+        raise NotImplementedError
+    
+    def prepare(self, connection: Any, query: str) -> Tuple[Any, Any]:
+        """
+        Prepara uma query para ser executada várias vezes.
+        
+        Por padrão o comando é o próprio texto da query, executado em um
+        cursor reservado para ela.
+        
+        Args:
+            connection: Conexão física
+            query: Texto da query
+        
+        Returns:
+            Tupla (cursor, comando passado a cursor.execute)
+        """
+        return connection.cursor(), query
+    
+    @property
+    def errors(self) -> Tuple[Type[Exception], ...]:
+        """Exceções do driver que indicam erro na query."""
+        raise NotImplementedError
+
+
+class FirebirdDriver(DatabaseDriver):
+    """Driver Firebird (fdb)."""
+    
+    name = DRIVER_FIREBIRD
+    health_check_query = 'SELECT 1 FROM RDB$DATABASE'
+    
+    def connect(self, config: DatabaseConfig) -> Any:
+        """Abre uma conexão com o servidor Firebird."""
+        import fdb
+        
+        return fdb.connect(
+            dsn=config.get_dsn(),
+            user=config.usuario,
+            password=config.senha
+        )
+    
+    def prepare(self, connection: Any, query: str) -> Tuple[Any, Any]:
+        """Prepara a query no servidor (cursor.prep)."""
+        cursor = connection.cursor()
+        return cursor, cursor.prep(query)
+    
+    @property
+    def errors(self) -> Tuple[Type[Exception], ...]:
+        """Exceções do fdb que indicam erro na query."""
+        import fdb
+        
+        return (fdb.Error,)
+
+
+class SqliteDriver(DatabaseDriver):
+    """
+    Driver SQLite (sqlite3), usado em testes de carga e benchmarks.
+    
+    O caminho pode ser um arquivo ou uma URI 'file:' (ex.:
+    'file:dados?mode=memory&cache=shared' para um banco em memória
+    compartilhado entre as conexões do pool). O sqlite3 já reaproveita os
+    comandos compilados pelo texto da query, então prepare() mantém o
+    comportamento padrão.
+    """
+    
+    name = DRIVER_SQLITE
+    
+    def connect(self, config: DatabaseConfig) -> Any:
+        """Abre o arquivo SQLite."""
+        database = config.get_dsn()
+        # As conexões do pool são usadas por threads diferentes
+        return sqlite3.connect(
+            database, check_same_thread=False, uri=database.startswith('file:')
+        )
+    
+    @property
+    def errors(self) -> Tuple[Type[Exception], ...]:
+        """Exceções do sqlite3 que indicam erro na query."""
+        return (sqlite3.Error,)
+
+
+# Drivers disponíveis por nome ([DB] driver no config.ini)
+DRIVERS: Dict[str, Type[DatabaseDriver]] = {
+    DRIVER_FIREBIRD: FirebirdDriver,
+    DRIVER_SQLITE: SqliteDriver,
+}
+
+
+def get_driver(name: str) -> DatabaseDriver:
+    """
+    Obtém o driver pelo nome.
+    
+    Args:
+        name: Nome do driver (firebird, sqlite)
+    
+    Returns:
+        Instância do driver
+    
+    Raises:
+        ConfigurationError: Se o driver não existir
+    """
+    driver_class = DRIVERS.get((name or DRIVER_FIREBIRD).strip().lower())
+    if driver_class is None:
+        raise ConfigurationError(
+            f"Driver de banco não suportado: {name}. Use: {', '.join(DRIVERS)}"
+        )
+    return driver_class()
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Leitura de resultados de query em lotes.
+"""
+import time
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from core.exceptions.scriptbird_exceptions import DatabaseQueryError
+from core.models.run_metrics import STAGE_FETCH, STAGE_FIRST_ROW, RunMetrics
+from core.models.script_config import DEFAULT_BATCH_SIZE
+
+from .connection_pool import PooledConnection
+
+
+class ResultStream:
+    """
+    Resultado de uma query lido do cursor em lotes.
+    
+    Mantém a conexão do pool até ser consumido ou fechado, por isso
+    deve ser usado como context manager ou ter close() chamado.
+    """
+    
+    def __init__(self,
+                 pooled: PooledConnection,
+                 cursor,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 metrics: Optional[RunMetrics] = None):
+        """
+        Inicializa o resultado.
+        
+        Args:
+            pooled: Conexão do pool usada na query
+            cursor: Cursor com a query já executada
+            batch_size: Quantidade de linhas por lote
+            metrics: Métricas do ciclo, que recebem os tempos de leitura
+        """
+        self._pooled = pooled
+        self._cursor = cursor
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self._first_fetch = True
+        self.description = cursor.description or []
+        self.columns: List[str] = [desc[0] for desc in self.description]
+    
+    def __iter__(self) -> Iterator[List[Tuple]]:
+        """Itera sobre os lotes de linhas (fetchmany)."""
+        try:
+            while self._pooled is not None:
+                batch = self._fetch(self._cursor.fetchmany, self.batch_size)
+                if not batch:
+                    break
+                if self.metrics is not None:
+                    self.metrics.add_fetched(len(batch))
+                yield batch
+        finally:
+            self.close()
+    
+    def rows(self) -> Iterator[Sequence]:
+        """Itera linha a linha sobre o resultado."""
+        for batch in self:
+            yield from batch
+    
+    def fetchall(self) -> List[Tuple]:
+        """Lê todas as linhas restantes de uma vez."""
+        try:
+            rows = self._fetch(self._cursor.fetchall)
+            if self.metrics is not None:
+                self.metrics.add_fetched(len(rows))
+            return rows
+        finally:
+            self.close()
+    
+    def close(self):
+        """Devolve a conexão ao pool."""
+        if self._pooled is not None:
+            pooled, self._pooled = self._pooled, None
+            pooled.release()
+    
+    def _fetch(self, method, *args):
+        """Executa uma leitura no cursor convertendo erros do driver."""
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        except Exception as e:
+            raise DatabaseQueryError(f"Erro ao ler resultados da query: {e}")
+        finally:
+            if self.metrics is not None:
+                elapsed = time.perf_counter() - start
+                self.metrics.add(STAGE_FETCH, elapsed)
+                if self._first_fetch:
+                    self.metrics.add(STAGE_FIRST_ROW, elapsed)
+            self._first_fetch = False
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
\ No newline at end of file
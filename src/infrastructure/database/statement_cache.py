@@ -0,0 +1,80 @@
+"""
+Cache de comandos preparados de uma conexão.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Tuple
+
+# Comandos preparados mantidos por conexão do pool
+DEFAULT_STATEMENT_CACHE_SIZE = 32
+
+
+class StatementCache:
+    """
+    Comandos preparados de uma conexão física, por texto da query (LRU).
+    
+    Cada comando guarda o cursor em que foi preparado, então um ciclo
+    que repete a query (ou a mesma query com outros parâmetros) executa
+    o comando já preparado, sem a fase de análise e otimização no
+    servidor. Uma conexão do pool é usada por uma thread de cada vez, por
+    isso o cache não usa lock.
+    """
+    
+    def __init__(self, max_size: int = DEFAULT_STATEMENT_CACHE_SIZE):
+        """
+        Inicializa o cache vazio.
+        
+        Args:
+            max_size: Quantidade máxima de comandos (0 desativa o cache)
+        """
+        self.max_size = max_size
+        self._statements: 'OrderedDict[str, Tuple[Any, Any]]' = OrderedDict()
+    
+    def __len__(self) -> int:
+        """Quantidade de comandos preparados no cache."""
+        return len(self._statements)
+    
+    def get(self,
+            query: str,
+            prepare: Callable[[str], Tuple[Any, Any]]) -> Tuple[Any, Any, bool]:
+        """
+        Obtém o comando preparado da query, preparando-o se necessário.
+        
+        Args:
+            query: Texto da query
+            prepare: Função que devolve (cursor, comando) para a query
+        
+        Returns:
+            Tupla (cursor, comando, True se veio do cache)
+        """
+        entry = self._statements.get(query)
+        if entry is not None:
+            self._statements.move_to_end(query)
+            return entry + (True,)
+        
+        entry = prepare(query)
+        if self.max_size > 0:
+            self._statements[query] = entry
+            while len(self._statements) > self.max_size:
+                _, evicted = self._statements.popitem(last=False)
+                _close_cursor(evicted[0])
+        return entry + (False,)
+    
+    def discard(self, query: str):
+        """Remove e fecha o comando de uma query (ex.: invalidado no servidor)."""
+        entry = self._statements.pop(query, None)
+        if entry is not None:
+            _close_cursor(entry[0])
+    
+    def clear(self):
+        """Fecha todos os comandos do cache."""
+        statements, self._statements = self._statements, OrderedDict()
+        for cursor, _ in statements.values():
+            _close_cursor(cursor)
+
+
+def _close_cursor(cursor: Any):
+    """Fecha um cursor ignorando erros (a conexão pode já estar fechada)."""
+    try:
+        cursor.close()
+    except Exception:
+        pass
\ No newline at end of file
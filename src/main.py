@@ -1,6 +1,7 @@
 """
 Ponto de entrada principal do ScriptBird.
 """
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -16,6 +17,7 @@ if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
 try:
+    from infrastructure.database.connection_pool import close_all_pools
     from ui.main_window import MainWindow
 except ImportError as e:
     print(f"Erro ao importar MainWindow: {e}")
@@ -27,6 +29,7 @@ def main():
     # Cria aplicação
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
+    app.aboutToQuit.connect(close_all_pools)
     
     # Cria e exibe janela principal
     try:
@@ -41,4 +44,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necessário para os processos de trabalho no executável (PyInstaller)
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
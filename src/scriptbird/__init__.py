@@ -0,0 +1 @@
+# ScriptBird - Execução sem interface gráfica (CLI e daemon)
\ No newline at end of file
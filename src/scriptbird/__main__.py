@@ -0,0 +1,9 @@
+"""
+Permite executar a linha de comando com python -m scriptbird.
+"""
+import sys
+
+from scriptbird.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Execução do ScriptBird sem interface gráfica.
+
+Uso:
+    python -m scriptbird run scripts/produtos.ini [--config config.ini]
+    python -m scriptbird daemon [--config config.ini]
+    scriptbird-daemon [--config config.ini]
+
+'run' executa um script (em ciclos, se REPETIR ou AGENDA estiverem
+definidos) até terminar ou receber SIGINT/SIGTERM. 'daemon' executa os
+scripts da seção [AGENDADOR] do config.ini (lista de scripts e/ou
+diretório de scripts; ou o script da seção [SCRIPT]) até terminarem ou
+receber o sinal de parada. Nenhum dos comandos carrega o PyQt5, então
+podem rodar em servidores sem interface, pelo systemd ou pelo cron.
+Scripts alterados são relidos antes do ciclo seguinte, ou na hora com
+SIGHUP.
+"""
+import argparse
+import functools
+import os
+import signal
+import sys
+from pathlib import Path
+from typing import List, Optional, Union
+
+# Adiciona o diretório src ao path
+src_path = Path(__file__).parent.parent
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from core.exceptions.scriptbird_exceptions import ConfigurationError, ScriptBirdException
+from core.services.scheduler import Scheduler
+from core.services.script_executor import ScriptExecutor
+from infrastructure.config.config_manager import ConfigManager
+from infrastructure.database.connection_pool import close_all_pools
+from utils.logger import ScriptBirdLogger
+
+# Intervalo (segundos) das esperas da thread principal, para atender os sinais
+JOIN_INTERVAL = 0.5
+
+
+def run_script(script_path: str, config_file: str, logger: ScriptBirdLogger) -> int:
+    """
+    Executa um script até o fim.
+    
+    Args:
+        script_path: Caminho do script .ini
+        config_file: Caminho do config.ini (dados de conexão padrão)
+        logger: Logger da execução
+    
+    Returns:
+        Código de saída (0 sucesso, 1 erro na execução)
+    """
+    config_manager = ConfigManager(config_file)
+    db_config, _ = config_manager.load_config()
+    script_action = config_manager.load_script_action(script_path)
+    db_config = config_manager.load_script_database(script_path, db_config)
+    
+    executor = ScriptExecutor(
+        db_config, script_action, logger.info,
+        script_loader=functools.partial(config_manager.load_script_action, script_path)
+    )
+    _run_until_finished(executor, logger)
+    return 1 if executor.last_error else 0
+
+
+def run_daemon(config_file: str, logger: ScriptBirdLogger) -> int:
+    """
+    Executa os scripts configurados no agendador até o fim.
+    
+    Args:
+        config_file: Caminho do config.ini
+        logger: Logger da execução
+    
+    Returns:
+        Código de saída (0 sucesso, 1 se o último ciclo de algum script falhou)
+    
+    Raises:
+        ConfigurationError: Se nenhum script estiver configurado
+    """
+    config_manager = ConfigManager(config_file)
+    db_config, script_config = config_manager.load_config()
+    scheduler_config = config_manager.load_scheduler_config()
+    scripts = scheduler_config.scripts
+    if not scheduler_config.is_enabled() and script_config.arquivo:
+        scripts = [script_config.arquivo]
+    
+    scheduler = Scheduler(scheduler_config.max_workers, scheduler_config.max_por_banco, logger.info)
+    for script_path in scripts:
+        script_action = config_manager.load_script_action(script_path)
+        script_db_config = config_manager.load_script_database(script_path, db_config)
+        name = os.path.splitext(os.path.basename(script_path))[0]
+        scheduler.add_job(
+            name, script_action, script_db_config,
+            functools.partial(config_manager.load_script_action, script_path),
+            script_path
+        )
+    if scheduler_config.diretorio:
+        configured = {os.path.abspath(script_path) for script_path in scripts}
+        for script in config_manager.load_script_directory(scheduler_config.diretorio, scheduler_config.indice):
+            if not script.valid:
+                logger.error(f"Script {script.path} ignorado: {script.erro}")
+            elif os.path.abspath(script.path) not in configured:
+                scripts.append(script.path)
+                scheduler.add_job(
+                    script.name, script.action, script.database(db_config),
+                    functools.partial(config_manager.load_script_action, script.path),
+                    script.path
+                )
+    if not scripts:
+        raise ConfigurationError(
+            f"Nenhum script configurado em {config_file} "
+            "([AGENDADOR] scripts ou diretorio, ou [SCRIPT] arquivo)"
+        )
+    
+    _run_until_finished(scheduler, logger)
+    failed = scheduler.failed_jobs
+    if failed:
+        logger.error(f"Scripts com erro no último ciclo: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+def _run_until_finished(runner: Union[ScriptExecutor, Scheduler], logger: ScriptBirdLogger):
+    """
+    Inicia o executor e aguarda o fim, parando em SIGINT/SIGTERM.
+    
+    SIGHUP (onde existe) faz os scripts alterados serem relidos na hora,
+    em vez de apenas antes do ciclo seguinte.
+    """
+    def request_stop(signum, frame):
+        logger.info(f"Sinal {signal.Signals(signum).name} recebido: parando...")
+        runner.stop()
+    
+    def request_reload(signum, frame):
+        logger.info("Sinal SIGHUP recebido: relendo scripts...")
+        runner.reload()
+    
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, request_reload)
+    runner.start()
+    # join com intervalo para que a thread principal atenda os sinais
+    while runner.is_alive():
+        runner.join(JOIN_INTERVAL)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Ponto de entrada da linha de comando.
+    
+    Args:
+        argv: Argumentos (padrão: sys.argv[1:])
+    
+    Returns:
+        Código de saída
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default="config.ini", help="arquivo de configuração (padrão: config.ini)")
+    parser = argparse.ArgumentParser(prog="scriptbird", description="ScriptBird sem interface gráfica")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", parents=[common], help="executa um script")
+    run_parser.add_argument("script", help="arquivo .ini do script")
+    commands.add_parser("daemon", parents=[common], help="executa os scripts do [AGENDADOR]")
+    args = parser.parse_args(argv)
+    
+    logger = ScriptBirdLogger()
+    try:
+        if args.command == "run":
+            return run_script(args.script, args.config, logger)
+        return run_daemon(args.config, logger)
+    except ScriptBirdException as e:
+        logger.error(str(e))
+        return 1
+    finally:
+        close_all_pools()
+
+
+def daemon_main() -> int:
+    """Ponto de entrada do scriptbird-daemon."""
+    return main(["daemon"] + sys.argv[1:])
\ No newline at end of file
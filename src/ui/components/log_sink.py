@@ -0,0 +1,73 @@
+"""
+Destino dos logs exibidos na janela do ScriptBird.
+"""
+import threading
+from collections import deque
+from typing import Deque
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QPlainTextEdit
+
+# Intervalo (ms) entre as atualizações do campo de logs
+FLUSH_INTERVAL_MS = 100
+
+# Linhas mantidas no campo de logs (as mais antigas são descartadas)
+MAX_LOG_LINES = 5000
+
+
+class LogSink(QObject):
+    """
+    Fila de mensagens de log exibidas em um QPlainTextEdit.
+    
+    write() pode ser chamado de qualquer thread: só guarda a mensagem. Um
+    QTimer na thread da janela junta as mensagens pendentes e as acrescenta
+    ao campo de uma vez, a cada FLUSH_INTERVAL_MS. O campo guarda no máximo
+    max_lines linhas; se a fila acumular mais que isso entre duas
+    atualizações, as mais antigas são descartadas e a quantidade é avisada.
+    """
+    
+    def __init__(self, widget: QPlainTextEdit, max_lines: int = MAX_LOG_LINES,
+                 interval_ms: int = FLUSH_INTERVAL_MS):
+        """
+        Inicializa a fila e o timer (deve ser criada na thread da janela).
+        
+        Args:
+            widget: Campo que exibe os logs
+            max_lines: Número máximo de linhas mantidas no campo
+            interval_ms: Intervalo entre as atualizações do campo
+        """
+        super().__init__(widget)
+        self.widget = widget
+        self.widget.setMaximumBlockCount(max_lines)
+        self._pending: Deque[str] = deque(maxlen=max_lines)
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+    
+    def write(self, message: str):
+        """Enfileira uma mensagem (seguro em qualquer thread)."""
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append(message)
+    
+    def flush(self):
+        """Acrescenta as mensagens pendentes ao campo (thread da janela)."""
+        with self._lock:
+            if not self._pending:
+                return
+            messages = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            messages.insert(0, f"... {dropped} mensagens de log omitidas ...")
+        
+        # Só acompanha o fim se o usuário não tiver rolado para cima
+        scrollbar = self.widget.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.widget.appendPlainText("\n".join(messages))
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
\ No newline at end of file
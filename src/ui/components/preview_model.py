@@ -0,0 +1,226 @@
+"""
+Modelo de tabela da pré-visualização de consultas do ScriptBird.
+"""
+import threading
+from decimal import Decimal
+from typing import Any, Iterator, List, Optional, Sequence
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer, pyqtSignal
+
+# Linhas lidas do cursor a cada rolagem até o fim da tabela
+PREVIEW_PAGE_SIZE = 200
+
+# Máximo de linhas exibidas; ao chegar nele o resultado é fechado
+PREVIEW_MAX_ROWS = 5000
+
+# Tempo (ms) sem leitura de páginas até o resultado ser fechado
+PREVIEW_IDLE_TIMEOUT_MS = 60000
+
+
+class PreviewTableModel(QAbstractTableModel):
+    """
+    Resultado de uma consulta lido do cursor sob demanda.
+    
+    A primeira página é lida fora da thread da janela (veja load()); as
+    seguintes são pedidas por fetchMore() quando a tabela rola até o fim e
+    lidas em uma thread, uma página por vez, então só as linhas já
+    exibidas ficam em memória e a janela não trava esperando o banco.
+    Enquanto houver linhas a ler, o resultado mantém uma conexão do pool
+    (e a transação da consulta) aberta: ela é devolvida ao chegar em
+    max_rows linhas, depois de idle_timeout_ms sem leituras, por release()
+    (ex.: aba escondida) ou por clear(). As linhas lidas continuam
+    exibidas.
+    """
+    
+    # Página lida em segundo plano (inclusive a leitura que encontra o fim)
+    fetched = pyqtSignal()
+    
+    # Erro ao ler uma página do cursor (mensagem)
+    fetch_failed = pyqtSignal(str)
+    
+    # Resultado fechado antes do fim (limite de linhas, inatividade ou release())
+    released = pyqtSignal()
+    
+    # Página lida pela thread: (geração, páginas, página ou None, erro)
+    _page_read = pyqtSignal(int, object, object, str)
+    
+    def __init__(self,
+                 parent=None,
+                 max_rows: int = PREVIEW_MAX_ROWS,
+                 idle_timeout_ms: int = PREVIEW_IDLE_TIMEOUT_MS):
+        """
+        Inicializa o modelo vazio.
+        
+        Args:
+            parent: Objeto pai
+            max_rows: Máximo de linhas exibidas
+            idle_timeout_ms: Tempo sem leituras até o resultado ser fechado
+        """
+        super().__init__(parent)
+        self.max_rows = max_rows
+        self._columns: List[str] = []
+        self._rows: List[Sequence] = []
+        self._batches: Optional[Iterator[Sequence[Sequence]]] = None
+        self._fetching = False
+        self._truncated = False
+        # Incrementada a cada resultado novo: páginas de um resultado
+        # anterior que chegarem da thread são descartadas
+        self._generation = 0
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(idle_timeout_ms)
+        self._idle_timer.timeout.connect(self.release)
+        self._page_read.connect(self._on_page_read)
+    
+    def load(self,
+             columns: List[str],
+             batches: Iterator[Sequence[Sequence]],
+             first_page: Optional[Sequence[Sequence]]):
+        """
+        Exibe um novo resultado, descartando o anterior.
+        
+        Args:
+            columns: Nomes das colunas
+            batches: Iterador das páginas restantes (gerador do ResultStream,
+                que devolve a conexão ao ser fechado)
+            first_page: Primeira página, já lida (None se não houver linhas)
+        """
+        self.beginResetModel()
+        self._close()
+        self._columns = list(columns)
+        self._rows = list(first_page or [])
+        self._batches = batches if first_page else None
+        self._truncated = False
+        self.endResetModel()
+        if not first_page:
+            _close_batches(batches)
+        elif len(self._rows) >= self.max_rows:
+            self.release()
+        else:
+            self._idle_timer.start()
+    
+    def clear(self):
+        """Remove as linhas e devolve a conexão ao pool."""
+        self.beginResetModel()
+        self._close()
+        self._columns = []
+        self._rows = []
+        self._truncated = False
+        self.endResetModel()
+    
+    def release(self):
+        """Fecha o resultado, mantendo as linhas já lidas, e devolve a conexão."""
+        if self._batches is None:
+            return
+        self._close()
+        self._truncated = True
+        self.released.emit()
+    
+    @property
+    def exhausted(self) -> bool:
+        """True se não há mais linhas a ler (fim do resultado ou fechado)."""
+        return self._batches is None
+    
+    @property
+    def truncated(self) -> bool:
+        """True se o resultado foi fechado antes da última linha."""
+        return self._truncated
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Quantidade de linhas já lidas."""
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Quantidade de colunas do resultado."""
+        return 0 if parent.isValid() else len(self._columns)
+    
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """Valor de uma célula formatado para exibição."""
+        if not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            return self._format(value)
+        if role == Qt.TextAlignmentRole and isinstance(value, (int, float, Decimal)):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+    
+    def headerData(self, section: int, orientation: int, role: int = Qt.DisplayRole) -> Any:
+        """Nomes das colunas e números das linhas."""
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._columns[section] if section < len(self._columns) else None
+        return str(section + 1)
+    
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Indica se ainda há linhas a ler do cursor."""
+        return not parent.isValid() and self._batches is not None
+    
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        """Pede a próxima página do cursor, lida em uma thread."""
+        if not self.canFetchMore(parent) or self._fetching:
+            return
+        self._fetching = True
+        self._idle_timer.stop()
+        generation, batches = self._generation, self._batches
+        
+        def read():
+            try:
+                page = next(batches, None)
+                self._page_read.emit(generation, batches, page, '')
+            except Exception as e:
+                self._page_read.emit(generation, batches, None, str(e) or type(e).__name__)
+        
+        threading.Thread(target=read, name='PreviewPage', daemon=True).start()
+    
+    def _on_page_read(self, generation: int, batches, page, error: str):
+        """Acrescenta a página lida pela thread (thread da janela)."""
+        if generation != self._generation:
+            # Resultado descartado enquanto a página era lida: o gerador só
+            # pode ser fechado agora, fora da thread que o estava usando
+            _close_batches(batches)
+            return
+        self._fetching = False
+        if error:
+            self._close()
+            self.fetch_failed.emit(error)
+            return
+        if page:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._rows.extend(page)
+            self.endInsertRows()
+            if len(self._rows) >= self.max_rows:
+                self.release()
+            else:
+                self._idle_timer.start()
+        else:
+            self._close()
+        self.fetched.emit()
+    
+    def _close(self):
+        """Fecha o iterador das páginas restantes."""
+        self._idle_timer.stop()
+        self._generation += 1
+        batches, self._batches = self._batches, None
+        if self._fetching:
+            # A thread ainda está lendo: _on_page_read fecha o gerador
+            self._fetching = False
+            return
+        _close_batches(batches)
+    
+    @staticmethod
+    def _format(value: Any) -> str:
+        """Texto exibido para um valor do banco."""
+        if value is None:
+            return ''
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return f"<{len(value)} bytes>"
+        return str(value)
+
+
+def _close_batches(batches: Optional[Iterator[Sequence[Sequence]]]):
+    """Fecha o gerador das páginas, devolvendo a conexão ao pool."""
+    if batches is not None and hasattr(batches, 'close'):
+        batches.close()
\ No newline at end of file
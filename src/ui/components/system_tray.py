@@ -92,6 +92,15 @@ class SystemTray(QObject):
         """
         self.tray.showMessage(title, message)
     
+    def set_tooltip(self, text: str):
+        """
+        Define o texto exibido ao passar o mouse sobre o ícone.
+        
+        Args:
+            text: Texto do tooltip
+        """
+        self.tray.setToolTip(text)
+    
     def set_visible(self, visible: bool):
         """
         Define a visibilidade do tray icon.
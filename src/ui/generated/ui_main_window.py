@@ -14,7 +14,7 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
         MainWindow.setObjectName("MainWindow")
-        MainWindow.resize(556, 479)
+        MainWindow.resize(556, 506)
         self.centralwidget = QtWidgets.QWidget(MainWindow)
         self.centralwidget.setObjectName("centralwidget")
         self.BancodeDados = QtWidgets.QGroupBox(self.centralwidget)
@@ -65,21 +65,44 @@ class Ui_MainWindow(object):
         self.btn_AbrirExploradorScript = QtWidgets.QToolButton(self.Script)
         self.btn_AbrirExploradorScript.setGeometry(QtCore.QRect(508, 19, 25, 21))
         self.btn_AbrirExploradorScript.setObjectName("btn_AbrirExploradorScript")
-        self.Log = QtWidgets.QGroupBox(self.centralwidget)
-        self.Log.setGeometry(QtCore.QRect(10, 170, 541, 251))
-        self.Log.setObjectName("Log")
-        self.campoLogs = QtWidgets.QPlainTextEdit(self.Log)
-        self.campoLogs.setGeometry(QtCore.QRect(10, 20, 521, 221))
+        self.abas = QtWidgets.QTabWidget(self.centralwidget)
+        self.abas.setGeometry(QtCore.QRect(10, 170, 541, 251))
+        self.abas.setObjectName("abas")
+        self.abaLog = QtWidgets.QWidget()
+        self.abaLog.setObjectName("abaLog")
+        self.campoLogs = QtWidgets.QPlainTextEdit(self.abaLog)
+        self.campoLogs.setGeometry(QtCore.QRect(5, 5, 525, 213))
         self.campoLogs.setObjectName("campoLogs")
+        self.abas.addTab(self.abaLog, "")
+        self.abaPreview = QtWidgets.QWidget()
+        self.abaPreview.setObjectName("abaPreview")
+        self.btn_Preview = QtWidgets.QPushButton(self.abaPreview)
+        self.btn_Preview.setGeometry(QtCore.QRect(5, 5, 101, 23))
+        self.btn_Preview.setObjectName("btn_Preview")
+        self.lbl_Preview = QtWidgets.QLabel(self.abaPreview)
+        self.lbl_Preview.setGeometry(QtCore.QRect(115, 9, 415, 16))
+        self.lbl_Preview.setText("")
+        self.lbl_Preview.setObjectName("lbl_Preview")
+        self.tabelaPreview = QtWidgets.QTableView(self.abaPreview)
+        self.tabelaPreview.setGeometry(QtCore.QRect(5, 33, 525, 185))
+        self.tabelaPreview.setObjectName("tabelaPreview")
+        self.abas.addTab(self.abaPreview, "")
+        self.barraProgresso = QtWidgets.QProgressBar(self.centralwidget)
+        self.barraProgresso.setGeometry(QtCore.QRect(10, 428, 541, 23))
+        self.barraProgresso.setProperty("value", 0)
+        self.barraProgresso.setAlignment(QtCore.Qt.AlignCenter)
+        self.barraProgresso.setFormat("")
+        self.barraProgresso.setObjectName("barraProgresso")
         self.btn_IniciarBot = QtWidgets.QPushButton(self.centralwidget)
-        self.btn_IniciarBot.setGeometry(QtCore.QRect(10, 430, 261, 23))
+        self.btn_IniciarBot.setGeometry(QtCore.QRect(10, 457, 261, 23))
         self.btn_IniciarBot.setObjectName("btn_IniciarBot")
         self.btn_PararBot = QtWidgets.QPushButton(self.centralwidget)
-        self.btn_PararBot.setGeometry(QtCore.QRect(290, 430, 261, 23))
+        self.btn_PararBot.setGeometry(QtCore.QRect(290, 457, 261, 23))
         self.btn_PararBot.setObjectName("btn_PararBot")
         MainWindow.setCentralWidget(self.centralwidget)
 
         self.retranslateUi(MainWindow)
+        self.abas.setCurrentIndex(0)
         QtCore.QMetaObject.connectSlotsByName(MainWindow)
 
     def retranslateUi(self, MainWindow):
@@ -96,6 +119,8 @@ class Ui_MainWindow(object):
         self.btn_EditarCaminhoBD.setText(_translate("MainWindow", "Editar"))
         self.Script.setTitle(_translate("MainWindow", "Script em Execução"))
         self.btn_AbrirExploradorScript.setText(_translate("MainWindow", "..."))
-        self.Log.setTitle(_translate("MainWindow", "Log:"))
+        self.abas.setTabText(self.abas.indexOf(self.abaLog), _translate("MainWindow", "Log"))
+        self.btn_Preview.setText(_translate("MainWindow", "Pré-visualizar"))
+        self.abas.setTabText(self.abas.indexOf(self.abaPreview), _translate("MainWindow", "Pré-visualização"))
         self.btn_IniciarBot.setText(_translate("MainWindow", "Executar"))
         self.btn_PararBot.setText(_translate("MainWindow", "Parar"))
@@ -1,9 +1,14 @@
 """
 Janela principal do ScriptBird refatorada.
 """
+import copy
+import functools
+import os
 import sys
+import threading
 from pathlib import Path
 
+from PyQt5.QtCore import QFileSystemWatcher, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QFileDialog, QMainWindow
 
@@ -14,10 +19,14 @@ if str(src_path) not in sys.path:
 
 try:
     from core.models.database_config import DatabaseConfig
-    from core.models.script_config import ScriptConfig
+    from core.models.script_config import SaveToFileSettings, ScriptConfig
     from core.services.database_service import DatabaseService
+    from core.services.parameter_sweep import load_parameter_values
+    from core.services.scheduler import Scheduler
     from core.services.script_executor import ScriptExecutor
     from infrastructure.config.config_manager import ConfigManager
+    from ui.components.log_sink import LogSink
+    from ui.components.preview_model import PREVIEW_PAGE_SIZE, PreviewTableModel
     from ui.components.system_tray import SystemTray
     from ui.generated.ui_main_window import Ui_MainWindow
     from utils.logger import ScriptBirdLogger
@@ -38,6 +47,12 @@ except ImportError as e:
         def show_message(self, title, message):
             pass
     
+    class LogSink:
+        def __init__(self, widget): 
+            self.widget = widget
+        def write(self, message): 
+            self.widget.appendPlainText(message)
+    
     class ConfigManager:
         def load_config(self): 
             return DatabaseConfig(), ScriptConfig()
@@ -47,6 +62,8 @@ except ImportError as e:
             pass
         def load_script_action(self, path): 
             return None
+        def load_scheduler_config(self): 
+            return None
     
     class ScriptBirdLogger:
         def __init__(self, callback=None): 
@@ -93,6 +110,19 @@ except ImportError as e:
 class MainWindow(QMainWindow, Ui_MainWindow):
     """Janela principal do ScriptBird."""
     
+    # Repassa o fim do executor (emitido na thread dele) para a thread da janela
+    bot_finished = pyqtSignal()
+    
+    # Resultado do teste de conexão em segundo plano: (erro ou '', automático)
+    connection_tested = pyqtSignal(str, bool)
+    
+    # Andamento do ciclo em execução (RunProgress, emitido na thread do ciclo)
+    progress_changed = pyqtSignal(object)
+    
+    # Primeira página da pré-visualização: (colunas, páginas restantes, primeira
+    # página) ou None e a mensagem de erro
+    preview_ready = pyqtSignal(object, str)
+    
     def __init__(self):
         """Inicializa a janela principal."""
         super().__init__()
@@ -103,11 +133,17 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         
         # Componentes
         self.system_tray = SystemTray(self)
+        self.log_sink = LogSink(self.campoLogs) if hasattr(self, 'campoLogs') else None
+        self.preview_model = PreviewTableModel(self)
+        self.script_watcher = QFileSystemWatcher(self)
         self.config_manager = ConfigManager()
         self.logger = ScriptBirdLogger(self._log_to_ui)
         
         # Estado
         self.bot_running = False
+        self.bot_stopping = False
+        self.testing_connection = False
+        self.loading_preview = False
         self.script_executor = None
         self.db_config = DatabaseConfig()
         self.script_config = ScriptConfig()
@@ -116,7 +152,9 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self._setup_connections()
         self._setup_initial_state()
         self._load_configuration()
-        self._check_auto_execution()
+        
+        # A execução automática começa depois que a janela é exibida
+        QTimer.singleShot(0, self._check_auto_execution)
     
     def _setup_window(self):
         """Configura a janela principal."""
@@ -145,9 +183,29 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.btn_IniciarBot.clicked.connect(self._start_bot)
         if hasattr(self, 'btn_PararBot'):
             self.btn_PararBot.clicked.connect(self._stop_bot)
+        if hasattr(self, 'btn_Preview'):
+            self.btn_Preview.clicked.connect(self._start_preview)
+        
+        # Pré-visualização
+        if hasattr(self, 'tabelaPreview'):
+            self.tabelaPreview.setModel(self.preview_model)
+        self.preview_model.fetch_failed.connect(self._on_preview_failed)
+        self.preview_model.fetched.connect(self._update_preview_status)
+        self.preview_model.released.connect(self._update_preview_status)
+        if hasattr(self, 'abas'):
+            self.abas.currentChanged.connect(self._on_tab_changed)
+        self.preview_ready.connect(self._on_preview_ready)
+        
+        # Scripts em execução alterados no disco
+        self.script_watcher.fileChanged.connect(self._on_script_changed)
         
         # System tray
         self.system_tray.show_window.connect(self._show_window)
+        
+        # Executor e teste de conexão (emitidos em outras threads)
+        self.bot_finished.connect(self._on_bot_finished)
+        self.connection_tested.connect(self._on_connection_tested)
+        self.progress_changed.connect(self._on_progress)
     
     def _setup_initial_state(self):
         """Configura o estado inicial da interface."""
@@ -209,19 +267,13 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.logger.info("Configuração do banco incompleta. BOT não iniciado.")
             return
         
-        if not self.script_config.is_valid():
+        scheduler_config = self.config_manager.load_scheduler_config()
+        if not (scheduler_config and scheduler_config.is_enabled()) and not self.script_config.is_valid():
             self.logger.info("Script não encontrado. BOT não iniciado.")
             return
         
-        # Testa conexão
-        try:
-            db_service = DatabaseService(self.db_config)
-            if db_service.test_connection():
-                self._start_bot(auto=True)
-            else:
-                self.logger.error("Falha ao conectar no banco. BOT não iniciado.")
-        except Exception as e:
-            self.logger.error(f"Falha ao conectar no banco. BOT não iniciado. Erro: {e}")
+        # Testa conexão (o BOT é iniciado em _on_connection_tested)
+        self._start_connection_test(auto=True)
     
     def _update_config_from_ui(self):
         """Atualiza configurações a partir da UI."""
@@ -246,16 +298,25 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             # Atualiza configurações
             self._update_config_from_ui()
             
-            # Carrega ação do script
-            script_action = self.config_manager.load_script_action(self.script_config.arquivo)
-            
-            # Inicia executor
-            self.script_executor = ScriptExecutor(
-                self.db_config, 
-                script_action, 
-                self.logger.info
-            )
-            self.script_executor.finished.connect(self._on_bot_finished)
+            # Vários scripts ([AGENDADOR]) ou apenas o script selecionado
+            scheduler_config = self.config_manager.load_scheduler_config()
+            if scheduler_config and scheduler_config.is_enabled():
+                self.script_executor = self._create_scheduler(scheduler_config)
+            else:
+                # Carrega ação do script
+                script_path = self.script_config.arquivo
+                script_action = self.config_manager.load_script_action(script_path)
+                
+                # Inicia executor
+                self.script_executor = ScriptExecutor(
+                    self.db_config, 
+                    script_action, 
+                    self.logger.info,
+                    progress_callback=self.progress_changed.emit,
+                    script_loader=functools.partial(self.config_manager.load_script_action, script_path)
+                )
+                self._watch_scripts([script_path])
+            self.script_executor.finished.connect(self.bot_finished.emit)
             self.script_executor.start()
             
             # Atualiza estado
@@ -273,28 +334,126 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         except Exception as e:
             self.logger.error(f"Erro ao iniciar BOT: {e}")
     
+    def _create_scheduler(self, scheduler_config) -> 'Scheduler':
+        """
+        Cria o agendador com os scripts da seção [AGENDADOR].
+        
+        Scripts inválidos do diretório configurado são informados no log e
+        ignorados; os da lista de scripts interrompem o início.
+        
+        Args:
+            scheduler_config: Configuração do agendador
+            
+        Returns:
+            Agendador com os scripts registrados
+        """
+        scheduler = Scheduler(
+            scheduler_config.max_workers,
+            scheduler_config.max_por_banco,
+            self.logger.info,
+            self.progress_changed.emit
+        )
+        for script_path in scheduler_config.scripts:
+            script_action = self.config_manager.load_script_action(script_path)
+            db_config = self.config_manager.load_script_database(script_path, self.db_config)
+            name = os.path.splitext(os.path.basename(script_path))[0]
+            scheduler.add_job(
+                name, script_action, db_config,
+                functools.partial(self.config_manager.load_script_action, script_path),
+                script_path
+            )
+        scripts = list(scheduler_config.scripts)
+        if scheduler_config.diretorio:
+            configured = {os.path.abspath(script_path) for script_path in scripts}
+            for script in self.config_manager.load_script_directory(
+                    scheduler_config.diretorio, scheduler_config.indice):
+                if not script.valid:
+                    self.logger.error(f"Script {script.path} ignorado: {script.erro}")
+                elif os.path.abspath(script.path) not in configured:
+                    scripts.append(script.path)
+                    scheduler.add_job(
+                        script.name, script.action, script.database(self.db_config),
+                        functools.partial(self.config_manager.load_script_action, script.path),
+                        script.path
+                    )
+        self._watch_scripts(scripts)
+        return scheduler
+    
     def _stop_bot(self):
-        """Para o bot."""
-        if not self.bot_running:
-            return
+        """
+        Pede a parada do bot sem bloquear a janela.
         
-        if self.script_executor:
-            self.script_executor.stop()
-            if self.script_executor.is_alive():
-                self.script_executor.join()
-            self.script_executor = None
+        O executor interrompe o ciclo em andamento antes do lote seguinte;
+        o estado da janela é atualizado quando ele emite finished.
+        """
+        if not self.bot_running or self.bot_stopping or not self.script_executor:
+            return
         
-        self._on_bot_finished()
+        self.bot_stopping = True
+        self.script_executor.stop()
+        if hasattr(self, 'btn_PararBot'):
+            self.btn_PararBot.setEnabled(False)
+        self.logger.info("Parando BOT...")
     
     def _on_bot_finished(self):
         """Callback quando o bot termina."""
         self.bot_running = False
+        self.bot_stopping = False
+        self.script_executor = None
+        self._reset_progress()
+        self._watch_scripts([])
         if hasattr(self, 'btn_IniciarBot'):
             self.btn_IniciarBot.setEnabled(True)
         if hasattr(self, 'btn_PararBot'):
             self.btn_PararBot.setEnabled(False)
         self.logger.info("BOT parado com sucesso.")
     
+    def _watch_scripts(self, paths):
+        """Passa a observar os arquivos dos scripts em execução."""
+        watched = self.script_watcher.files()
+        if watched:
+            self.script_watcher.removePaths(watched)
+        existing = [path for path in paths if os.path.exists(path)]
+        if existing:
+            self.script_watcher.addPaths(existing)
+    
+    def _on_script_changed(self, path: str):
+        """
+        Callback quando um script em execução é alterado.
+        
+        O executor relê o script antes do ciclo seguinte (ou na hora, se
+        estiver aguardando). Editores que salvam substituindo o arquivo
+        o tiram da observação, por isso ele é adicionado de novo.
+        """
+        if os.path.exists(path) and path not in self.script_watcher.files():
+            self.script_watcher.addPath(path)
+        if self.script_executor:
+            self.logger.info(f"Script alterado: {path}")
+            self.script_executor.reload(path)
+    
+    def _on_progress(self, progress):
+        """
+        Mostra o andamento do ciclo na barra de progresso e no tray.
+        
+        Sem estimativa (primeiro ciclo do script), a barra fica vazia e
+        mostra apenas as linhas lidas e a velocidade.
+        """
+        text = progress.describe()
+        if hasattr(self, 'barraProgresso'):
+            percent = progress.percent
+            self.barraProgresso.setValue(percent or 0)
+            self.barraProgresso.setFormat(f"{percent}% · {text}" if percent is not None else text)
+        if hasattr(self.system_tray, 'set_tooltip'):
+            self.system_tray.set_tooltip(f"ScriptBird\n{text}")
+    
+    def _reset_progress(self):
+        """Limpa a barra de progresso e o tooltip do tray."""
+        if hasattr(self, 'barraProgresso'):
+            self.barraProgresso.setValue(0)
+            self.barraProgresso.setFormat("")
+        if hasattr(self.system_tray, 'set_tooltip'):
+            self.system_tray.set_tooltip("ScriptBird")
+    
     def _save_config(self):
         """Salva configurações."""
         try:
@@ -307,13 +466,138 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     
     def _test_connection(self):
         """Testa conexão com o banco."""
+        self._update_config_from_ui()
+        self._start_connection_test(auto=False)
+    
+    def _start_connection_test(self, auto: bool):
+        """
+        Testa a conexão em uma thread, sem bloquear a janela.
+        
+        O resultado chega por connection_tested na thread da janela.
+        
+        Args:
+            auto: True se o BOT deve ser iniciado após uma conexão bem-sucedida
+        """
+        if self.testing_connection:
+            return
+        
+        self.testing_connection = True
+        if hasattr(self, 'btn_TestarBD'):
+            self.btn_TestarBD.setEnabled(False)
+        self.logger.info("Testando conexão com o banco...")
+        
+        # Cópia: a configuração pode ser editada durante o teste
+        db_config = copy.copy(self.db_config)
+        
+        def test():
+            try:
+                if DatabaseService(db_config).test_connection():
+                    error = ''
+                else:
+                    error = "Falha ao conectar no banco."
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            self.connection_tested.emit(error, auto)
+        
+        threading.Thread(target=test, name='ConnectionTest', daemon=True).start()
+    
+    def _on_connection_tested(self, error: str, auto: bool):
+        """Callback com o resultado do teste de conexão."""
+        self.testing_connection = False
+        if hasattr(self, 'btn_TestarBD'):
+            self.btn_TestarBD.setEnabled(True)
+        
+        if auto:
+            if error:
+                self.logger.error(f"Falha ao conectar no banco. BOT não iniciado. Erro: {error}")
+            else:
+                self._start_bot(auto=True)
+        elif error:
+            self.logger.error(f"Erro ao conectar: {error}")
+        else:
+            self.logger.info("Conexão com banco realizada com sucesso.")
+    
+    def _start_preview(self):
+        """
+        Executa a query do script selecionado para pré-visualização.
+        
+        A consulta e a primeira página rodam em uma thread; as demais
+        páginas são lidas pelo modelo conforme a tabela é rolada.
+        """
+        if self.loading_preview:
+            return
+        
         try:
             self._update_config_from_ui()
-            db_service = DatabaseService(self.db_config)
-            db_service.test_connection()
-            self.logger.info("Conexão com banco realizada com sucesso.")
+            script_path = self.script_config.arquivo
+            settings = SaveToFileSettings.from_action(
+                self.config_manager.load_script_action(script_path)
+            )
+            db_config = self.config_manager.load_script_database(script_path, self.db_config)
         except Exception as e:
-            self.logger.error(f"Erro ao conectar: {e}")
+            self.logger.error(f"Erro ao pré-visualizar: {e}")
+            return
+        
+        # Devolve ao pool a conexão da pré-visualização anterior
+        self.preview_model.clear()
+        self.loading_preview = True
+        if hasattr(self, 'btn_Preview'):
+            self.btn_Preview.setEnabled(False)
+        if hasattr(self, 'lbl_Preview'):
+            self.lbl_Preview.setText("Executando consulta...")
+        
+        def load():
+            try:
+                db_service = DatabaseService(db_config)
+                # Execução por parâmetros: pré-visualiza o primeiro valor
+                params = None
+                if settings.has_parameters:
+                    params = next(iter(load_parameter_values(settings, db_service)), None)
+                result = db_service.execute_query_iter(
+                    settings.query, PREVIEW_PAGE_SIZE, params
+                )
+                batches = iter(result)
+                self.preview_ready.emit((result.columns, batches, next(batches, None)), '')
+            except Exception as e:
+                self.preview_ready.emit(None, str(e) or type(e).__name__)
+        
+        threading.Thread(target=load, name='Preview', daemon=True).start()
+    
+    def _on_preview_ready(self, page, error: str):
+        """Callback com a primeira página da pré-visualização."""
+        self.loading_preview = False
+        if hasattr(self, 'btn_Preview'):
+            self.btn_Preview.setEnabled(True)
+        if page is None:
+            self._on_preview_failed(error)
+            return
+        self.preview_model.load(*page)
+        self._update_preview_status()
+    
+    def _on_preview_failed(self, error: str):
+        """Callback quando a consulta ou a leitura de uma página falha."""
+        if hasattr(self, 'lbl_Preview'):
+            self.lbl_Preview.setText("Erro na consulta (veja o log).")
+        self.logger.error(f"Erro ao pré-visualizar: {error}")
+    
+    def _update_preview_status(self):
+        """Mostra quantas linhas foram lidas na pré-visualização."""
+        if not hasattr(self, 'lbl_Preview'):
+            return
+        rows = self.preview_model.rowCount()
+        if self.preview_model.truncated:
+            self.lbl_Preview.setText(
+                f"{rows} primeiros registros (consulta encerrada; pré-visualize de novo para ler mais)."
+            )
+        elif self.preview_model.exhausted:
+            self.lbl_Preview.setText(f"{rows} registros.")
+        else:
+            self.lbl_Preview.setText(f"{rows} primeiros registros (role para carregar mais).")
+    
+    def _on_tab_changed(self, index: int):
+        """Fecha o resultado da pré-visualização quando a aba é escondida."""
+        if hasattr(self, 'abaPreview') and self.abas.widget(index) is not self.abaPreview:
+            self.preview_model.release()
     
     def _select_database_file(self):
         """Seleciona arquivo de banco de dados."""
@@ -371,17 +655,21 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.activateWindow()
     
     def _log_to_ui(self, message: str):
-        """Registra mensagem na UI."""
-        if hasattr(self, 'campoLogs'):
-            self.campoLogs.appendPlainText(message)
-            # Auto-scroll
-            scrollbar = self.campoLogs.verticalScrollBar()
-            scrollbar.setValue(scrollbar.maximum())
+        """
+        Registra mensagem na UI.
+        
+        Chamado também pelas threads dos executores: a mensagem vai para a
+        fila do LogSink, que atualiza o campo na thread da janela.
+        """
+        if self.log_sink is not None:
+            self.log_sink.write(message)
     
     def closeEvent(self, a0):  # type: ignore
         """Manipula evento de fechamento da janela."""
         if hasattr(a0, 'ignore'):
             a0.ignore()  # type: ignore
         self.hide()
+        # Em segundo plano a pré-visualização não prende uma conexão do pool
+        self.preview_model.release()
         if hasattr(self.system_tray, 'show_message'):
             self.system_tray.show_message("ScriptBird", "Executando em segundo plano.")
\ No newline at end of file
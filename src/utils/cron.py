@@ -0,0 +1,131 @@
+"""
+Expressões cron para agendamento de scripts.
+"""
+from datetime import datetime, timedelta
+from typing import FrozenSet, List, Tuple
+
+# Limites de cada campo: minuto, hora, dia do mês, mês e dia da semana
+FIELD_RANGES: List[Tuple[int, int]] = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+FIELD_NAMES = ['minuto', 'hora', 'dia do mês', 'mês', 'dia da semana']
+
+# Limite de busca do próximo horário (expressões impossíveis, ex.: 31/02)
+MAX_SEARCH_DAYS = 366 * 5
+
+
+class CronExpression:
+    """
+    Expressão cron de cinco campos: minuto, hora, dia do mês, mês e dia da
+    semana (0 ou 7 = domingo).
+    
+    Cada campo aceita '*', valores, faixas ('7-19'), listas ('1,15') e
+    passos ('*/15', '7-19/2'). Como no cron, se dia do mês e dia da semana
+    forem restritos, basta um deles coincidir.
+    """
+    
+    def __init__(self, expression: str):
+        """
+        Interpreta a expressão.
+        
+        Args:
+            expression: Expressão cron (ex.: '*/15 7-19 * * 1-6')
+        
+        Raises:
+            ValueError: Se a expressão for inválida
+        """
+        self.expression = expression.strip()
+        fields = self.expression.split()
+        if len(fields) != 5:
+            raise ValueError(
+                f"Expressão cron deve ter 5 campos (minuto hora dia mês dia-da-semana): "
+                f"{expression}"
+            )
+        parsed = [
+            _parse_field(text, low, high, name)
+            for text, (low, high), name in zip(fields, FIELD_RANGES, FIELD_NAMES)
+        ]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+    
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Calcula o próximo horário estritamente posterior ao informado.
+        
+        Args:
+            moment: Horário de referência
+        
+        Returns:
+            Próximo horário que satisfaz a expressão
+        
+        Raises:
+            ValueError: Se nenhum horário satisfizer a expressão
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=MAX_SEARCH_DAYS)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                candidate = _first_of_next_month(candidate)
+                continue
+            if not self._matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"Expressão cron sem horários válidos: {self.expression}")
+    
+    def _matches_day(self, moment: datetime) -> bool:
+        """Verifica dia do mês e dia da semana com a regra do cron."""
+        day = moment.day in self.days
+        # isoweekday: segunda = 1 ... domingo = 7
+        weekday = moment.isoweekday() % 7 in self.weekdays
+        if self._any_day:
+            return weekday
+        if self._any_weekday:
+            return day
+        return day or weekday
+    
+    def __str__(self) -> str:
+        return self.expression
+
+
+def _parse_field(text: str, low: int, high: int, name: str) -> FrozenSet[int]:
+    """Converte um campo da expressão no conjunto de valores aceitos."""
+    # Domingo pode ser informado como 7
+    limit = 7 if name == 'dia da semana' else high
+    values = set()
+    for part in text.split(','):
+        try:
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError
+            else:
+                step = 1
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start_text, end_text = part.split('-', 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = end = int(part)
+                if step > 1:
+                    end = high
+        except ValueError:
+            raise ValueError(f"Campo {name} inválido na expressão cron: {text}")
+        if start < low or end > limit or start > end:
+            raise ValueError(f"Campo {name} fora do intervalo {low}-{limit}: {text}")
+        values.update(value % 7 if limit == 7 else value for value in range(start, end + 1, step))
+    return frozenset(values)
+
+
+def _first_of_next_month(moment: datetime) -> datetime:
+    """Primeiro minuto do mês seguinte."""
+    if moment.month == 12:
+        return moment.replace(year=moment.year + 1, month=1, day=1, hour=0, minute=0)
+    return moment.replace(month=moment.month + 1, day=1, hour=0, minute=0)
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Utilitário para medição de memória do processo.
+"""
+import os
+import sys
+import threading
+from typing import Optional
+
+# Intervalo (segundos) entre duas leituras do MemorySampler
+MEMORY_SAMPLE_INTERVAL = 0.05
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Retorna o pico de memória residente (RSS) do processo desde o início.
+    
+    É o maior valor de toda a vida do processo (não diminui); para medir
+    um trecho, use MemorySampler. Usa o módulo resource no Linux/macOS e
+    o psutil, se instalado, no Windows.
+    
+    Returns:
+        Pico de RSS em bytes ou None se não for possível medir
+    """
+    try:
+        import resource
+        
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa em KiB; macOS em bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+    
+    try:
+        import psutil
+        
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+    except ImportError:
+        return None
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Retorna a memória residente (RSS) atual do processo.
+    
+    Lê /proc/self/statm no Linux e usa o psutil nos demais sistemas.
+    
+    Returns:
+        RSS em bytes ou None se não for possível medir
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    
+    try:
+        import psutil
+        
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+class MemorySampler:
+    """
+    Pico de RSS do processo durante um trecho, amostrado em uma thread.
+    
+    Diferente de peak_rss_bytes(), o pico vale apenas para o período em
+    que o bloco executa. É a memória do processo inteiro: ciclos de outros
+    scripts executando ao mesmo tempo também são somados.
+    """
+    
+    def __init__(self, interval: float = MEMORY_SAMPLE_INTERVAL):
+        """
+        Inicializa o amostrador.
+        
+        Args:
+            interval: Intervalo em segundos entre as leituras
+        """
+        self.interval = interval
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def __enter__(self) -> 'MemorySampler':
+        """Inicia a amostragem."""
+        self._sample()
+        if self.peak is not None:
+            self._thread = threading.Thread(target=self._run, name='MemorySampler', daemon=True)
+            self._thread.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Encerra a amostragem com uma última leitura."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample()
+    
+    def _run(self):
+        """Lê o RSS a cada intervalo até o fim do bloco."""
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def _sample(self):
+        """Registra a leitura atual se for a maior até agora."""
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Sinais simples baseados em callbacks, sem dependência do Qt.
+"""
+import threading
+from typing import Any, Callable, List
+
+
+class Signal:
+    """
+    Lista de callbacks chamados por emit().
+    
+    Tem a mesma interface básica do pyqtSignal (connect, disconnect e
+    emit), mas os callbacks são chamados na thread que emite o sinal.
+    Na interface, conecte a um pyqtSignal para que o Qt entregue o
+    evento na thread da janela.
+    """
+    
+    def __init__(self):
+        """Inicializa o sinal sem callbacks."""
+        self._callbacks: List[Callable[..., Any]] = []
+        self._lock = threading.Lock()
+    
+    def connect(self, callback: Callable[..., Any]):
+        """Registra um callback."""
+        with self._lock:
+            self._callbacks.append(callback)
+    
+    def disconnect(self, callback: Callable[..., Any]):
+        """Remove um callback registrado."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+    
+    def emit(self, *args: Any):
+        """Chama os callbacks registrados com os argumentos."""
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(*args)
\ No newline at end of file
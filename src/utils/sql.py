@@ -0,0 +1,42 @@
+"""
+Análise simples do texto de queries SQL.
+"""
+
+
+def count_placeholders(query: str) -> int:
+    """
+    Conta os parâmetros posicionais (?) de uma query.
+    
+    Ignora '?' dentro de literais ('...'), identificadores entre aspas
+    ("...") e comentários (-- e /* */).
+    
+    Args:
+        query: Texto da query
+    
+    Returns:
+        Quantidade de parâmetros
+    """
+    count = 0
+    index = 0
+    length = len(query)
+    while index < length:
+        char = query[index]
+        if char in ("'", '"'):
+            # Aspas duplicadas ('') continuam o mesmo literal
+            end = query.find(char, index + 1)
+            while end != -1 and query[end + 1:end + 2] == char:
+                end = query.find(char, end + 2)
+            index = length if end == -1 else end + 1
+            continue
+        if query.startswith('--', index):
+            end = query.find('\n', index)
+            index = length if end == -1 else end + 1
+            continue
+        if query.startswith('/*', index):
+            end = query.find('*/', index + 2)
+            index = length if end == -1 else end + 2
+            continue
+        if char == '?':
+            count += 1
+        index += 1
+    return count
\ No newline at end of file